@@ -0,0 +1,152 @@
+"""Measure the accuracy of each integration method against a known load.
+
+Synthetic loads with a known exact energy are sampled the way sensors
+report them, integrated with every method, with and without the median
+filter and the maximum gap, and the error against the exact energy is
+printed. Everything runs offline, without Home Assistant. Run from the
+repository root:
+
+    python benchmarks/bench_integration_accuracy.py
+"""
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from custom_components.consumers_energy_cost.integration import (
+    INTEGRATION_METHODS,
+    SampleIntegrator,
+)
+
+DAY = 24 * 3600
+POLL_SECONDS = 30
+HEARTBEAT_SECONDS = 300
+
+
+def _smooth(t):
+    """Base load plus a daily heating curve and a faster ripple, in watts."""
+    return 400 + 1200 * (1 - math.cos(2 * math.pi * t / DAY)) / 2 + 150 * math.sin(2 * math.pi * t / 1800)
+
+
+def _smooth_energy(t):
+    """Exact kWh of _smooth from 0 to t."""
+    joules = (
+        1000 * t
+        - 600 * DAY / (2 * math.pi) * math.sin(2 * math.pi * t / DAY)
+        - 150 * 1800 / (2 * math.pi) * (math.cos(2 * math.pi * t / 1800) - 1)
+    )
+    return joules / 3_600_000
+
+
+def _polled(power, times, spikes=()):
+    """Sample a load at given times, replacing some samples with glitches."""
+    samples = [(t, power(t)) for t in times]
+    for index in spikes:
+        samples[index] = (samples[index][0], 65535.0)
+    return samples
+
+
+def _cycling_samples(rng):
+    """A compressor cycling on and off, reported on every change.
+
+    The held value is also sampled every 5 minutes, like the event-driven
+    refresh does while sensors are idle.
+
+    Returns:
+        Tuple of (samples, exact kWh)
+    """
+    changes = [(0.0, 0.0)]
+    t = 0.0
+    on = False
+    joules = 0.0
+    while t < DAY:
+        length = rng.uniform(300, 1500)
+        power = rng.uniform(120, 180) if not on else 0.0
+        on = not on
+        t = min(t + length, DAY)
+        joules += changes[-1][1] * (t - changes[-1][0])
+        changes.append((t, power))
+
+    held = [
+        (float(t), next(power for when, power in reversed(changes) if when <= t))
+        for t in range(HEARTBEAT_SECONDS, DAY, HEARTBEAT_SECONDS)
+    ]
+    samples = sorted(changes + held)
+    return samples, joules / 3_600_000
+
+
+def _integrate(samples, method, median_window=1, max_gap=0.0):
+    """Integrate samples the way the coordinator does.
+
+    Returns:
+        Energy in kWh
+    """
+    integrator = SampleIntegrator(method, median_window, max_gap)
+    energy = 0.0
+    previous = None
+    for timestamp, power in samples:
+        power = integrator.filter(power)
+        if previous is not None:
+            ends = integrator.endpoints(previous[0], previous[1], timestamp, power)
+            if ends is not None:
+                energy += (ends[0] + ends[1]) / 2 * (timestamp - previous[0]) / 3_600_000
+        previous = (timestamp, power)
+    return energy
+
+
+def _scenarios():
+    """Build the loads to integrate.
+
+    Returns:
+        List of (name, samples, exact kWh)
+    """
+    rng = random.Random(1050)
+    poll_times = [float(t) for t in range(0, DAY + 1, POLL_SECONDS)]
+
+    # Readings at irregular intervals, as event-driven sensors report them
+    event_times = [0.0]
+    while event_times[-1] < DAY:
+        event_times.append(min(event_times[-1] + rng.uniform(5, 120), float(DAY)))
+
+    spikes = rng.sample(range(1, len(poll_times) - 1), 20)
+
+    # The sensor drops out for just over two hours, while the heater is off
+    def heater(t):
+        return 0.0 if 8 * 3600 <= t < 10 * 3600 else 2000.0
+
+    outage_times = [t for t in poll_times if not 8 * 3600 - 60 < t < 10 * 3600 + 60]
+
+    cycling, cycling_energy = _cycling_samples(rng)
+    return [
+        ("smooth, 30 s polls", _polled(_smooth, poll_times), _smooth_energy(DAY)),
+        ("smooth, irregular", _polled(_smooth, event_times), _smooth_energy(DAY)),
+        ("smooth, 20 spikes", _polled(_smooth, poll_times, spikes), _smooth_energy(DAY)),
+        ("steps, on change", cycling, cycling_energy),
+        ("2 h sensor outage", _polled(heater, outage_times), 2000 * 22 / 1000),
+    ]
+
+
+def main():
+    """Print the relative error of every method on every load."""
+    configs = [(method, 1, 0.0) for method in INTEGRATION_METHODS]
+    configs += [(method, 3, 0.0) for method in INTEGRATION_METHODS]
+    configs += [(method, 1, 600.0) for method in INTEGRATION_METHODS]
+
+    scenarios = _scenarios()
+    header = f"{'method':>10} {'median':>6} {'max gap':>7}"
+    for name, _, _ in scenarios:
+        header += f" {name:>19}"
+    print(header)
+
+    for method, median_window, max_gap in configs:
+        line = f"{method:>10} {median_window:>6} {max_gap:>7.0f}"
+        for _, samples, exact in scenarios:
+            error = (_integrate(samples, method, median_window, max_gap) - exact) / exact
+            line += f" {error * 100:>18.4f}%"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
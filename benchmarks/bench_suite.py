@@ -0,0 +1,245 @@
+"""Time the hot paths and compare them with a stored baseline.
+
+Benchmarks rate lookups over a dense grid of timestamps, polled update
+cycles with 1, 100 and 1,000 sensors, saving and restoring the state, and
+period rollover checks. Each is run several times and the best time per
+operation is kept. Run from the repository root:
+
+    python benchmarks/bench_suite.py            # compare with the baseline
+    python benchmarks/bench_suite.py --save     # record a new baseline
+
+The baseline is stored in benchmarks/baseline.json, from the best of two
+runs. A benchmark more than --tolerance slower than its baseline (30% by
+default) is run again to rule out a busy machine, and if it is still too
+slow it is reported as a regression and the exit status is 1. Timings
+depend on the machine, so record a baseline on the machine the comparison
+runs on.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Awaitable, Callable
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.consumers_energy_cost.clock import VirtualClock
+from custom_components.consumers_energy_cost.const import (
+    RATE_PLAN_NIGHTTIME_SAVERS,
+    RATE_PLAN_TEMPLATES,
+)
+from custom_components.consumers_energy_cost.coordinator import EnergyDataUpdateCoordinator
+from custom_components.consumers_energy_cost.rate_calculator import RateCalculator
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+RATE_CONFIG = RATE_PLAN_TEMPLATES[RATE_PLAN_NIGHTTIME_SAVERS]["config"]
+SENSOR_COUNTS = (1, 100, 1000)
+REPEAT = 5
+START = datetime(2025, 1, 1)
+
+
+def _best(run: Callable[[], int]) -> float:
+    """Time a function that returns how many operations it did.
+
+    Returns:
+        Best microseconds per operation over REPEAT runs
+    """
+    best = float("inf")
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        operations = run()
+        best = min(best, (time.perf_counter() - started) / operations)
+    return best * 1e6
+
+
+async def _best_async(run: Callable[[], Awaitable[int]]) -> float:
+    """Time a coroutine function that returns how many operations it did.
+
+    Returns:
+        Best microseconds per operation over REPEAT runs
+    """
+    best = float("inf")
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        operations = await run()
+        best = min(best, (time.perf_counter() - started) / operations)
+    return best * 1e6
+
+
+def bench_rate_lookup(results: dict[str, float]) -> None:
+    """Time scalar and batch rate lookups over every minute of a year."""
+    calculator = RateCalculator(RATE_CONFIG)
+    tz = dt_util.DEFAULT_TIME_ZONE
+    start = START.replace(tzinfo=tz).timestamp()
+    timestamps = [start + minute * 60 for minute in range(365 * 24 * 60)]
+    times = [datetime.fromtimestamp(timestamp, tz) for timestamp in timestamps]
+
+    def scalar():
+        get_rate = calculator.get_rate
+        for when in times:
+            get_rate(when)
+        return len(times)
+
+    def batch():
+        calculator.get_rates(timestamps, tz)
+        return len(timestamps)
+
+    def next_change():
+        for when in times[::60]:
+            calculator.next_change(when)
+        return len(times[::60])
+
+    results["get_rate"] = _best(scalar)
+    results["get_rates_batch"] = _best(batch)
+    results["next_change"] = _best(next_change)
+
+
+def _coordinator(hass: HomeAssistant, count: int, clock: VirtualClock) -> EnergyDataUpdateCoordinator:
+    """Create a coordinator reading a number of power sensors."""
+    entity_ids = [f"sensor.plug_{index}" for index in range(count)]
+    for index, entity_id in enumerate(entity_ids):
+        hass.states.async_set(entity_id, str(50 + index % 100))
+    coordinator = EnergyDataUpdateCoordinator(
+        hass, entity_ids, RATE_CONFIG, f"bench_{count}", clock=clock
+    )
+    coordinator._state_restored = True
+    return coordinator
+
+
+async def bench_update_cycle(results: dict[str, float]) -> None:
+    """Time polled update cycles, and save and restore of their state."""
+    for count in SENSOR_COUNTS:
+        hass = HomeAssistant(tempfile.mkdtemp())
+        hass.config.set_time_zone("America/Detroit")
+        clock = VirtualClock(START.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE))
+        coordinator = _coordinator(hass, count, clock)
+
+        async def cycles(ticks=1000):
+            for _ in range(ticks):
+                clock.advance(30)
+                await coordinator._async_update_data()
+            return ticks
+
+        results[f"update_cycle_{count}"] = await _best_async(cycles)
+
+        # A day of minutes in the rollups and the accumulators
+        await cycles(2880)
+
+        async def round_trip():
+            await coordinator._save_state()
+            await coordinator._rollup_write
+            restored = _coordinator(hass, count, clock)
+            await restored._restore_state()
+            await restored.async_shutdown()
+            return 1
+
+        results[f"save_restore_{count}"] = await _best_async(round_trip)
+
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+
+
+async def bench_period_boundaries(results: dict[str, float]) -> None:
+    """Time period rollover checks between and at boundaries."""
+    hass = HomeAssistant(tempfile.mkdtemp())
+    hass.config.set_time_zone("America/Detroit")
+    start = START.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    coordinator = _coordinator(hass, 100, VirtualClock(start))
+    hours = [
+        datetime.fromtimestamp(start.timestamp() + hour * 3600, dt_util.DEFAULT_TIME_ZONE)
+        for hour in range(1, 365 * 24)
+    ]
+
+    def between(checks=100_000):
+        when = start + timedelta(minutes=30)
+        for _ in range(checks):
+            coordinator._check_period_boundaries(when)
+        return checks
+
+    def rollovers():
+        coordinator._check_period_boundaries(start)
+        for when in hours:
+            coordinator._check_period_boundaries(when)
+        # Start over for the next run
+        coordinator._hourly_start = coordinator._daily_start = start
+        coordinator._weekly_start = coordinator._monthly_start = start
+        coordinator._yearly_start = start
+        coordinator._update_boundaries()
+        return len(hours)
+
+    results["boundary_check"] = _best(between)
+    results["hourly_rollover"] = _best(rollovers)
+
+    await coordinator.async_shutdown()
+    await hass.async_stop(force=True)
+
+
+async def run_all() -> dict[str, float]:
+    """Run every benchmark.
+
+    Returns:
+        Microseconds per operation of each benchmark
+    """
+    results: dict[str, float] = {}
+    dt_util.set_default_time_zone(dt_util.get_time_zone("America/Detroit"))
+    bench_rate_lookup(results)
+    await bench_update_cycle(results)
+    await bench_period_boundaries(results)
+    return results
+
+
+def main() -> None:
+    """Run the benchmarks and compare them with the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--save", action="store_true", help="Record the results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed slowdown, 0.3 for 30%%")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_all())
+
+    baseline: dict[str, float] = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as handle:
+            baseline = json.load(handle)
+
+    def slower(name: str) -> bool:
+        return name in baseline and results[name] / baseline[name] - 1 > args.tolerance
+
+    if args.save or any(slower(name) for name in results):
+        # Keep the better of two runs of each benchmark
+        for name, value in asyncio.run(run_all()).items():
+            results[name] = min(results[name], value)
+
+    regressions = []
+    print(f"{'benchmark':<20} {'us/op':>12} {'baseline':>12} {'change':>8}")
+    for name, value in results.items():
+        line = f"{name:<20} {value:>12.3f}"
+        if name in baseline:
+            change = value / baseline[name] - 1
+            line += f" {baseline[name]:>12.3f} {change * 100:>7.1f}%"
+            if slower(name):
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+
+    if args.save:
+        with open(BASELINE_PATH, "w") as handle:
+            json.dump({name: round(value, 3) for name, value in results.items()}, handle, indent=2)
+            handle.write("\n")
+        print(f"Saved baseline to {BASELINE_PATH}")
+    elif regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
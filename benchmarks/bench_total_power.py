@@ -0,0 +1,74 @@
+"""Benchmark the per-tick cost of reading total power from many sensors.
+
+Compares reading and parsing every sensor on each tick with the total kept
+up to date by state change events, at 10, 100 and 1,000 sensors. Run from
+the repository root:
+
+    python benchmarks/bench_total_power.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.consumers_energy_cost.const import RATE_PLAN_SMART_HOURS, RATE_PLAN_TEMPLATES
+from custom_components.consumers_energy_cost.coordinator import EnergyDataUpdateCoordinator
+
+SENSOR_COUNTS = (10, 100, 1000)
+TICKS = 2000
+
+
+def _time_ticks(coordinator, hass, entity_ids):
+    """Time ticks where one sensor changes between each.
+
+    Returns:
+        Mean microseconds per tick, including the state change
+    """
+    now = dt_util.now()
+    start = time.perf_counter()
+    for tick in range(TICKS):
+        hass.states.async_set(entity_ids[tick % len(entity_ids)], str(100 + tick % 50))
+        now += timedelta(seconds=30)
+        coordinator._integrate(now, coordinator._get_total_power())
+    return (time.perf_counter() - start) / TICKS * 1e6
+
+
+async def _run(count):
+    """Benchmark both ways of reading power for a number of sensors."""
+    hass = HomeAssistant(tempfile.mkdtemp())
+    hass.config.set_time_zone("America/Detroit")
+    entity_ids = [f"sensor.plug_{index}" for index in range(count)]
+    for entity_id in entity_ids:
+        hass.states.async_set(entity_id, "100")
+
+    coordinator = EnergyDataUpdateCoordinator(
+        hass, entity_ids, RATE_PLAN_TEMPLATES[RATE_PLAN_SMART_HOURS]["config"], "bench"
+    )
+    coordinator._state_restored = True
+
+    scan = _time_ticks(coordinator, hass, entity_ids)
+    coordinator.async_start_event_tracking()
+    tracked = _time_ticks(coordinator, hass, entity_ids)
+
+    await coordinator.async_shutdown()
+    await hass.async_stop(force=True)
+    return scan, tracked
+
+
+def main():
+    """Print per-tick cost for each sensor count."""
+    print(f"{'sensors':>8} {'read all (us/tick)':>20} {'tracked (us/tick)':>19}")
+    for count in SENSOR_COUNTS:
+        scan, tracked = asyncio.run(_run(count))
+        print(f"{count:>8} {scan:>20.1f} {tracked:>19.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+"""Replay a recorded power trace through the coordinator, offline.
+
+Each row of the trace is fed to EnergyDataUpdateCoordinator the way state
+change events are, at the row's own time, so a year of readings replays
+in seconds without running Home Assistant. Sensor states come from a
+stand-in for hass.states that holds the trace's latest values. The trace
+is streamed, so memory use doesn't grow with its length.
+
+Every period rollover is written to stdout as a JSON line with the
+closing period's totals, followed by a final line with every accumulator.
+Snapshots of the published data can be written at a fixed interval of
+trace time. Ticks and time per tick go to stderr. Run from the repository
+root:
+
+    python benchmarks/replay_trace.py trace.csv --rate-plan nighttime_savers_1050
+    python benchmarks/replay_trace.py trace.ndjson.gz --energy-sensor sensor.meter
+
+Traces are CSV with a header row, or newline-delimited JSON objects,
+optionally gzipped:
+
+    timestamp,sensor.furnace,sensor.dryer
+    2025-03-09T01:59:30-05:00,420,0
+    1741503630,,2800
+
+    {"timestamp": "2025-03-09T01:59:30-05:00", "sensor.furnace": 420}
+
+The timestamp is ISO 8601 or epoch seconds; a time without an offset is
+local to --time-zone. Every other field is a sensor state, and an empty or
+missing field leaves the sensor unchanged. Energy sensors (in kWh) are
+named with --energy-sensor; all other fields are power sensors in watts.
+A JSON trace's power sensors are the fields of its first row unless given
+with --power-sensor.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+from datetime import datetime, tzinfo
+import gzip
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Iterator
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from homeassistant.core import Context, HomeAssistant, State
+from homeassistant.util import dt as dt_util
+
+from custom_components.consumers_energy_cost.clock import VirtualClock
+from custom_components.consumers_energy_cost.const import (
+    INTEGRATION_TRAPEZOID,
+    RATE_PLAN_TEMPLATES,
+)
+from custom_components.consumers_energy_cost.coordinator import EnergyDataUpdateCoordinator
+from custom_components.consumers_energy_cost.fixed_point import COST_SCALE, ENERGY_SCALE
+from custom_components.consumers_energy_cost.integration import INTEGRATION_METHODS
+
+PERIODS = ("hourly", "daily", "weekly", "monthly", "yearly")
+
+
+class TraceStates:
+    """Stand-in for hass.states holding the latest state of each sensor."""
+
+    def __init__(self) -> None:
+        """Initialize with no states."""
+        self._states: dict[str, State] = {}
+        # One context for every state, rather than a new ID for each
+        self._context = Context()
+
+    def get(self, entity_id: str) -> State | None:
+        """Get a sensor's latest state."""
+        return self._states.get(entity_id)
+
+    def set(self, entity_id: str, value: str, when: datetime) -> State | None:
+        """Set a sensor's state as of a time.
+
+        Returns:
+            The new state, or None if the value didn't change
+        """
+        previous = self._states.get(entity_id)
+        if previous is not None and previous.state == value:
+            return None
+        state = State(
+            entity_id,
+            value,
+            last_updated=when,
+            context=self._context,
+            validate_entity_id=False,
+        )
+        self._states[entity_id] = state
+        return state
+
+
+class ReplayCoordinator(EnergyDataUpdateCoordinator):
+    """Coordinator that reports each period rollover as it happens."""
+
+    def __init__(self, *args: Any, on_rollover: Callable[..., None], **kwargs: Any) -> None:
+        """Initialize the coordinator.
+
+        Args:
+            on_rollover: Called with the period, its start, energy in kWh,
+                cost in dollars and the time it rolled over at
+        """
+        super().__init__(*args, **kwargs)
+        self._on_rollover = on_rollover
+
+    def _check_period_boundaries(self, current_time: datetime) -> None:
+        """Roll periods over, reporting the totals of those that closed."""
+        if current_time.timestamp() < self._next_boundary:
+            return
+
+        closing = {
+            prefix: (
+                getattr(self, f"_{prefix}_start"),
+                getattr(self, f"_{prefix}_energy"),
+                getattr(self, f"_{prefix}_cost"),
+            )
+            for prefix in PERIODS
+        }
+        super()._check_period_boundaries(current_time)
+        for prefix, (start, energy, cost) in closing.items():
+            if getattr(self, f"_{prefix}_start") != start:
+                self._on_rollover(
+                    prefix, start, energy / ENERGY_SCALE, cost / COST_SCALE, current_time
+                )
+
+
+def _open(path: str):
+    """Open a trace as text, decompressing it if it's gzipped."""
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", newline="")
+    return open(path, newline="")
+
+
+def _parse_time(value: Any, tz: tzinfo) -> datetime:
+    """Parse a trace timestamp into local time.
+
+    Raises:
+        ValueError: If the timestamp isn't epoch seconds or ISO 8601
+    """
+    try:
+        timestamp = float(value)
+    except (TypeError, ValueError):
+        when = dt_util.parse_datetime(str(value))
+        if when is None:
+            raise ValueError(f"Invalid timestamp: {value!r}") from None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=tz)
+        return when.astimezone(tz)
+    return datetime.fromtimestamp(timestamp, tz)
+
+
+def read_trace(
+    path: str, tz: tzinfo, json_lines: bool
+) -> tuple[list[str], Iterator[tuple[datetime, dict[str, str]]]]:
+    """Open a trace and stream its rows.
+
+    Args:
+        path: Trace file, or - for stdin
+        tz: Time zone of timestamps without an offset
+        json_lines: Whether the trace is JSON lines rather than CSV
+
+    Returns:
+        Tuple of (sensor entity IDs in the first row or header, iterator
+        of (time, states changed) for each row)
+    """
+    handle = _open(path)
+
+    if json_lines:
+        lines = (line for line in handle if line.strip())
+        first = next(lines, None)
+
+        def json_rows() -> Iterator[tuple[datetime, dict[str, str]]]:
+            with handle:
+                for line in ([first] if first is not None else []):
+                    yield _json_row(line, tz)
+                for line in lines:
+                    yield _json_row(line, tz)
+
+        fields = [key for key in json.loads(first) if key != "timestamp"] if first else []
+        return fields, json_rows()
+
+    reader = csv.reader(handle)
+    header = next(reader, ["timestamp"])
+
+    def csv_rows() -> Iterator[tuple[datetime, dict[str, str]]]:
+        with handle:
+            for row in reader:
+                if not row:
+                    continue
+                states = {
+                    entity_id: value.strip()
+                    for entity_id, value in zip(header[1:], row[1:])
+                    if value.strip()
+                }
+                yield _parse_time(row[0], tz), states
+
+    return header[1:], csv_rows()
+
+
+def _json_row(line: str, tz: tzinfo) -> tuple[datetime, dict[str, str]]:
+    """Parse one JSON trace row."""
+    record = json.loads(line)
+    when = _parse_time(record.pop("timestamp"), tz)
+    states = {
+        entity_id: "unavailable" if value is None else str(value)
+        for entity_id, value in record.items()
+        if value != ""
+    }
+    return when, states
+
+
+def _emit(record: dict[str, Any]) -> None:
+    """Write an output record as a JSON line."""
+    sys.stdout.write(json.dumps(record) + "\n")
+
+
+async def replay(args: argparse.Namespace) -> None:
+    """Replay a trace and write its rollovers and totals."""
+    hass = HomeAssistant(tempfile.mkdtemp())
+    hass.config.set_time_zone(args.time_zone)
+    tz = dt_util.DEFAULT_TIME_ZONE
+    states = TraceStates()
+    hass.states = states
+
+    if args.rate_config:
+        with open(args.rate_config) as handle:
+            rate_config = json.load(handle)
+    else:
+        rate_config = RATE_PLAN_TEMPLATES[args.rate_plan]["config"]
+
+    if args.format is not None:
+        json_lines = args.format == "ndjson"
+    else:
+        json_lines = args.trace.removesuffix(".gz").endswith((".ndjson", ".jsonl", ".json"))
+    fields, rows = read_trace(args.trace, tz, json_lines)
+    energy_sensors = list(args.energy_sensor)
+    power_sensors = args.power_sensor or [
+        entity_id for entity_id in fields if entity_id not in energy_sensors
+    ]
+    meters = {entity_id: index for index, entity_id in enumerate(energy_sensors)}
+    powers = {entity_id: index for index, entity_id in enumerate(power_sensors)}
+
+    compare_plans = None
+    if args.compare_plans:
+        compare_plans = {
+            plan_id: template["config"] for plan_id, template in RATE_PLAN_TEMPLATES.items()
+        }
+
+    def on_rollover(prefix, start, energy, cost, when):
+        _emit({
+            "type": "rollover",
+            "period": prefix,
+            "start": start.isoformat(),
+            "end": when.isoformat(),
+            "energy": energy,
+            "cost": cost,
+        })
+
+    first = next(rows, None)
+    if first is None:
+        print("The trace is empty", file=sys.stderr)
+        await hass.async_stop(force=True)
+        return
+
+    # Periods start with the trace, and time moves with its rows
+    clock = VirtualClock(first[0])
+    coordinator = ReplayCoordinator(
+        hass,
+        power_sensors,
+        rate_config,
+        "replay",
+        energy_sensors=energy_sensors,
+        integration_method=args.method,
+        median_window=args.median_window,
+        max_power=args.max_power,
+        max_gap=args.max_gap,
+        compare_plans=compare_plans,
+        clock=clock,
+        on_rollover=on_rollover,
+    )
+    coordinator._state_restored = True
+
+    ticks = 0
+    started = time.perf_counter()
+    previous: datetime | None = None
+    next_snapshot = None
+    for when, changed in itertools.chain([first], rows):
+        if previous is not None and when < previous:
+            # Like state events, readings never go back in time
+            when = previous
+        clock.advance(when.timestamp() - clock.now().timestamp())
+
+        readings = []
+        for entity_id, value in changed.items():
+            state = states.set(entity_id, value, when)
+            if state is None or previous is None:
+                continue
+            index = powers.get(entity_id)
+            if index is not None:
+                coordinator._set_sensor_power(index, entity_id, state)
+            elif entity_id in meters:
+                readings.append((meters[entity_id], state))
+
+        if previous is None:
+            # The first readings seed the power total and the energy meters
+            coordinator.async_start_event_tracking()
+            next_snapshot = when.timestamp() + args.snapshot_every
+
+        coordinator._integrate(when, coordinator._get_total_power())
+        for index, state in readings:
+            coordinator._add_meter_reading(index, state, when)
+        ticks += 1
+        previous = when
+
+        if args.snapshot_every and when.timestamp() >= next_snapshot:
+            _emit({"type": "snapshot", **coordinator._build_data(when, coordinator._previous_power)})
+            next_snapshot = when.timestamp() + args.snapshot_every
+
+    elapsed = time.perf_counter() - started
+    if previous is not None:
+        _emit({"type": "final", **coordinator._build_data(previous, coordinator._previous_power)})
+    print(
+        f"{ticks} ticks in {elapsed:.2f} s, "
+        f"{elapsed / max(ticks, 1) * 1e6:.1f} us per tick",
+        file=sys.stderr,
+    )
+
+    await coordinator.async_shutdown()
+    await hass.async_stop(force=True)
+
+
+def main() -> None:
+    """Parse arguments and replay the trace."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace", help="CSV or JSON lines trace, optionally gzipped, or - for stdin")
+    parser.add_argument("--format", choices=("csv", "ndjson"), help="Trace format, by default from the file name")
+    plan = parser.add_mutually_exclusive_group()
+    plan.add_argument("--rate-plan", choices=sorted(RATE_PLAN_TEMPLATES), default="summer_tou_1001")
+    plan.add_argument("--rate-config", help="JSON file with a custom rate configuration")
+    parser.add_argument("--time-zone", default="America/Detroit")
+    parser.add_argument("--power-sensor", action="append", default=[], help="Power sensor field, repeatable")
+    parser.add_argument("--energy-sensor", action="append", default=[], help="Energy sensor field, repeatable")
+    parser.add_argument("--method", choices=INTEGRATION_METHODS, default=INTEGRATION_TRAPEZOID)
+    parser.add_argument("--median-window", type=int, default=1)
+    parser.add_argument("--max-power", type=float, default=0.0)
+    parser.add_argument("--max-gap", type=float, default=0.0)
+    parser.add_argument("--compare-plans", action="store_true", help="Also price every preset plan")
+    parser.add_argument("--snapshot-every", type=float, default=0.0, help="Seconds of trace time between snapshots")
+    asyncio.run(replay(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
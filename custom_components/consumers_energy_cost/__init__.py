@@ -7,8 +7,30 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 
-from .const import CONF_POWER_SENSORS, CONF_RATE_CONFIG, DOMAIN
+from .const import (
+    CONF_ENERGY_SENSORS,
+    CONF_INTEGRATION_METHOD,
+    CONF_MAX_GAP,
+    CONF_MAX_POWER,
+    CONF_MEDIAN_WINDOW,
+    CONF_PLAN_COMPARISON,
+    CONF_POWER_SENSORS,
+    CONF_PUBLISH_INTERVAL,
+    CONF_RATE_CONFIG,
+    CONF_RATE_PLAN,
+    CONF_SAVE_INTERVAL,
+    CONF_UPDATE_MODE,
+    CONF_USE_JOURNAL,
+    DEFAULT_PUBLISH_INTERVAL_SECONDS,
+    DEFAULT_SAVE_INTERVAL_SECONDS,
+    DOMAIN,
+    INTEGRATION_TRAPEZOID,
+    RATE_PLAN_CUSTOM,
+    RATE_PLAN_TEMPLATES,
+    UPDATE_MODE_POLLING,
+)
 from .coordinator import EnergyDataUpdateCoordinator
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,19 +39,47 @@ PLATFORMS: list[Platform] = [Platform.SENSOR]
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Consumers Energy Cost Tracker from a config entry."""
-    power_sensors = entry.data[CONF_POWER_SENSORS]
+    power_sensors = entry.data.get(CONF_POWER_SENSORS, [])
     rate_config = entry.data[CONF_RATE_CONFIG]
+    update_mode = entry.data.get(CONF_UPDATE_MODE, UPDATE_MODE_POLLING)
+
+    # Price the same consumption under every preset plan, and under the
+    # entry's own rates if they aren't one of them
+    compare_plans = None
+    if entry.data.get(CONF_PLAN_COMPARISON, False):
+        compare_plans = {
+            plan_id: template["config"] for plan_id, template in RATE_PLAN_TEMPLATES.items()
+        }
+        if entry.data.get(CONF_RATE_PLAN) not in RATE_PLAN_TEMPLATES:
+            compare_plans[RATE_PLAN_CUSTOM] = rate_config
 
     coordinator = EnergyDataUpdateCoordinator(
         hass,
         power_sensors,
         rate_config,
         entry.entry_id,
+        update_mode=update_mode,
+        publish_interval=entry.data.get(
+            CONF_PUBLISH_INTERVAL, DEFAULT_PUBLISH_INTERVAL_SECONDS
+        ),
+        save_interval=entry.data.get(CONF_SAVE_INTERVAL, DEFAULT_SAVE_INTERVAL_SECONDS),
+        use_journal=entry.data.get(CONF_USE_JOURNAL, False),
+        energy_sensors=entry.data.get(CONF_ENERGY_SENSORS, []),
+        integration_method=entry.data.get(CONF_INTEGRATION_METHOD, INTEGRATION_TRAPEZOID),
+        median_window=int(entry.data.get(CONF_MEDIAN_WINDOW, 1)),
+        max_power=entry.data.get(CONF_MAX_POWER, 0.0),
+        max_gap=entry.data.get(CONF_MAX_GAP, 0.0),
+        compare_plans=compare_plans,
     )
 
     # Fetch initial data
     await coordinator.async_config_entry_first_refresh()
 
+    # Keep the total power current as sensors change, price energy meter
+    # readings as they come in, and in event-driven mode integrate each
+    # power change as it happens
+    coordinator.async_start_event_tracking()
+
     # Store coordinator
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
@@ -37,6 +87,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Forward entry setup to platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    async_setup_services(hass)
+
     # Register update listener for options flow
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
@@ -46,6 +98,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        # Release the subscriptions, timers, journal and shared rate
+        # schedules before the coordinator is dropped
+        coordinator: EnergyDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+        await coordinator.async_shutdown()
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
@@ -53,5 +109,4 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry when options change."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    await hass.config_entries.async_reload(entry.entry_id)
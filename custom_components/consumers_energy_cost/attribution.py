@@ -0,0 +1,221 @@
+"""Per-source attribution of energy and cost."""
+from __future__ import annotations
+
+from array import array
+from typing import Any
+
+PERIODS = ("hourly", "daily", "weekly", "monthly", "yearly")
+
+
+class SourceLedger:
+    """Energy and cost of each source sensor, in parallel arrays by position.
+
+    Rather than splitting every update across all sources, the ledger keeps
+    the running energy and cost of one watt drawn since it was created.
+    A source holding steady power owes that power times the growth of the
+    per-watt totals since it was last settled, so it is only settled when
+    its power changes or a period rolls over. An update costs the same
+    however many sources there are; only the sources that changed are
+    touched.
+
+    Like the totals, a source whose power changed during an update is
+    integrated with the same rule (trapezoidal unless configured otherwise),
+    so the sources add up to the total while the rate is constant across
+    the update. Period values are the
+    running totals minus the running totals when the period started.
+    Energy meters hold no power and are charged their readings directly.
+    """
+
+    def __init__(self, entity_ids: list[str]) -> None:
+        """Initialize an empty ledger.
+
+        Args:
+            entity_ids: Power then energy sensor entity IDs, in position order
+        """
+        self.entity_ids = list(entity_ids)
+        self._index = {entity_id: index for index, entity_id in enumerate(self.entity_ids)}
+        count = len(self.entity_ids)
+
+        # Running energy (kWh) and cost of one watt
+        self.unit_energy = 0.0
+        self.unit_cost = 0.0
+        self._interval_energy = 0.0
+        self._interval_cost = 0.0
+
+        # Power held by each source, and the per-watt totals it was last
+        # settled at
+        self.power = array("d", [0.0]) * count
+        self._mark_energy = array("d", [0.0]) * count
+        self._mark_cost = array("d", [0.0]) * count
+
+        # Settled running totals, and their values at each period start
+        self.energy = array("d", [0.0]) * count
+        self.cost = array("d", [0.0]) * count
+        self._base_energy = {period: array("d", [0.0]) * count for period in PERIODS}
+        self._base_cost = {period: array("d", [0.0]) * count for period in PERIODS}
+        self.previous_month_energy = array("d", [0.0]) * count
+        self.previous_month_cost = array("d", [0.0]) * count
+
+        # Sources whose power changed since the last update
+        self._pending: dict[int, float] = {}
+
+    def __len__(self) -> int:
+        """Return the number of sources."""
+        return len(self.entity_ids)
+
+    def index(self, entity_id: str) -> int | None:
+        """Get the position of a source, or None if not tracked."""
+        return self._index.get(entity_id)
+
+    def set_power(self, index: int, power: float) -> None:
+        """Record a source's power at the end of the update in progress.
+
+        Args:
+            index: Source position
+            power: Power in watts, 0 if unavailable
+        """
+        if power != self.power[index] or index in self._pending:
+            self._pending[index] = power
+
+    def advance(self, unit_energy: float, unit_cost: float) -> None:
+        """Add the energy and cost of one watt over an integrated segment.
+
+        Args:
+            unit_energy: Energy of one watt over the segment in kWh
+            unit_cost: Cost of that energy
+        """
+        self.unit_energy += unit_energy
+        self.unit_cost += unit_cost
+        self._interval_energy += unit_energy
+        self._interval_cost += unit_cost
+
+    def end_update(self, ramp_weight: float = 0.5) -> None:
+        """Settle the sources that changed in the update just integrated.
+
+        With the trapezoidal rule, a changed source ramps linearly from its
+        old power to its new one over the update, so it owes half the change
+        on top of its old power.
+
+        Args:
+            ramp_weight: Share of the change owed over the update, 0 if the
+                old power was held throughout and 1 if the new one was
+        """
+        for index, power in self._pending.items():
+            self._settle(index)
+            ramp = (power - self.power[index]) * ramp_weight
+            self.energy[index] += ramp * self._interval_energy
+            self.cost[index] += ramp * self._interval_cost
+            self.power[index] = power
+        self._pending.clear()
+        self._interval_energy = 0.0
+        self._interval_cost = 0.0
+
+    def add(self, index: int, energy: float, cost: float) -> None:
+        """Charge a source energy and cost measured directly, such as a meter's.
+
+        Args:
+            index: Source position
+            energy: Energy in kWh
+            cost: Cost of that energy
+        """
+        self.energy[index] += energy
+        self.cost[index] += cost
+
+    def _settle(self, index: int) -> None:
+        """Bring a source's running totals up to the per-watt totals."""
+        power = self.power[index]
+        self.energy[index] += power * (self.unit_energy - self._mark_energy[index])
+        self.cost[index] += power * (self.unit_cost - self._mark_cost[index])
+        self._mark_energy[index] = self.unit_energy
+        self._mark_cost[index] = self.unit_cost
+
+    def _settle_all(self) -> None:
+        """Bring every source's running totals up to date."""
+        for index in range(len(self.entity_ids)):
+            self._settle(index)
+
+    def rollover(self, period: str, keep_previous: bool = True) -> None:
+        """Start a new period for every source.
+
+        Args:
+            period: One of PERIODS
+            keep_previous: For the monthly period, whether the month that
+                ended becomes the previous month (False if whole months
+                were skipped)
+        """
+        self._settle_all()
+        base_energy = self._base_energy[period]
+        base_cost = self._base_cost[period]
+
+        if period == "monthly":
+            for index in range(len(self.entity_ids)):
+                if keep_previous:
+                    self.previous_month_energy[index] = self.energy[index] - base_energy[index]
+                    self.previous_month_cost[index] = self.cost[index] - base_cost[index]
+                else:
+                    self.previous_month_energy[index] = 0.0
+                    self.previous_month_cost[index] = 0.0
+
+        base_energy[:] = self.energy
+        base_cost[:] = self.cost
+
+    def totals(self, index: int, period: str) -> tuple[float, float]:
+        """Get a source's energy and cost in the current period.
+
+        Args:
+            index: Source position
+            period: One of PERIODS
+
+        Returns:
+            Tuple of (energy kWh, cost)
+        """
+        power = self.power[index]
+        energy = self.energy[index] + power * (self.unit_energy - self._mark_energy[index])
+        cost = self.cost[index] + power * (self.unit_cost - self._mark_cost[index])
+        return (
+            energy - self._base_energy[period][index],
+            cost - self._base_cost[period][index],
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the period totals of every source.
+
+        Returns:
+            Dictionary of entity ID to period energy and cost
+        """
+        sources = {}
+        for index, entity_id in enumerate(self.entity_ids):
+            source: dict[str, float] = {}
+            for period in PERIODS:
+                source[f"{period}_energy"], source[f"{period}_cost"] = self.totals(index, period)
+            source["previous_month_energy"] = self.previous_month_energy[index]
+            source["previous_month_cost"] = self.previous_month_cost[index]
+            sources[entity_id] = source
+        return sources
+
+    def from_dict(self, sources: dict[str, dict[str, float]]) -> None:
+        """Load period totals serialized by to_dict.
+
+        Sources are matched by entity ID, so sensors added or removed since
+        the save start empty or are dropped.
+
+        Args:
+            sources: Serialized sources
+        """
+        for entity_id, source in sources.items():
+            index = self._index.get(entity_id)
+            if index is None:
+                continue
+
+            # Running totals restart at zero, so a period's base is minus
+            # its saved total
+            self._settle(index)
+            for period in PERIODS:
+                self._base_energy[period][index] = (
+                    self.energy[index] - source.get(f"{period}_energy", 0.0)
+                )
+                self._base_cost[period][index] = (
+                    self.cost[index] - source.get(f"{period}_cost", 0.0)
+                )
+            self.previous_month_energy[index] = source.get("previous_month_energy", 0.0)
+            self.previous_month_cost[index] = source.get("previous_month_cost", 0.0)
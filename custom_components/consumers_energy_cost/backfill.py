@@ -0,0 +1,204 @@
+"""Integrate recorded power and energy history over gaps in live updates."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Mapping, MutableMapping
+from datetime import datetime, tzinfo
+import heapq
+from operator import itemgetter
+from typing import Any
+
+from .meters import meter_delta
+from .rate_calculator import RateCalculator
+
+# Keys of the recorder's compressed state format
+STATE_KEY = "s"
+LAST_UPDATED_KEY = "lu"
+
+
+def _total(values: Mapping[str, float | None]) -> float | None:
+    """Sum the available sensor values.
+
+    Args:
+        values: Latest value of each sensor, None if unavailable
+
+    Returns:
+        Total power in watts, or None if no sensor is available
+    """
+    valid = [value for value in values.values() if value is not None]
+    return sum(valid) if valid else None
+
+
+def power_steps(
+    history: Mapping[str, Iterable[dict[str, Any]]],
+    last_values: MutableMapping[str, float | None],
+    start_ts: float,
+) -> list[tuple[float, float | None]]:
+    """Merge recorded sensor states into steps of total power.
+
+    Args:
+        history: Compressed recorder states per sensor, oldest first
+        last_values: Latest value of each sensor, carried between chunks
+            and updated in place
+        start_ts: Epoch seconds of the chunk start. Earlier states (the
+            state at the start of the chunk) are moved to it.
+
+    Returns:
+        List of (timestamp, total power) in time order, None where no
+        sensor was available
+    """
+    steps: list[tuple[float, float | None]] = []
+    if last_values:
+        steps.append((start_ts, _total(last_values)))
+
+    events = heapq.merge(
+        *(
+            [
+                (max(state[LAST_UPDATED_KEY], start_ts), entity_id, state[STATE_KEY])
+                for state in states
+            ]
+            for entity_id, states in history.items()
+        ),
+        key=itemgetter(0),
+    )
+
+    for timestamp, entity_id, state in events:
+        try:
+            last_values[entity_id] = float(state)
+        except (ValueError, TypeError):
+            # unavailable, unknown or garbage
+            last_values[entity_id] = None
+
+        step = (timestamp, _total(last_values))
+        if steps and steps[-1][0] == timestamp:
+            steps[-1] = step
+        else:
+            steps.append(step)
+
+    return steps
+
+
+def meter_steps(
+    history: Mapping[str, Iterable[dict[str, Any]]],
+    scales: Mapping[str, float],
+    last_readings: MutableMapping[str, tuple[float, float]],
+    start_ts: float,
+) -> list[tuple[float, float | None]]:
+    """Turn recorded energy meter readings into steps of total average power.
+
+    The energy between two readings is spread evenly over the time between
+    them. If the earlier reading is from before the chunk, the energy is
+    spread from the chunk start instead, so none is lost at chunk edges.
+    After its last reading a meter adds no power until the next one.
+
+    Args:
+        history: Compressed recorder states per meter, oldest first
+        scales: kWh per unit of each meter's readings
+        last_readings: Latest (timestamp, kWh) reading of each meter,
+            carried between chunks and updated in place
+        start_ts: Epoch seconds of the chunk start
+
+    Returns:
+        List of (timestamp, total power) in time order
+    """
+    powers: dict[str, list[dict[str, Any]]] = {}
+    for entity_id, states in history.items():
+        scale = scales.get(entity_id, 1.0)
+        meter_powers = powers.setdefault(entity_id, [])
+        for state in states:
+            try:
+                value = float(state[STATE_KEY]) * scale
+            except (ValueError, TypeError):
+                continue
+            timestamp = state[LAST_UPDATED_KEY]
+
+            last = last_readings.get(entity_id)
+            energy = meter_delta(last[1], value) if last is not None else 0.0
+            if energy is None:
+                continue
+            last_readings[entity_id] = (timestamp, value)
+
+            begin = max(last[0], start_ts) if last is not None else timestamp
+            if energy > 0 and timestamp > begin:
+                meter_powers.append(
+                    {STATE_KEY: energy * 3_600_000.0 / (timestamp - begin), LAST_UPDATED_KEY: begin}
+                )
+                meter_powers.append({STATE_KEY: 0.0, LAST_UPDATED_KEY: timestamp})
+
+    return power_steps(powers, {}, start_ts)
+
+
+def integrate_steps(
+    calculator: RateCalculator,
+    steps: list[tuple[float, float | None]],
+    end_ts: float,
+    cuts: Iterable[float],
+    tz: tzinfo,
+) -> list[tuple[float, float, float, float | None]]:
+    """Price steps of total power, binned between period rollovers.
+
+    Recorded states are step changes, so each value is held until the
+    next step. Intervals are split at every rate change and cut, and all
+    rates are looked up in one vectorized call.
+
+    Args:
+        calculator: Rate calculator to price the energy with
+        steps: List of (timestamp, total power) in time order
+        end_ts: Epoch seconds the last step is held until
+        cuts: Epoch seconds of period rollovers to bin at
+        tz: Time zone the rate schedule is defined in
+
+    Returns:
+        List of (bin end timestamp, energy kWh, cost, power at bin end),
+        one per bin that had power available
+    """
+    if not steps or steps[0][0] >= end_ts:
+        return []
+
+    start_ts = steps[0][0]
+    cut_set = {cut for cut in cuts if start_ts < cut < end_ts}
+
+    # Rate changes inside the range
+    splits = set(cut_set)
+    change = calculator.next_change(datetime.fromtimestamp(start_ts, tz))
+    while change is not None and change[0].timestamp() < end_ts:
+        splits.add(change[0].timestamp())
+        change = calculator.next_change(change[0])
+
+    edges = sorted(
+        splits.union(timestamp for timestamp, _ in steps if timestamp < end_ts)
+    )
+    edges.append(end_ts)
+
+    # Power held over each interval
+    powers: list[float | None] = []
+    step_index = 0
+    for edge in edges[:-1]:
+        while step_index + 1 < len(steps) and steps[step_index + 1][0] <= edge:
+            step_index += 1
+        powers.append(steps[step_index][1])
+
+    midpoints = array("d", ((edges[i] + edges[i + 1]) / 2 for i in range(len(powers))))
+    rates, _ = calculator.get_rates(midpoints, tz)
+
+    records: list[tuple[float, float, float, float | None]] = []
+    bin_energy = 0.0
+    bin_cost = 0.0
+    bin_valid = False
+    for i, power in enumerate(powers):
+        if power is not None:
+            energy = power * (edges[i + 1] - edges[i]) / 3_600_000.0
+            bin_energy += energy
+            bin_cost += energy * float(rates[i])
+            bin_valid = True
+
+        edge = edges[i + 1]
+        if edge in cut_set or edge == end_ts:
+            if bin_valid:
+                held = powers[i + 1] if i + 1 < len(powers) else power
+                records.append((edge, bin_energy, bin_cost, held))
+            bin_energy = 0.0
+            bin_cost = 0.0
+            bin_valid = False
+
+    return records
@@ -0,0 +1,186 @@
+"""Wall-clock and monotonic time sources for the coordinator."""
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine
+from datetime import datetime
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant
+from homeassistant.helpers.event import async_call_later, async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+# Intervals whose wall-clock and monotonic lengths differ by more than this
+# many seconds are taken to contain a clock step
+MAX_CLOCK_DRIFT_SECONDS = 2.0
+
+TimerAction = Callable[[datetime], Coroutine[Any, Any, None] | None]
+
+
+class Clock:
+    """The system clock.
+
+    Wall-clock time places readings in rate and billing periods. Monotonic
+    time measures how long passed between readings, and isn't moved by NTP
+    corrections or the clock being set.
+    """
+
+    def now(self) -> datetime:
+        """Return the current local time."""
+        return dt_util.now()
+
+    def monotonic(self) -> float:
+        """Return monotonic seconds."""
+        return time.monotonic()
+
+    def call_at(self, hass: HomeAssistant, when: datetime, action: TimerAction) -> CALLBACK_TYPE:
+        """Run an action when the wall clock reaches a time.
+
+        Args:
+            hass: Home Assistant instance to run the action on
+            when: Time to run the action at
+            action: Called with the time it runs at
+
+        Returns:
+            Callback that cancels the timer
+        """
+        return async_track_point_in_time(hass, action, when)
+
+    def call_later(self, hass: HomeAssistant, delay: float, action: TimerAction) -> CALLBACK_TYPE:
+        """Run an action once some seconds have passed.
+
+        Args:
+            hass: Home Assistant instance to run the action on
+            delay: Seconds to wait
+            action: Called with the time it runs at
+
+        Returns:
+            Callback that cancels the timer
+        """
+        return async_call_later(hass, delay, action)
+
+
+class VirtualClock(Clock):
+    """A clock that only moves when told to, for tests and simulation.
+
+    Time is kept as epoch seconds, so advancing across a DST change moves
+    the local time by the same number of real seconds. Timers only run when
+    the clock is moved past them, never on Home Assistant's own clock.
+    """
+
+    def __init__(self, start: datetime) -> None:
+        """Initialize the clock.
+
+        Args:
+            start: Time to start at
+        """
+        self._timestamp = start.timestamp()
+        self._monotonic = 0.0
+        # (on the monotonic clock, due time, hass, action)
+        self._timers: list[tuple[bool, float, HomeAssistant, TimerAction]] = []
+
+    def now(self) -> datetime:
+        """Return the current local time."""
+        return datetime.fromtimestamp(self._timestamp, dt_util.DEFAULT_TIME_ZONE)
+
+    def monotonic(self) -> float:
+        """Return monotonic seconds."""
+        return self._monotonic
+
+    def advance(self, seconds: float) -> None:
+        """Move both clocks forward.
+
+        Args:
+            seconds: Seconds to move by
+        """
+        self._timestamp += seconds
+        self._monotonic += seconds
+        self._run_due()
+
+    def step(self, seconds: float) -> None:
+        """Step the wall clock alone, as an NTP correction would.
+
+        Args:
+            seconds: Seconds to move the wall clock by, negative for back
+        """
+        self._timestamp += seconds
+        self._run_due()
+
+    def call_at(self, hass: HomeAssistant, when: datetime, action: TimerAction) -> CALLBACK_TYPE:
+        """Run an action when the virtual wall clock reaches a time.
+
+        Args:
+            hass: Home Assistant instance to run the action on
+            when: Time to run the action at
+            action: Called with the time it runs at
+
+        Returns:
+            Callback that cancels the timer
+        """
+        return self._add_timer((False, when.timestamp(), hass, action))
+
+    def call_later(self, hass: HomeAssistant, delay: float, action: TimerAction) -> CALLBACK_TYPE:
+        """Run an action once the virtual monotonic clock has moved on.
+
+        Args:
+            hass: Home Assistant instance to run the action on
+            delay: Seconds to wait
+            action: Called with the time it runs at
+
+        Returns:
+            Callback that cancels the timer
+        """
+        return self._add_timer((True, self._monotonic + delay, hass, action))
+
+    def _add_timer(self, timer: tuple[bool, float, HomeAssistant, TimerAction]) -> CALLBACK_TYPE:
+        """Add a timer, running it straight away if it's already due.
+
+        Args:
+            timer: Clock, due time, hass and action
+
+        Returns:
+            Callback that cancels the timer
+        """
+        self._timers.append(timer)
+
+        def cancel() -> None:
+            if timer in self._timers:
+                self._timers.remove(timer)
+
+        self._run_due()
+        return cancel
+
+    def _run_due(self) -> None:
+        """Hand the timers that are due to Home Assistant to run."""
+        due = [
+            timer
+            for timer in self._timers
+            if timer[1] <= (self._monotonic if timer[0] else self._timestamp)
+        ]
+        for timer in due:
+            self._timers.remove(timer)
+        for _monotonic, _due, hass, action in due:
+            hass.async_run_hass_job(HassJob(action), self.now())
+
+
+def elapsed_end(
+    previous: datetime, previous_monotonic: float, now: datetime, monotonic: float
+) -> datetime:
+    """Get the end of an interval measured on the monotonic clock.
+
+    Args:
+        previous: Wall-clock time at the start of the interval
+        previous_monotonic: Monotonic time at the start of the interval
+        now: Wall-clock time now
+        monotonic: Monotonic time now
+
+    Returns:
+        now, unless the wall clock moved by a different amount than the
+        monotonic clock, in which case the start plus the monotonic time
+        elapsed
+    """
+    elapsed = monotonic - previous_monotonic
+    start_ts = previous.timestamp()
+    if abs(now.timestamp() - start_ts - elapsed) <= MAX_CLOCK_DRIFT_SECONDS:
+        return now
+    return datetime.fromtimestamp(start_ts + elapsed, now.tzinfo)
@@ -0,0 +1,166 @@
+"""Cost of the same consumption under several rate plans."""
+from __future__ import annotations
+
+from array import array
+from datetime import datetime, tzinfo
+import math
+from typing import Any
+
+from .rate_calculator import RateCalculator
+
+# Don't project a month from less than this many seconds of it
+MIN_PROJECTION_SECONDS = 3600
+
+
+class PlanComparison:
+    """Month-to-date cost of the live consumption under every plan.
+
+    Each plan is compiled once. The rate of every plan is cached along with
+    the time until which none of them changes, so pricing an update is one
+    energy calculation and a multiply-add per plan; rates are only looked
+    up again when a plan's rate changes. Energy is split at those changes
+    like the configured plan's, so every plan is billed at the rate in
+    effect when the energy was used.
+    """
+
+    def __init__(self, plans: dict[str, dict], tz: tzinfo) -> None:
+        """Compile the plans.
+
+        Args:
+            plans: Rate configuration of each plan, by plan ID
+            tz: Time zone the rate schedules are defined in
+        """
+        self.plan_ids = list(plans)
+        self.calculators = [RateCalculator(config) for config in plans.values()]
+        self._tz = tz
+
+        count = len(self.plan_ids)
+        self.energy = 0.0
+        self.costs = array("d", [0.0]) * count
+
+        # Rates of every plan, valid from one timestamp until another
+        self._rates = array("d", [0.0]) * count
+        self._valid_from = math.inf
+        self._valid_until = -math.inf
+
+    def close(self) -> None:
+        """Release the plans' shared compiled schedules."""
+        for calculator in self.calculators:
+            calculator.close()
+
+    def __len__(self) -> int:
+        """Return the number of plans."""
+        return len(self.plan_ids)
+
+    def _refresh(self, timestamp: float) -> None:
+        """Look up every plan's rate at a timestamp and until when it holds."""
+        when = datetime.fromtimestamp(timestamp, self._tz)
+        until = math.inf
+        for index, calculator in enumerate(self.calculators):
+            self._rates[index] = calculator.get_rate(when)[0]
+            change = calculator.next_change(when)
+            if change is not None:
+                until = min(until, change[0].timestamp())
+        self._valid_from = timestamp
+        self._valid_until = until
+
+    def add(self, start_ts: float, end_ts: float, p_start: float, p_end: float) -> None:
+        """Price an interval of linearly changing power under every plan.
+
+        Args:
+            start_ts: Epoch seconds of the interval start
+            end_ts: Epoch seconds of the interval end
+            p_start: Power at the start in watts
+            p_end: Power at the end in watts
+        """
+        if not self.calculators or end_ts <= start_ts:
+            return
+
+        slope = (p_end - p_start) / (end_ts - start_ts)
+        piece_ts = start_ts
+        piece_power = p_start
+        while piece_ts < end_ts:
+            if not self._valid_from <= piece_ts < self._valid_until:
+                self._refresh(piece_ts)
+            piece_end = min(end_ts, self._valid_until)
+            end_power = p_start + slope * (piece_end - start_ts)
+            self._add_energy((piece_power + end_power) / 2 * (piece_end - piece_ts) / 3_600_000.0)
+            piece_ts = piece_end
+            piece_power = end_power
+
+    def add_energy(self, timestamp: float, energy: float) -> None:
+        """Price energy used at a time under every plan.
+
+        Args:
+            timestamp: Epoch seconds the energy was used at
+            energy: Energy in kWh
+        """
+        if not self.calculators:
+            return
+        if not self._valid_from <= timestamp < self._valid_until:
+            self._refresh(timestamp)
+        self._add_energy(energy)
+
+    def _add_energy(self, energy: float) -> None:
+        """Add energy at the cached rates."""
+        self.energy += energy
+        costs = self.costs
+        for index, rate in enumerate(self._rates):
+            costs[index] += energy * rate
+
+    def rollover(self) -> None:
+        """Start a new month."""
+        self.energy = 0.0
+        for index in range(len(self.costs)):
+            self.costs[index] = 0.0
+
+    def summary(self, timestamp: float, month_start: float, month_end: float) -> dict[str, Any]:
+        """Get every plan's month-to-date and projected cost.
+
+        The projection assumes the rest of the month costs what the month
+        has so far, per second.
+
+        Args:
+            timestamp: Epoch seconds now
+            month_start: Epoch seconds the month started
+            month_end: Epoch seconds the month ends
+
+        Returns:
+            Dictionary with the month's energy, each plan's cost and
+            projected cost (None early in the month), and the ID of the
+            cheapest plan so far, which is also the cheapest projected
+        """
+        elapsed = timestamp - month_start
+        scale = (month_end - month_start) / elapsed if elapsed >= MIN_PROJECTION_SECONDS else None
+
+        plans = {}
+        for plan_id, cost in zip(self.plan_ids, self.costs):
+            plans[plan_id] = {
+                "cost_month": cost,
+                "projected_cost_month": cost * scale if scale is not None else None,
+            }
+
+        cheapest = min(self.plan_ids, key=lambda plan_id: plans[plan_id]["cost_month"], default=None)
+        return {"energy_month": self.energy, "plans": plans, "cheapest": cheapest}
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the month-to-date totals.
+
+        Returns:
+            Dictionary with the month's energy and each plan's cost
+        """
+        return {
+            "energy": self.energy,
+            "costs": dict(zip(self.plan_ids, self.costs)),
+        }
+
+    def from_dict(self, data: dict[str, Any]) -> None:
+        """Load totals serialized by to_dict, matched by plan ID.
+
+        Args:
+            data: Serialized totals
+        """
+        self.energy = data.get("energy", 0.0)
+        costs = data.get("costs", {})
+        for index, plan_id in enumerate(self.plan_ids):
+            self.costs[index] = costs.get(plan_id, 0.0)
@@ -13,17 +13,36 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import selector
 
 from .const import (
+    CONF_ENERGY_SENSORS,
     CONF_INSTANCE_NAME,
+    CONF_INTEGRATION_METHOD,
+    CONF_MAX_GAP,
+    CONF_MAX_POWER,
+    CONF_MEDIAN_WINDOW,
+    CONF_PLAN_COMPARISON,
     CONF_POWER_SENSORS,
+    CONF_PUBLISH_INTERVAL,
     CONF_RATE_CONFIG,
     CONF_RATE_PLAN,
+    CONF_SAVE_INTERVAL,
+    CONF_SOURCE_SENSORS,
+    CONF_UPDATE_MODE,
+    CONF_USE_JOURNAL,
     CONF_USE_PRESET,
+    DEFAULT_PUBLISH_INTERVAL_SECONDS,
+    DEFAULT_SAVE_INTERVAL_SECONDS,
     DOMAIN,
+    INTEGRATION_LEFT,
+    INTEGRATION_RIGHT,
+    INTEGRATION_SIMPSON,
+    INTEGRATION_TRAPEZOID,
     RATE_PLAN_CUSTOM,
     RATE_PLAN_NIGHTTIME_SAVERS,
     RATE_PLAN_SMART_HOURS,
     RATE_PLAN_SUMMER_TOU,
     RATE_PLAN_TEMPLATES,
+    UPDATE_MODE_EVENT,
+    UPDATE_MODE_POLLING,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -38,6 +57,7 @@ class ConsumersEnergyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Initialize the config flow."""
         self._instance_name: str = ""
         self._power_sensors: list[str] = []
+        self._energy_sensors: list[str] = []
         self._rate_plan: str | None = None
         self._rate_config: dict | None = None
 
@@ -50,14 +70,16 @@ class ConsumersEnergyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             instance_name = user_input.get(CONF_INSTANCE_NAME, "").strip()
             power_sensors = user_input.get(CONF_POWER_SENSORS, [])
+            energy_sensors = user_input.get(CONF_ENERGY_SENSORS, [])
 
             if not instance_name:
                 errors[CONF_INSTANCE_NAME] = "no_name"
-            elif not power_sensors:
+            elif not power_sensors and not energy_sensors:
                 errors[CONF_POWER_SENSORS] = "no_sensors"
             else:
                 self._instance_name = instance_name
                 self._power_sensors = power_sensors
+                self._energy_sensors = energy_sensors
                 return await self.async_step_rate_plan()
 
         # Get all power sensors
@@ -74,13 +96,20 @@ class ConsumersEnergyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         type=selector.TextSelectorType.TEXT,
                     ),
                 ),
-                vol.Required(CONF_POWER_SENSORS): selector.EntitySelector(
+                vol.Optional(CONF_POWER_SENSORS): selector.EntitySelector(
                     selector.EntitySelectorConfig(
                         domain=SENSOR_DOMAIN,
                         device_class="power",
                         multiple=True,
                     ),
                 ),
+                vol.Optional(CONF_ENERGY_SENSORS): selector.EntitySelector(
+                    selector.EntitySelectorConfig(
+                        domain=SENSOR_DOMAIN,
+                        device_class="energy",
+                        multiple=True,
+                    ),
+                ),
             }
         )
 
@@ -140,6 +169,7 @@ class ConsumersEnergyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     data={
                         CONF_INSTANCE_NAME: self._instance_name,
                         CONF_POWER_SENSORS: self._power_sensors,
+                        CONF_ENERGY_SENSORS: self._energy_sensors,
                         CONF_RATE_PLAN: self._rate_plan,
                         CONF_RATE_CONFIG: self._rate_config,
                     },
@@ -223,6 +253,7 @@ class ConsumersEnergyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 data={
                     CONF_INSTANCE_NAME: self._instance_name,
                     CONF_POWER_SENSORS: self._power_sensors,
+                    CONF_ENERGY_SENSORS: self._energy_sensors,
                     CONF_RATE_PLAN: self._rate_plan,
                     CONF_RATE_CONFIG: self._rate_config,
                 },
@@ -295,6 +326,8 @@ class ConsumersEnergyOptionsFlow(config_entries.OptionsFlow):
                 return await self.async_step_update_sensors()
             elif self._update_type == "rates":
                 return await self.async_step_update_rates()
+            elif self._update_type == "settings":
+                return await self.async_step_update_settings()
 
         return self.async_show_form(
             step_id="init",
@@ -311,6 +344,10 @@ class ConsumersEnergyOptionsFlow(config_entries.OptionsFlow):
                                     value="rates",
                                     label="Update Rate Plan / Custom Rates"
                                 ),
+                                selector.SelectOptionDict(
+                                    value="settings",
+                                    label="Update Mode / Publish and Save Rate"
+                                ),
                             ],
                             mode=selector.SelectSelectorMode.LIST,
                         ),
@@ -322,22 +359,27 @@ class ConsumersEnergyOptionsFlow(config_entries.OptionsFlow):
     async def async_step_update_sensors(
         self, user_input: dict[str, Any] | None = None
     ) -> config_entries.FlowResult:
-        """Update power sensors."""
+        """Update power and energy sensors."""
         errors: dict[str, str] = {}
 
         if user_input is not None:
             power_sensors = user_input.get(CONF_POWER_SENSORS, [])
+            energy_sensors = user_input.get(CONF_ENERGY_SENSORS, [])
 
-            if not power_sensors:
+            if not power_sensors and not energy_sensors:
                 errors[CONF_POWER_SENSORS] = "no_sensors"
             else:
                 # Update config entry data
                 self.hass.config_entries.async_update_entry(
                     self.config_entry,
-                    data={**self.config_entry.data, CONF_POWER_SENSORS: power_sensors},
+                    data={
+                        **self.config_entry.data,
+                        CONF_POWER_SENSORS: power_sensors,
+                        CONF_ENERGY_SENSORS: energy_sensors,
+                        CONF_SOURCE_SENSORS: user_input.get(CONF_SOURCE_SENSORS, False),
+                        CONF_PLAN_COMPARISON: user_input.get(CONF_PLAN_COMPARISON, False),
+                    },
                 )
-                # Trigger reload of the integration
-                await self.hass.config_entries.async_reload(self.config_entry.entry_id)
                 return self.async_create_entry(title="", data={})
 
         # Get current sensors from config entry
@@ -353,16 +395,30 @@ class ConsumersEnergyOptionsFlow(config_entries.OptionsFlow):
             data_schema=self.add_suggested_values_to_schema(
                 vol.Schema(
                     {
-                        vol.Required(CONF_POWER_SENSORS): selector.EntitySelector(
+                        vol.Optional(CONF_POWER_SENSORS): selector.EntitySelector(
                             selector.EntitySelectorConfig(
                                 domain=SENSOR_DOMAIN,
                                 device_class="power",
                                 multiple=True,
                             ),
                         ),
+                        vol.Optional(CONF_ENERGY_SENSORS): selector.EntitySelector(
+                            selector.EntitySelectorConfig(
+                                domain=SENSOR_DOMAIN,
+                                device_class="energy",
+                                multiple=True,
+                            ),
+                        ),
+                        vol.Required(CONF_SOURCE_SENSORS): selector.BooleanSelector(),
+                        vol.Required(CONF_PLAN_COMPARISON): selector.BooleanSelector(),
                     }
                 ),
-                {CONF_POWER_SENSORS: current_sensors},
+                {
+                    CONF_POWER_SENSORS: current_sensors,
+                    CONF_ENERGY_SENSORS: self.config_entry.data.get(CONF_ENERGY_SENSORS, []),
+                    CONF_SOURCE_SENSORS: self.config_entry.data.get(CONF_SOURCE_SENSORS, False),
+                    CONF_PLAN_COMPARISON: self.config_entry.data.get(CONF_PLAN_COMPARISON, False),
+                },
             ),
             errors=errors,
             description_placeholders={
@@ -370,6 +426,139 @@ class ConsumersEnergyOptionsFlow(config_entries.OptionsFlow):
             },
         )
 
+    async def async_step_update_settings(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.FlowResult:
+        """Update how power sensors are read, integrated and published."""
+        if user_input is not None:
+            self.hass.config_entries.async_update_entry(
+                self.config_entry,
+                data={
+                    **self.config_entry.data,
+                    CONF_UPDATE_MODE: user_input[CONF_UPDATE_MODE],
+                    CONF_PUBLISH_INTERVAL: user_input[CONF_PUBLISH_INTERVAL],
+                    CONF_SAVE_INTERVAL: user_input[CONF_SAVE_INTERVAL],
+                    CONF_USE_JOURNAL: user_input[CONF_USE_JOURNAL],
+                    CONF_INTEGRATION_METHOD: user_input[CONF_INTEGRATION_METHOD],
+                    CONF_MEDIAN_WINDOW: int(user_input[CONF_MEDIAN_WINDOW]),
+                    CONF_MAX_POWER: user_input[CONF_MAX_POWER],
+                    CONF_MAX_GAP: user_input[CONF_MAX_GAP],
+                },
+            )
+            return self.async_create_entry(title="", data={})
+
+        return self.async_show_form(
+            step_id="update_settings",
+            data_schema=self.add_suggested_values_to_schema(
+                vol.Schema(
+                    {
+                        vol.Required(CONF_UPDATE_MODE): selector.SelectSelector(
+                            selector.SelectSelectorConfig(
+                                options=[
+                                    selector.SelectOptionDict(
+                                        value=UPDATE_MODE_POLLING,
+                                        label="Polling (every 30 seconds)",
+                                    ),
+                                    selector.SelectOptionDict(
+                                        value=UPDATE_MODE_EVENT,
+                                        label="Event-driven (on sensor changes)",
+                                    ),
+                                ],
+                                mode=selector.SelectSelectorMode.LIST,
+                            ),
+                        ),
+                        vol.Required(CONF_PUBLISH_INTERVAL): selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=1,
+                                max=300,
+                                step=1,
+                                mode=selector.NumberSelectorMode.BOX,
+                                unit_of_measurement="s",
+                            ),
+                        ),
+                        vol.Required(CONF_SAVE_INTERVAL): selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=10,
+                                max=3600,
+                                step=1,
+                                mode=selector.NumberSelectorMode.BOX,
+                                unit_of_measurement="s",
+                            ),
+                        ),
+                        vol.Required(CONF_USE_JOURNAL): selector.BooleanSelector(),
+                        vol.Required(CONF_INTEGRATION_METHOD): selector.SelectSelector(
+                            selector.SelectSelectorConfig(
+                                options=[
+                                    selector.SelectOptionDict(
+                                        value=INTEGRATION_TRAPEZOID,
+                                        label="Trapezoid (power ramps between readings)",
+                                    ),
+                                    selector.SelectOptionDict(
+                                        value=INTEGRATION_LEFT,
+                                        label="Left Riemann (hold each reading until the next)",
+                                    ),
+                                    selector.SelectOptionDict(
+                                        value=INTEGRATION_RIGHT,
+                                        label="Right Riemann (hold each reading back to the last)",
+                                    ),
+                                    selector.SelectOptionDict(
+                                        value=INTEGRATION_SIMPSON,
+                                        label="Simpson (parabola through the last three readings)",
+                                    ),
+                                ],
+                                mode=selector.SelectSelectorMode.DROPDOWN,
+                            ),
+                        ),
+                        vol.Required(CONF_MEDIAN_WINDOW): selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=1,
+                                max=9,
+                                step=2,
+                                mode=selector.NumberSelectorMode.BOX,
+                                unit_of_measurement="readings",
+                            ),
+                        ),
+                        vol.Required(CONF_MAX_POWER): selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=0,
+                                max=1000000,
+                                step=1,
+                                mode=selector.NumberSelectorMode.BOX,
+                                unit_of_measurement="W",
+                            ),
+                        ),
+                        vol.Required(CONF_MAX_GAP): selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=0,
+                                max=86400,
+                                step=1,
+                                mode=selector.NumberSelectorMode.BOX,
+                                unit_of_measurement="s",
+                            ),
+                        ),
+                    }
+                ),
+                {
+                    CONF_UPDATE_MODE: self.config_entry.data.get(
+                        CONF_UPDATE_MODE, UPDATE_MODE_POLLING
+                    ),
+                    CONF_PUBLISH_INTERVAL: self.config_entry.data.get(
+                        CONF_PUBLISH_INTERVAL, DEFAULT_PUBLISH_INTERVAL_SECONDS
+                    ),
+                    CONF_SAVE_INTERVAL: self.config_entry.data.get(
+                        CONF_SAVE_INTERVAL, DEFAULT_SAVE_INTERVAL_SECONDS
+                    ),
+                    CONF_USE_JOURNAL: self.config_entry.data.get(CONF_USE_JOURNAL, False),
+                    CONF_INTEGRATION_METHOD: self.config_entry.data.get(
+                        CONF_INTEGRATION_METHOD, INTEGRATION_TRAPEZOID
+                    ),
+                    CONF_MEDIAN_WINDOW: self.config_entry.data.get(CONF_MEDIAN_WINDOW, 1),
+                    CONF_MAX_POWER: self.config_entry.data.get(CONF_MAX_POWER, 0),
+                    CONF_MAX_GAP: self.config_entry.data.get(CONF_MAX_GAP, 0),
+                },
+            ),
+        )
+
     async def async_step_update_rates(
         self, user_input: dict[str, Any] | None = None
     ) -> config_entries.FlowResult:
@@ -394,7 +583,6 @@ class ConsumersEnergyOptionsFlow(config_entries.OptionsFlow):
                         CONF_RATE_CONFIG: rate_config,
                     },
                 )
-                await self.hass.config_entries.async_reload(self.config_entry.entry_id)
                 return self.async_create_entry(title="", data={})
             else:
                 errors[CONF_RATE_PLAN] = "invalid_plan"
@@ -473,7 +661,6 @@ class ConsumersEnergyOptionsFlow(config_entries.OptionsFlow):
                     CONF_RATE_CONFIG: rate_config,
                 },
             )
-            await self.hass.config_entries.async_reload(self.config_entry.entry_id)
             return self.async_create_entry(title="", data={})
 
         # Get current custom rates if they exist
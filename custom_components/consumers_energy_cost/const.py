@@ -5,10 +5,21 @@ DOMAIN: Final = "consumers_energy_cost"
 
 # Configuration keys
 CONF_POWER_SENSORS: Final = "power_sensors"
+CONF_ENERGY_SENSORS: Final = "energy_sensors"
 CONF_RATE_PLAN: Final = "rate_plan"
 CONF_RATE_CONFIG: Final = "rate_config"
 CONF_USE_PRESET: Final = "use_preset"
 CONF_INSTANCE_NAME: Final = "instance_name"
+CONF_UPDATE_MODE: Final = "update_mode"
+CONF_PUBLISH_INTERVAL: Final = "publish_interval"
+CONF_SAVE_INTERVAL: Final = "save_interval"
+CONF_USE_JOURNAL: Final = "use_journal"
+CONF_SOURCE_SENSORS: Final = "source_sensors"
+CONF_INTEGRATION_METHOD: Final = "integration_method"
+CONF_MEDIAN_WINDOW: Final = "median_window"
+CONF_MAX_POWER: Final = "max_power"
+CONF_MAX_GAP: Final = "max_gap"
+CONF_PLAN_COMPARISON: Final = "plan_comparison"
 
 # Rate plan presets
 RATE_PLAN_SUMMER_TOU: Final = "summer_tou_1001"
@@ -16,9 +27,46 @@ RATE_PLAN_SMART_HOURS: Final = "smart_hours_1040"
 RATE_PLAN_NIGHTTIME_SAVERS: Final = "nighttime_savers_1050"
 RATE_PLAN_CUSTOM: Final = "custom"
 
+# Update modes
+UPDATE_MODE_POLLING: Final = "polling"
+UPDATE_MODE_EVENT: Final = "event"
+
+# Integration methods between power samples
+INTEGRATION_LEFT: Final = "left"
+INTEGRATION_RIGHT: Final = "right"
+INTEGRATION_TRAPEZOID: Final = "trapezoid"
+INTEGRATION_SIMPSON: Final = "simpson"
+
 # Update interval
 UPDATE_INTERVAL_SECONDS: Final = 30
 
+# Event-driven mode: minimum seconds between entity publishes, and the
+# refresh interval used to handle period rollovers while sensors are idle
+DEFAULT_PUBLISH_INTERVAL_SECONDS: Final = 10
+EVENT_HEARTBEAT_SECONDS: Final = 300
+
+# Maximum seconds accumulator state may go unsaved; period rollovers are
+# always written immediately
+DEFAULT_SAVE_INTERVAL_SECONDS: Final = 300
+
+# With the delta journal enabled, snapshot and compact after this many
+# records (one day of 30-second ticks)
+JOURNAL_COMPACT_RECORDS: Final = 2880
+
+# Gaps longer than this since the last reading (e.g. a restart) are filled
+# from recorder history, queried and integrated this many seconds at a time
+BACKFILL_MIN_GAP_SECONDS: Final = 300
+BACKFILL_CHUNK_SECONDS: Final = 6 * 3600
+
+# Services
+SERVICE_RECALCULATE: Final = "recalculate"
+SERVICE_GET_HISTORY: Final = "get_history"
+ATTR_ENTRY_ID: Final = "entry_id"
+ATTR_START: Final = "start"
+ATTR_END: Final = "end"
+ATTR_RATE_PLAN: Final = "rate_plan"
+ATTR_RESOLUTION: Final = "resolution"
+
 # Sensor entity IDs
 SENSOR_TOTAL_POWER: Final = "total_power"
 SENSOR_CURRENT_RATE: Final = "current_rate"
@@ -36,6 +84,17 @@ SENSOR_ENERGY_YEAR: Final = "energy_year"
 SENSOR_COST_YEAR: Final = "cost_year"
 SENSOR_ENERGY_PREVIOUS_MONTH: Final = "energy_previous_month"
 SENSOR_COST_PREVIOUS_MONTH: Final = "cost_previous_month"
+SENSOR_ENERGY_60M: Final = "energy_60m"
+SENSOR_COST_60M: Final = "cost_60m"
+SENSOR_ENERGY_24H: Final = "energy_24h"
+SENSOR_COST_24H: Final = "cost_24h"
+SENSOR_ENERGY_7D: Final = "energy_7d"
+SENSOR_COST_7D: Final = "cost_7d"
+SENSOR_SOURCE_ENERGY: Final = "source_energy"
+SENSOR_SOURCE_COST: Final = "source_cost"
+SENSOR_PLAN_COST: Final = "plan_cost"
+SENSOR_PLAN_PROJECTED_COST: Final = "plan_projected_cost"
+SENSOR_CHEAPEST_PLAN: Final = "cheapest_plan"
 
 # Rate plan templates for Consumers Energy
 RATE_PLAN_TEMPLATES = {
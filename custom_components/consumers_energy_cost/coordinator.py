@@ -1,22 +1,154 @@
 """Data update coordinator for Consumers Energy Cost Tracker."""
-from datetime import datetime, timedelta
+import asyncio
+from datetime import date, datetime, timedelta
+from functools import partial
 import logging
+import math
+from operator import itemgetter
 from typing import Any
 
-from homeassistant.core import HomeAssistant, State
+from homeassistant.components.recorder import get_instance, history
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, UnitOfEnergy
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.json import json_bytes
 from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
-
-from .const import DOMAIN, UPDATE_INTERVAL_SECONDS
+from homeassistant.util.unit_conversion import EnergyConverter
+
+from .attribution import SourceLedger
+from .backfill import integrate_steps, meter_steps, power_steps
+from .clock import Clock, elapsed_end
+from .comparison import PlanComparison
+from .const import (
+    BACKFILL_CHUNK_SECONDS,
+    BACKFILL_MIN_GAP_SECONDS,
+    DEFAULT_PUBLISH_INTERVAL_SECONDS,
+    DEFAULT_SAVE_INTERVAL_SECONDS,
+    DOMAIN,
+    EVENT_HEARTBEAT_SECONDS,
+    INTEGRATION_TRAPEZOID,
+    JOURNAL_COMPACT_RECORDS,
+    UPDATE_INTERVAL_SECONDS,
+    UPDATE_MODE_EVENT,
+    UPDATE_MODE_POLLING,
+)
+from .fixed_point import COST_SCALE, ENERGY_SCALE, UnitCarry, migrate_float_totals
+from .integration import SampleIntegrator
+from .journal import RECORD, DeltaJournal
+from .meters import EnergyMeters
+from .minute_history import RESOLUTION_SECONDS, MinuteHistory
+from .power_sum import PowerSum
 from .rate_calculator import RateCalculator
+from .rollup import RollupStore, read_file, write_file
 
 _LOGGER = logging.getLogger(__name__)
 
-STORAGE_VERSION = 1
+# Version 2 saves the accumulators as integer units
+STORAGE_VERSION = 2
 STORAGE_KEY = "consumers_energy_cost_state"
 
 
+def _period_start(period: str, when: datetime) -> datetime:
+    """Get the start of the calendar period containing a local datetime.
+
+    Args:
+        period: One of "hour", "day", "week", "month" or "year"
+        when: Local datetime
+
+    Returns:
+        Local datetime of the period start
+    """
+    if period == "hour":
+        return when.replace(minute=0, second=0, microsecond=0)
+
+    day = when.date()
+    if period == "week":
+        day -= timedelta(days=day.weekday())
+    elif period == "month":
+        day = day.replace(day=1)
+    elif period == "year":
+        day = date(day.year, 1, 1)
+    return dt_util.start_of_local_day(day)
+
+
+def _period_end(period: str, start: datetime) -> float:
+    """Get the epoch timestamp at which a period rolls over.
+
+    Day and longer periods end at the next local midnight, so a 23 or 25
+    hour DST day is handled by the time zone rather than fixed offsets.
+
+    Args:
+        period: One of "hour", "day", "week", "month" or "year"
+        start: Local datetime of the period start
+
+    Returns:
+        Epoch seconds of the next period start
+    """
+    if period == "hour":
+        return start.timestamp() + 3600.0
+
+    day = start.date()
+    if period == "day":
+        day += timedelta(days=1)
+    elif period == "week":
+        day += timedelta(days=7)
+    elif period == "month":
+        day = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    else:
+        day = date(day.year + 1, 1, 1)
+    return dt_util.start_of_local_day(day).timestamp()
+
+
+def _rollover_times(start_ts: float, end_ts: float) -> list[float]:
+    """List the period rollovers between two timestamps.
+
+    Every week, month and year rollover is also a day rollover, so the
+    hour and day rollovers are all of them.
+
+    Args:
+        start_ts: Epoch seconds to start from (exclusive)
+        end_ts: Epoch seconds to end at (exclusive)
+
+    Returns:
+        Epoch seconds of every period rollover, in order
+    """
+    start = datetime.fromtimestamp(start_ts, dt_util.DEFAULT_TIME_ZONE)
+    times: set[float] = set()
+    for period in ("hour", "day"):
+        end = _period_end(period, _period_start(period, start))
+        while end < end_ts:
+            times.add(end)
+            end = _period_end(
+                period,
+                _period_start(period, datetime.fromtimestamp(end, dt_util.DEFAULT_TIME_ZONE)),
+            )
+    return sorted(times)
+
+
+class StateStore(Store):
+    """Store for the accumulator state that migrates older saves."""
+
+    async def _async_migrate_func(
+        self, old_major_version: int, old_minor_version: int, old_data: dict
+    ) -> dict:
+        """Migrate saved state to the current version.
+
+        Args:
+            old_major_version: Major version of the saved state
+            old_minor_version: Minor version of the saved state
+            old_data: Saved state
+
+        Returns:
+            State in the current format
+        """
+        if old_major_version < 2:
+            old_data = migrate_float_totals(old_data)
+        return old_data
+
+
 class EnergyDataUpdateCoordinator(DataUpdateCoordinator):
     """Coordinator to manage energy data updates."""
 
@@ -26,6 +158,17 @@ class EnergyDataUpdateCoordinator(DataUpdateCoordinator):
         power_sensors: list[str],
         rate_config: dict,
         entry_id: str,
+        update_mode: str = UPDATE_MODE_POLLING,
+        publish_interval: float = DEFAULT_PUBLISH_INTERVAL_SECONDS,
+        save_interval: float = DEFAULT_SAVE_INTERVAL_SECONDS,
+        use_journal: bool = False,
+        energy_sensors: list[str] | None = None,
+        integration_method: str = INTEGRATION_TRAPEZOID,
+        median_window: int = 1,
+        max_power: float = 0.0,
+        max_gap: float = 0.0,
+        compare_plans: dict[str, dict] | None = None,
+        clock: Clock | None = None,
     ) -> None:
         """Initialize the coordinator.
 
@@ -34,61 +177,175 @@ class EnergyDataUpdateCoordinator(DataUpdateCoordinator):
             power_sensors: List of power sensor entity IDs
             rate_config: Rate configuration dictionary
             entry_id: Config entry ID for unique storage
+            update_mode: Poll sensors on an interval or integrate state changes
+            publish_interval: Minimum seconds between publishes in event mode
+            save_interval: Maximum seconds unsaved state may be held in memory
+            use_journal: Journal every tick and snapshot only on compaction
+            energy_sensors: List of cumulative energy sensor entity IDs
+            integration_method: Rule used between power samples
+            median_window: Number of total power samples to take the median
+                of, 1 for no filter
+            max_power: Sensor readings above this many watts are ignored as
+                spikes, 0 for no limit
+            max_gap: Intervals between readings longer than this many
+                seconds are not integrated, 0 for no limit
+            compare_plans: Rate configuration of each plan to price the
+                same consumption under, by plan ID
+            clock: Source of wall-clock and monotonic time, the system
+                clock by default
         """
+        if update_mode == UPDATE_MODE_EVENT:
+            update_interval = timedelta(seconds=EVENT_HEARTBEAT_SECONDS)
+        else:
+            update_interval = timedelta(seconds=UPDATE_INTERVAL_SECONDS)
+
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=UPDATE_INTERVAL_SECONDS),
+            update_interval=update_interval,
         )
         self.power_sensors = power_sensors
+        self.energy_sensors = list(energy_sensors or [])
+        self.clock = clock or Clock()
+        self.update_mode = update_mode
+        self._publish_interval = publish_interval
         self.rate_calculator = RateCalculator(rate_config)
         self._entry_id = entry_id
 
         # Create persistent storage
-        self._store = Store(
+        self._store = StateStore(
             hass,
             STORAGE_VERSION,
             f"{STORAGE_KEY}_{entry_id}",
         )
 
-        # Previous state for energy calculation
-        self._previous_power: float | None = None
-        self._previous_timestamp: datetime | None = None
+        # Write coalescing: state is marked dirty on every tick and written at
+        # most once per save interval, or right away after a period rollover
+        self._save_interval = save_interval
+        self._dirty = False
+        self._save_scheduled = False
+        self._flush_pending = False
+        self._save_count = 0
+        self._save_bytes = 0
+        self._last_save: datetime | None = None
+
+        # Optional append-only journal of per-tick deltas. Records are queued
+        # on the event loop and written in order by a single drain task.
+        self._journal: DeltaJournal | None = None
+        if use_journal:
+            self._journal = DeltaJournal(
+                hass.config.path(".storage", f"{STORAGE_KEY}_{entry_id}.journal")
+            )
+        self._journal_pending: list[bytes] = []
+        self._journal_lock = asyncio.Lock()
+        self._journal_draining = False
+        self._journal_compacting = False
+        self._journal_records = 0
+        self._journal_bytes = 0
+        self._journal_timestamp = 0.0
+
+        # Minute/hour/day/month history of energy and cost. Hours, days and
+        # months are saved alongside the accumulator state; minutes live in
+        # a memory-mapped file that is attached once opened.
+        self.rollups = RollupStore(dt_util.DEFAULT_TIME_ZONE)
+        self._rollup_path = hass.config.path(".storage", f"{STORAGE_KEY}_{entry_id}.rollup")
+        self._minutes = MinuteHistory(
+            hass.config.path(".storage", f"{STORAGE_KEY}_{entry_id}.minutes")
+        )
+        self._rollup_write: asyncio.Task | None = None
 
-        # Period accumulators - will be initialized from storage or defaults
-        self._daily_energy = 0.0
-        self._daily_cost = 0.0
-        self._daily_start = dt_util.start_of_local_day()
+        # Parsed power of each sensor, kept current by state change events
+        self._power = PowerSum(len(power_sensors))
+        self._max_power = max_power
 
-        self._weekly_energy = 0.0
-        self._weekly_cost = 0.0
-        self._weekly_start = self._get_week_start()
+        # Filters power samples and applies the integration rule
+        self._integrator = SampleIntegrator(integration_method, median_window, max_gap)
 
-        self._monthly_energy = 0.0
-        self._monthly_cost = 0.0
-        self._monthly_start = dt_util.now().replace(
-            day=1, hour=0, minute=0, second=0, microsecond=0
-        )
+        # Last reading of each energy meter
+        self._meters = EnergyMeters(self.energy_sensors)
 
-        self._yearly_energy = 0.0
-        self._yearly_cost = 0.0
-        self._yearly_start = dt_util.now().replace(
-            month=1, day=1, hour=0, minute=0, second=0, microsecond=0
-        )
+        # Meter readings waiting for the next poll to integrate power past
+        # them, or for a recalculation to finish
+        self._meter_readings: list[tuple[int, State, datetime]] = []
+
+        # Live updates aren't integrated while recorder history is rebuilt
+        # up to the time the recalculation started
+        self._recalculating = False
+
+        # Energy and cost of each power and energy sensor, attributed from
+        # live updates
+        self.sources = SourceLedger(power_sensors + self.energy_sensors)
 
-        # Hourly tracking (rolling 1-hour window)
-        self._hourly_energy = 0.0
-        self._hourly_cost = 0.0
-        self._hourly_start = dt_util.now().replace(minute=0, second=0, microsecond=0)
+        # Month-to-date cost of the same consumption under other plans
+        self.comparison = PlanComparison(compare_plans or {}, dt_util.DEFAULT_TIME_ZONE)
+
+        # Previous state for energy calculation, and the monotonic time it
+        # was integrated at to measure polled intervals with
+        self._previous_power: float | None = None
+        self._previous_timestamp: datetime | None = None
+        self._previous_monotonic: float | None = None
+
+        # Period accumulators in integer units (milliwatt-hours and
+        # micro-dollars), converted to kWh and dollars when published, so
+        # adding millions of small deltas a year doesn't drift. Will be
+        # initialized from storage or defaults.
+        self._energy_carry = UnitCarry(ENERGY_SCALE)
+        self._cost_carry = UnitCarry(COST_SCALE)
+        self._daily_energy = 0
+        self._daily_cost = 0
+        now = self.clock.now()
+        self._daily_start = _period_start("day", now)
+
+        self._weekly_energy = 0
+        self._weekly_cost = 0
+        self._weekly_start = _period_start("week", now)
+
+        self._monthly_energy = 0
+        self._monthly_cost = 0
+        self._monthly_start = _period_start("month", now)
+
+        self._yearly_energy = 0
+        self._yearly_cost = 0
+        self._yearly_start = _period_start("year", now)
+
+        # Hourly tracking (current clock hour; the sliding windows in the
+        # rollups cover the last 60 minutes)
+        self._hourly_energy = 0
+        self._hourly_cost = 0
+        self._hourly_start = _period_start("hour", now)
 
         # Previous month tracking
-        self._previous_month_energy = 0.0
-        self._previous_month_cost = 0.0
+        self._previous_month_energy = 0
+        self._previous_month_cost = 0
+
+        # Epoch timestamps at which each period rolls over, and the earliest
+        # of them, so the per-tick check is a single float comparison
+        self._hourly_end = 0.0
+        self._daily_end = 0.0
+        self._weekly_end = 0.0
+        self._monthly_end = 0.0
+        self._yearly_end = 0.0
+        self._next_boundary = 0.0
+        self._update_boundaries()
 
         # State restoration flag
         self._state_restored = False
 
+        # Timer that refreshes exactly at the next rate change
+        self._unsub_rate_change: CALLBACK_TYPE | None = None
+        self._rate_change_time: datetime | None = None
+
+        # Event-driven mode subscriptions and publish throttling
+        self._unsub_state_events: CALLBACK_TYPE | None = None
+        self._unsub_meter_events: CALLBACK_TYPE | None = None
+        self._unsub_publish: CALLBACK_TYPE | None = None
+        self._last_publish = 0.0
+
+        # Set once the coordinator has been shut down. Home Assistant
+        # shuts it down on unload too, after the entry has.
+        self._shut_down = False
+
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from power sensors and calculate costs.
 
@@ -99,128 +356,606 @@ class EnergyDataUpdateCoordinator(DataUpdateCoordinator):
             # Restore state on first update
             if not self._state_restored:
                 await self._restore_state()
+                snapshot_timestamp = self._previous_timestamp
+                if self._journal is not None:
+                    await self._replay_journal()
+                else:
+                    self._restore_from_minutes()
+                if self._previous_timestamp != snapshot_timestamp:
+                    # What was recovered after a crash may include meter
+                    # energy past the saved readings, so start them afresh
+                    # rather than count it twice
+                    self._meters.forget()
+                await self._async_backfill(self.clock.now())
                 self._state_restored = True
 
-            current_time = dt_util.now()
+            current_time = self.clock.now()
+            monotonic = self.clock.monotonic()
 
             # Get total power from all sensors
-            total_power = await self._get_total_power()
+            total_power = self._get_total_power()
+            if self._recalculating:
+                return self._build_data(current_time, total_power)
+
+            # Polled intervals are measured on the monotonic clock, so a
+            # wall-clock step (NTP or the clock being set) isn't integrated
+            end_time = current_time
+            if self._previous_timestamp is not None and self._previous_monotonic is not None:
+                end_time = elapsed_end(
+                    self._previous_timestamp, self._previous_monotonic, current_time, monotonic
+                )
 
-            # Get current rate
-            current_rate, period_name = self.rate_calculator.get_rate(current_time)
-            season_name = self.rate_calculator.get_season_name(current_time)
+            self._integrate(end_time, total_power)
 
-            # Calculate energy delta using trapezoidal integration
-            energy_delta = 0.0
-            cost_delta = 0.0
+            if end_time != current_time:
+                _LOGGER.warning(
+                    "Clock stepped by %.0f seconds, continuing from the new time",
+                    current_time.timestamp() - end_time.timestamp(),
+                )
+                self._integrator.reset()
+                self._previous_timestamp = current_time
+                self._set_minutes_position()
 
-            if (
-                self._previous_power is not None
-                and self._previous_timestamp is not None
-                and total_power is not None
-            ):
-                time_hours = (
-                    current_time - self._previous_timestamp
-                ).total_seconds() / 3600.0
+            # Readings that arrived since the last poll now fall in or
+            # before the current periods
+            readings, self._meter_readings = self._meter_readings, []
+            for index, state, reading_time in readings:
+                self._add_meter_reading(index, state, reading_time)
 
-                # Trapezoidal integration: (P1 + P2) / 2 * dt
-                energy_delta = (
-                    (self._previous_power + total_power) / 2 * time_hours / 1000.0
-                )
+            # Save state for persistence across restarts
+            self._async_schedule_save()
+
+            return self._build_data(current_time, total_power)
 
-                # Calculate cost for this delta
-                # Use the rate at the time of energy consumption
-                cost_delta = energy_delta * current_rate
+        except Exception as err:
+            _LOGGER.error("Error updating energy data: %s", err)
+            raise UpdateFailed(f"Error updating energy data: {err}") from err
 
-            # Update previous state
+    def _integrate(
+        self, current_time: datetime, total_power: float | None, sample: bool = True
+    ) -> None:
+        """Integrate energy since the previous reading into the accumulators.
+
+        The reading is filtered and the interval shaped by the configured
+        integration rule. An interval that crosses a period rollover is
+        split at the boundary, so the closing period keeps the energy used
+        before it ended.
+
+        Args:
+            current_time: Time of the new power reading
+            total_power: New total power in watts, or None if unavailable
+            sample: Whether the power is a new sample for the median filter,
+                rather than an already filtered power held up to a time
+        """
+        if sample:
+            total_power = self._integrator.filter(total_power)
+
+        ends = None
+        if (
+            self._previous_power is not None
+            and self._previous_timestamp is not None
+            and total_power is not None
+        ):
+            start_ts = self._previous_timestamp.timestamp()
+            end_ts = current_time.timestamp()
+            ends = self._integrator.endpoints(
+                start_ts, self._previous_power, end_ts, total_power
+            )
+            if ends is None:
+                _LOGGER.debug(
+                    "Not integrating a %.0f second gap between power readings",
+                    end_ts - start_ts,
+                )
+
+        if ends is None:
+            self._integrator.reset()
+            self._check_period_boundaries(current_time)
+            self.sources.end_update()
             if total_power is not None:
                 self._previous_power = total_power
                 self._previous_timestamp = current_time
+                self._previous_monotonic = self.clock.monotonic()
+                self._dirty = True
+                self._set_minutes_position()
+            return
+
+        # Power at either end of the interval under the integration rule
+        p_start, p_end = ends
+        slope = (p_end - p_start) / (end_ts - start_ts) if end_ts > start_ts else 0.0
+
+        segment_start = self._previous_timestamp
+        segment_ts = start_ts
+        segment_power = p_start
+
+        while self._next_boundary < end_ts:
+            boundary_ts = self._next_boundary
+            boundary_time = datetime.fromtimestamp(boundary_ts, dt_util.DEFAULT_TIME_ZONE)
+
+            if boundary_ts > segment_ts:
+                boundary_power = p_start + slope * (boundary_ts - start_ts)
+                self._add_segment(segment_start, boundary_time, segment_power, boundary_power)
+                segment_start = boundary_time
+                segment_ts = boundary_ts
+                segment_power = boundary_power
+
+            # Roll the closing period over before integrating into the next
+            self._check_period_boundaries(boundary_time)
+
+        # The rest ends at or before the next boundary, so it belongs to the
+        # current periods even if it ends exactly at the rollover
+        self._add_segment(segment_start, current_time, segment_power, p_end, total_power)
+        self._check_period_boundaries(current_time)
+        self.sources.end_update(self._integrator.ramp_weight)
+
+        self._previous_power = total_power
+        self._previous_timestamp = current_time
+        self._previous_monotonic = self.clock.monotonic()
+        self._dirty = True
+        self._set_minutes_position()
+
+    def _set_minutes_position(self) -> None:
+        """Record the last reading in the minute history header."""
+        if self.rollups.minutes is not None:
+            self.rollups.minutes.set_position(
+                self._previous_timestamp.timestamp(), self._previous_power
+            )
 
-            # Check for period boundaries and reset if needed
-            self._check_period_boundaries(current_time)
+    def _add_segment(
+        self,
+        start: datetime,
+        end: datetime,
+        p_start: float,
+        p_end: float,
+        reading: float | None = None,
+    ) -> None:
+        """Price a segment within one set of periods and accumulate it.
+
+        Args:
+            start: Start of the segment
+            end: End of the segment
+            p_start: Power at the start of the segment in watts
+            p_end: Power at the end of the segment in watts
+            reading: Power reading at the end of the segment, if it differs
+                from p_end under the integration rule
+        """
+        # Trapezoidal integration: (P1 + P2) / 2 * dt, split at any rate
+        # change inside the segment so each part is billed at the rate in
+        # effect when the energy was consumed
+        energy_delta, cost_delta = self.rate_calculator.cost_for_interval(
+            start, end, p_start, p_end
+        )
+        self._add_delta(energy_delta, cost_delta)
+        self.rollups.add(
+            (start.timestamp() + end.timestamp()) / 2, energy_delta, cost_delta
+        )
+
+        # Sources are charged lazily from what one watt cost over the segment
+        self.sources.advance(*self.rate_calculator.cost_for_interval(start, end, 1.0, 1.0))
+        self.comparison.add(start.timestamp(), end.timestamp(), p_start, p_end)
+
+        # A segment without duration adds nothing worth replaying
+        if self._journal is not None and end > start:
+            self._async_journal_delta(
+                end.timestamp(),
+                energy_delta,
+                cost_delta,
+                p_end if reading is None else reading,
+            )
 
-            # Update accumulators
-            self._daily_energy += energy_delta
-            self._daily_cost += cost_delta
+    def _add_delta(self, energy_delta: float, cost_delta: float) -> None:
+        """Add energy and cost to every current period accumulator.
 
-            self._weekly_energy += energy_delta
-            self._weekly_cost += cost_delta
+        Args:
+            energy_delta: Energy in kWh
+            cost_delta: Cost in dollars
+        """
+        energy_units = self._energy_carry.units(energy_delta)
+        cost_units = self._cost_carry.units(cost_delta)
 
-            self._monthly_energy += energy_delta
-            self._monthly_cost += cost_delta
+        self._daily_energy += energy_units
+        self._daily_cost += cost_units
 
-            self._yearly_energy += energy_delta
-            self._yearly_cost += cost_delta
+        self._weekly_energy += energy_units
+        self._weekly_cost += cost_units
 
-            self._hourly_energy += energy_delta
-            self._hourly_cost += cost_delta
+        self._monthly_energy += energy_units
+        self._monthly_cost += cost_units
 
-            # Calculate current cost rate ($/hour)
-            cost_rate = (total_power / 1000.0 * current_rate) if total_power else 0.0
+        self._yearly_energy += energy_units
+        self._yearly_cost += cost_units
 
-            # Save state for persistence across restarts
-            await self._save_state()
+        self._hourly_energy += energy_units
+        self._hourly_cost += cost_units
 
-            return {
-                "total_power": total_power,
-                "current_rate": current_rate,
-                "cost_rate": cost_rate,
-                "rate_period": f"{season_name} {period_name}",
-                "energy_today": self._daily_energy,
-                "cost_today": self._daily_cost,
-                "energy_week": self._weekly_energy,
-                "cost_week": self._weekly_cost,
-                "energy_month": self._monthly_energy,
-                "cost_month": self._monthly_cost,
-                "energy_year": self._yearly_energy,
-                "cost_year": self._yearly_cost,
-                "energy_hour": self._hourly_energy,
-                "cost_hour": self._hourly_cost,
-                "energy_previous_month": self._previous_month_energy,
-                "cost_previous_month": self._previous_month_cost,
-                "last_update": current_time.isoformat(),
-            }
+    def _build_data(self, current_time: datetime, total_power: float | None) -> dict[str, Any]:
+        """Build the data published to the sensor entities.
 
-        except Exception as err:
-            _LOGGER.error("Error updating energy data: %s", err)
-            raise UpdateFailed(f"Error updating energy data: {err}") from err
+        Args:
+            current_time: Time of the latest power reading
+            total_power: Latest total power in watts, or None if unavailable
 
-    async def _get_total_power(self) -> float | None:
+        Returns:
+            Dictionary with current state data
+        """
+        # Get current rate
+        current_rate, period_name = self.rate_calculator.get_rate(current_time)
+        season_name = self.rate_calculator.get_season_name(current_time)
+        next_change = self.rate_calculator.next_change(current_time)
+
+        # Calculate current cost rate ($/hour)
+        cost_rate = (total_power / 1000.0 * current_rate) if total_power else 0.0
+
+        # Refresh again exactly when the rate changes
+        self._schedule_rate_change(next_change[0] if next_change else None)
+        self._last_publish = self.clock.monotonic()
+
+        windows = self.rollups.window_totals(current_time.timestamp())
+
+        data = {
+            "total_power": total_power,
+            "current_rate": current_rate,
+            "cost_rate": cost_rate,
+            "rate_period": f"{season_name} {period_name}",
+            "next_rate_change": next_change[0].isoformat() if next_change else None,
+            "next_rate": next_change[1] if next_change else None,
+            "energy_today": self._daily_energy / ENERGY_SCALE,
+            "cost_today": self._daily_cost / COST_SCALE,
+            "energy_week": self._weekly_energy / ENERGY_SCALE,
+            "cost_week": self._weekly_cost / COST_SCALE,
+            "energy_month": self._monthly_energy / ENERGY_SCALE,
+            "cost_month": self._monthly_cost / COST_SCALE,
+            "energy_year": self._yearly_energy / ENERGY_SCALE,
+            "cost_year": self._yearly_cost / COST_SCALE,
+            "energy_hour": self._hourly_energy / ENERGY_SCALE,
+            "cost_hour": self._hourly_cost / COST_SCALE,
+            "energy_previous_month": self._previous_month_energy / ENERGY_SCALE,
+            "cost_previous_month": self._previous_month_cost / COST_SCALE,
+            "energy_60m": windows["60m"][0],
+            "cost_60m": windows["60m"][1],
+            "energy_24h": windows["24h"][0],
+            "cost_24h": windows["24h"][1],
+            "energy_7d": windows["7d"][0],
+            "cost_7d": windows["7d"][1],
+            "last_update": current_time.isoformat(),
+        }
+        if self.comparison:
+            data["plan_comparison"] = self.comparison.summary(
+                current_time.timestamp(), self._monthly_start.timestamp(), self._monthly_end
+            )
+        return data
+
+    @callback
+    def async_start_event_tracking(self) -> None:
+        """Track power and energy sensor state changes as they happen.
+
+        The total power is updated on every change. In event-driven mode,
+        each change is also integrated right away. Energy meter readings
+        are priced as they come in, or at the next poll in polling mode,
+        starting with the current readings.
+        """
+        if self._unsub_state_events is None:
+            for index, entity_id in enumerate(self.power_sensors):
+                self._set_sensor_power(index, entity_id, self.hass.states.get(entity_id))
+            self._unsub_state_events = async_track_state_change_event(
+                self.hass, self.power_sensors, self._async_handle_power_event
+            )
+
+        if self._unsub_meter_events is None and self.energy_sensors:
+            for index, entity_id in enumerate(self.energy_sensors):
+                state = self.hass.states.get(entity_id)
+                if state is not None:
+                    self._add_meter_reading(index, state, dt_util.as_local(state.last_updated))
+            self._unsub_meter_events = async_track_state_change_event(
+                self.hass, self.energy_sensors, self._async_handle_meter_event
+            )
+
+    @callback
+    def _async_handle_power_event(self, event: Event) -> None:
+        """Update the total power, then integrate up to it in event mode."""
+        entity_id: str = event.data["entity_id"]
+        new_state: State | None = event.data.get("new_state")
+        index = self.sources.index(entity_id)
+        if index is not None:
+            self._set_sensor_power(index, entity_id, new_state)
+
+        if (
+            self.update_mode != UPDATE_MODE_EVENT
+            or not self._state_restored
+            or self._recalculating
+            or new_state is None
+        ):
+            return
+
+        # Use the state's own timestamp rather than when we got to it
+        current_time = dt_util.as_local(new_state.last_updated)
+        if self._previous_timestamp is not None and current_time < self._previous_timestamp:
+            current_time = self._previous_timestamp
+
+        self._integrate(current_time, self._get_total_power())
+        self._async_schedule_publish()
+
+    @callback
+    def _async_handle_meter_event(self, event: Event) -> None:
+        """Price the energy used since an energy meter's last reading."""
+        new_state: State | None = event.data.get("new_state")
+        index = self._meters.index(event.data["entity_id"])
+        if not self._state_restored or new_state is None or index is None:
+            return
+
+        current_time = dt_util.as_local(new_state.last_updated)
+        if self._previous_timestamp is not None and current_time < self._previous_timestamp:
+            current_time = self._previous_timestamp
+
+        # Polled power ramps between polls, so splitting the interval here
+        # would reshape it. The reading waits for the next poll instead,
+        # or for a recalculation to rebuild the periods it adds to.
+        if self.update_mode != UPDATE_MODE_EVENT or self._recalculating:
+            self._meter_readings.append((index, new_state, current_time))
+            return
+
+        self._add_held_meter_reading(index, new_state, current_time)
+        self._async_schedule_publish()
+
+    def _add_held_meter_reading(self, index: int, state: State, current_time: datetime) -> None:
+        """Add a meter reading after holding the last power sample until it.
+
+        Power and the periods are brought up to the reading before adding
+        to them. Only power changes are fed to the median filter.
+
+        Args:
+            index: Meter position
+            state: New state of the meter
+            current_time: Time of the reading
+        """
+        self._integrate(current_time, self._previous_power, sample=False)
+        self._add_meter_reading(index, state, current_time)
+
+    def _add_meter_reading(self, index: int, state: State, current_time: datetime) -> None:
+        """Add the energy used since an energy meter's last reading.
+
+        The energy is spread evenly over the time since the last reading,
+        split at period rollovers and rate changes. Parts that fall in
+        periods that have already ended only count toward the rollups and
+        the previous month.
+
+        Args:
+            index: Meter position
+            state: New state of the meter
+            current_time: Time of the reading
+        """
+        entity_id = self.energy_sensors[index]
+        if state.state in ("unavailable", "unknown"):
+            _LOGGER.debug("Energy sensor %s is %s", entity_id, state.state)
+            return
+
+        try:
+            value = float(state.state) * self._meter_scale(state)
+        except (ValueError, TypeError, HomeAssistantError) as err:
+            _LOGGER.warning("Could not read energy from %s: %s", entity_id, err)
+            return
+
+        end_ts = current_time.timestamp()
+        reading = self._meters.update(index, value, end_ts)
+        if reading is None or reading[1] <= 0:
+            return
+        start_ts, energy = reading
+        start_ts = min(start_ts, end_ts)
+
+        self._check_period_boundaries(current_time)
+
+        total_energy = 0.0
+        total_cost = 0.0
+        if end_ts > start_ts:
+            power = energy * 3_600_000.0 / (end_ts - start_ts)
+            edges = [start_ts, *_rollover_times(start_ts, end_ts), end_ts]
+            for piece_start, piece_end in zip(edges, edges[1:]):
+                piece_energy, piece_cost = self.rate_calculator.cost_for_interval(
+                    datetime.fromtimestamp(piece_start, dt_util.DEFAULT_TIME_ZONE),
+                    datetime.fromtimestamp(piece_end, dt_util.DEFAULT_TIME_ZONE),
+                    power,
+                    power,
+                )
+                self._add_dated_delta((piece_start + piece_end) / 2, piece_energy, piece_cost)
+                total_energy += piece_energy
+                total_cost += piece_cost
+        else:
+            # Two readings at the same time; price at the rate then
+            total_energy = energy
+            total_cost = energy * self.rate_calculator.get_rate(current_time)[0]
+            self._add_dated_delta(end_ts - 0.001, total_energy, total_cost)
+
+        self.sources.add(len(self.power_sensors) + index, total_energy, total_cost)
+        if self._journal is not None:
+            self._async_journal_delta(
+                end_ts,
+                total_energy,
+                total_cost,
+                self._previous_power or 0.0,
+            )
+        self._dirty = True
+
+    def _meter_scale(self, state: State) -> float:
+        """Get the kWh per unit of an energy sensor's state.
+
+        Raises:
+            HomeAssistantError: If the unit isn't an energy unit
+        """
+        unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT) or UnitOfEnergy.KILO_WATT_HOUR
+        return EnergyConverter.convert(1.0, unit, UnitOfEnergy.KILO_WATT_HOUR)
+
+    def _add_dated_delta(self, timestamp: float, energy: float, cost: float) -> None:
+        """Add energy and cost used at a time to the periods containing it.
+
+        Args:
+            timestamp: Epoch seconds inside the interval the delta covers,
+                no later than the current periods
+            energy: Energy in kWh
+            cost: Cost in dollars
+        """
+        energy_units = self._energy_carry.units(energy)
+        cost_units = self._cost_carry.units(cost)
+        for prefix in ("hourly", "daily", "weekly", "monthly", "yearly"):
+            if getattr(self, f"_{prefix}_start").timestamp() <= timestamp:
+                setattr(self, f"_{prefix}_energy", getattr(self, f"_{prefix}_energy") + energy_units)
+                setattr(self, f"_{prefix}_cost", getattr(self, f"_{prefix}_cost") + cost_units)
+
+        previous_month_start = _period_start("month", self._monthly_start - timedelta(days=1))
+        if previous_month_start.timestamp() <= timestamp < self._monthly_start.timestamp():
+            self._previous_month_energy += energy_units
+            self._previous_month_cost += cost_units
+        elif timestamp >= self._monthly_start.timestamp():
+            self.comparison.add_energy(timestamp, energy)
+
+        self.rollups.add(timestamp, energy, cost)
+
+    @callback
+    def _async_schedule_publish(self) -> None:
+        """Publish to entities, at most once per publish interval."""
+        if self._unsub_publish is not None:
+            return
+
+        delay = max(0.0, self._last_publish + self._publish_interval - self.clock.monotonic())
+        self._unsub_publish = self.clock.call_later(self.hass, delay, self._async_publish)
+
+    async def _async_publish(self, _now: datetime) -> None:
+        """Push the accumulated event-driven updates to the entities."""
+        self._unsub_publish = None
+
+        self._async_schedule_save()
+        self.async_set_updated_data(
+            self._build_data(self._previous_timestamp or self.clock.now(), self._previous_power)
+        )
+
+    def _schedule_rate_change(self, change_time: datetime | None) -> None:
+        """Schedule a refresh at the next rate change.
+
+        Args:
+            change_time: When the rate next changes, or None if it never does
+        """
+        if change_time == self._rate_change_time:
+            return
+
+        if self._unsub_rate_change is not None:
+            self._unsub_rate_change()
+            self._unsub_rate_change = None
+
+        self._rate_change_time = change_time
+        if change_time is not None:
+            self._unsub_rate_change = self.clock.call_at(
+                self.hass, change_time, self._async_handle_rate_change
+            )
+
+    async def _async_handle_rate_change(self, _now: datetime) -> None:
+        """Refresh when the rate changes."""
+        self._unsub_rate_change = None
+        self._rate_change_time = None
+        await self.async_refresh()
+
+    async def async_shutdown(self) -> None:
+        """Cancel scheduled refreshes, timers and event subscriptions.
+
+        Safe to call more than once; the journal is closed and the shared
+        rate schedules are released only the first time.
+        """
+        if self._shut_down:
+            return
+        self._shut_down = True
+        await super().async_shutdown()
+        self._schedule_rate_change(None)
+        self.rate_calculator.close()
+        self.comparison.close()
+
+        if self._unsub_state_events is not None:
+            self._unsub_state_events()
+            self._unsub_state_events = None
+        if self._unsub_meter_events is not None:
+            self._unsub_meter_events()
+            self._unsub_meter_events = None
+        if self._unsub_publish is not None:
+            self._unsub_publish()
+            self._unsub_publish = None
+
+        # Don't lose the coalesced tail when the entry is unloaded
+        if self._journal is not None:
+            await self._async_compact_journal()
+            await self.hass.async_add_executor_job(self._journal.close)
+        elif self._dirty:
+            await self._save_state()
+
+        # The last rollup write flushes the minutes, so let it finish
+        minutes = self.rollups.minutes
+        self.rollups.minutes = None
+        if self._rollup_write is not None:
+            await self._rollup_write
+        if minutes is not None:
+            await self.hass.async_add_executor_job(self._minutes.close)
+
+    def _get_total_power(self) -> float | None:
         """Get total power from all configured sensors.
 
+        Once sensor changes are tracked, the total is kept up to date as
+        they happen and reading it is O(1). Before that, every sensor is
+        read.
+
         Returns:
             Total power in watts, or None if all sensors unavailable
         """
-        total = 0.0
-        valid_sensors = 0
+        if self._unsub_state_events is None:
+            for index, entity_id in enumerate(self.power_sensors):
+                self._set_sensor_power(index, entity_id, self.hass.states.get(entity_id))
 
-        for entity_id in self.power_sensors:
-            state = self.hass.states.get(entity_id)
+        total = self._power.total
+        if total is None:
+            _LOGGER.debug("No valid power sensors available yet (may still be loading)")
+        return total
 
-            if state is None:
-                _LOGGER.debug("Power sensor %s not found (may still be loading)", entity_id)
-                continue
+    def _set_sensor_power(self, index: int, entity_id: str, state: State | None) -> None:
+        """Parse a sensor's state into the power total and the source ledger.
 
-            if state.state in ("unavailable", "unknown"):
-                _LOGGER.debug("Power sensor %s is %s", entity_id, state.state)
-                continue
+        Args:
+            index: Sensor position
+            entity_id: Power sensor entity ID
+            state: Current state of the sensor, or None if it doesn't exist
+        """
+        power: float | None = None
 
+        if state is None:
+            _LOGGER.debug("Power sensor %s not found (may still be loading)", entity_id)
+        elif state.state in ("unavailable", "unknown"):
+            _LOGGER.debug("Power sensor %s is %s", entity_id, state.state)
+        else:
             try:
                 power = float(state.state)
-                total += power
-                valid_sensors += 1
             except (ValueError, TypeError) as err:
                 _LOGGER.warning(
                     "Could not convert state of %s to float: %s", entity_id, err
                 )
-                continue
-
-        if valid_sensors == 0:
-            _LOGGER.debug("No valid power sensors available yet (may still be loading)")
-            return None
-
-        return total
+            else:
+                if self._max_power and power > self._max_power:
+                    # Keep the last plausible reading
+                    _LOGGER.debug(
+                        "Ignoring implausible %.0f W from %s", power, entity_id
+                    )
+                    return
+
+        self._power.set(index, power)
+        # Unavailable sources are attributed no power
+        self.sources.set_power(index, power or 0.0)
+
+    def _update_boundaries(self) -> None:
+        """Precompute when each period rolls over from the period starts."""
+        self._hourly_end = _period_end("hour", self._hourly_start)
+        self._daily_end = _period_end("day", self._daily_start)
+        self._weekly_end = _period_end("week", self._weekly_start)
+        self._monthly_end = _period_end("month", self._monthly_start)
+        self._yearly_end = _period_end("year", self._yearly_start)
+        self._next_boundary = min(
+            self._hourly_end,
+            self._daily_end,
+            self._weekly_end,
+            self._monthly_end,
+            self._yearly_end,
+        )
 
     def _check_period_boundaries(self, current_time: datetime) -> None:
         """Check if any period boundaries have been crossed and reset accumulators.
@@ -228,188 +963,818 @@ class EnergyDataUpdateCoordinator(DataUpdateCoordinator):
         Args:
             current_time: Current datetime
         """
-        # Check hourly boundary (rolling 1-hour window)
-        hour_ago = current_time - timedelta(hours=1)
-        if current_time.replace(minute=0, second=0, microsecond=0) > self._hourly_start.replace(minute=0, second=0, microsecond=0):
+        timestamp = current_time.timestamp()
+        if timestamp < self._next_boundary:
+            return
+
+        # Check hourly boundary
+        if timestamp >= self._hourly_end:
             _LOGGER.debug(
                 "Hourly period reset - Energy: %.3f kWh, Cost: $%.2f",
-                self._hourly_energy,
-                self._hourly_cost,
+                self._hourly_energy / ENERGY_SCALE,
+                self._hourly_cost / COST_SCALE,
             )
-            self._hourly_energy = 0.0
-            self._hourly_cost = 0.0
-            self._hourly_start = current_time.replace(minute=0, second=0, microsecond=0)
+            self._hourly_energy = 0
+            self._hourly_cost = 0
+            self._hourly_start = _period_start("hour", current_time)
+            self.sources.rollover("hourly")
 
         # Check daily boundary
-        day_start = dt_util.start_of_local_day()
-        if day_start > self._daily_start:
+        if timestamp >= self._daily_end:
             _LOGGER.info(
                 "Daily period reset - Energy: %.3f kWh, Cost: $%.2f",
-                self._daily_energy,
-                self._daily_cost,
+                self._daily_energy / ENERGY_SCALE,
+                self._daily_cost / COST_SCALE,
             )
-            self._daily_energy = 0.0
-            self._daily_cost = 0.0
-            self._daily_start = day_start
+            self._daily_energy = 0
+            self._daily_cost = 0
+            self._daily_start = _period_start("day", current_time)
+            self.sources.rollover("daily")
 
         # Check weekly boundary
-        week_start = self._get_week_start()
-        if week_start > self._weekly_start:
+        if timestamp >= self._weekly_end:
             _LOGGER.info(
                 "Weekly period reset - Energy: %.3f kWh, Cost: $%.2f",
-                self._weekly_energy,
-                self._weekly_cost,
+                self._weekly_energy / ENERGY_SCALE,
+                self._weekly_cost / COST_SCALE,
             )
-            self._weekly_energy = 0.0
-            self._weekly_cost = 0.0
-            self._weekly_start = week_start
+            self._weekly_energy = 0
+            self._weekly_cost = 0
+            self._weekly_start = _period_start("week", current_time)
+            self.sources.rollover("weekly")
 
         # Check monthly boundary
-        month_start = current_time.replace(
-            day=1, hour=0, minute=0, second=0, microsecond=0
-        )
-        if month_start > self._monthly_start:
+        if timestamp >= self._monthly_end:
             _LOGGER.info(
                 "Monthly period reset - Energy: %.3f kWh, Cost: $%.2f",
-                self._monthly_energy,
-                self._monthly_cost,
+                self._monthly_energy / ENERGY_SCALE,
+                self._monthly_cost / COST_SCALE,
+            )
+            # Store previous month's data before resetting. If whole months
+            # were skipped (e.g. while stopped), the previous month is empty.
+            month_start = _period_start("month", current_time)
+            if month_start.timestamp() == self._monthly_end:
+                self._previous_month_energy = self._monthly_energy
+                self._previous_month_cost = self._monthly_cost
+            else:
+                self._previous_month_energy = 0
+                self._previous_month_cost = 0
+
+            self.sources.rollover(
+                "monthly", keep_previous=month_start.timestamp() == self._monthly_end
             )
-            # Store previous month's data before resetting
-            self._previous_month_energy = self._monthly_energy
-            self._previous_month_cost = self._monthly_cost
 
-            self._monthly_energy = 0.0
-            self._monthly_cost = 0.0
+            self.comparison.rollover()
+
+            self._monthly_energy = 0
+            self._monthly_cost = 0
             self._monthly_start = month_start
 
         # Check yearly boundary
-        year_start = current_time.replace(
-            month=1, day=1, hour=0, minute=0, second=0, microsecond=0
-        )
-        if year_start > self._yearly_start:
+        if timestamp >= self._yearly_end:
             _LOGGER.info(
                 "Yearly period reset - Energy: %.3f kWh, Cost: $%.2f",
-                self._yearly_energy,
-                self._yearly_cost,
+                self._yearly_energy / ENERGY_SCALE,
+                self._yearly_cost / COST_SCALE,
             )
-            self._yearly_energy = 0.0
-            self._yearly_cost = 0.0
-            self._yearly_start = year_start
+            self._yearly_energy = 0
+            self._yearly_cost = 0
+            self._yearly_start = _period_start("year", current_time)
+            self.sources.rollover("yearly")
+
+        self._update_boundaries()
+        self._flush_pending = True
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Schedule a coalesced save of the accumulator state.
+
+        Rollovers are flushed right away; otherwise a single delayed save
+        is scheduled per save interval. Both run in the background so the
+        update path never waits on disk I/O. A pending delayed save is
+        flushed by the Store when Home Assistant stops.
+        """
+        if self._journal is not None:
+            # Every tick is already durable in the journal; snapshot when it
+            # grows too long or a period rolls over
+            if self._flush_pending or self._journal_records >= JOURNAL_COMPACT_RECORDS:
+                self._flush_pending = False
+                self.hass.async_create_task(self._async_compact_journal())
+        elif self._flush_pending:
+            self._flush_pending = False
+            self.hass.async_create_task(self._save_state())
+        elif self._dirty and not self._save_scheduled:
+            self._save_scheduled = True
+            self._store.async_delay_save(self._state_data, self._save_interval)
+
+    @callback
+    def _async_journal_delta(
+        self, timestamp: float, energy: float, cost: float, power: float
+    ) -> None:
+        """Queue a delta record for the journal.
 
-    def _get_week_start(self) -> datetime:
-        """Get the start of the current week (Monday 00:00:00).
+        Records are stamped strictly after the one before. Replay and
+        compaction keep only records newer than the snapshot, so a record
+        sharing the snapshot's timestamp, like a meter reading priced at
+        the same time as the power before it, would otherwise be lost.
 
-        Returns:
-            Datetime of week start
+        Args:
+            timestamp: Epoch seconds of the reading that ended the interval
+            energy: Energy added in kWh
+            cost: Cost added
+            power: Total power at the reading in watts
         """
-        now = dt_util.now()
-        days_since_monday = now.weekday()
-        week_start = now - timedelta(days=days_since_monday)
-        return week_start.replace(hour=0, minute=0, second=0, microsecond=0)
+        if timestamp <= self._journal_timestamp:
+            timestamp = math.nextafter(self._journal_timestamp, math.inf)
+        self._journal_pending.append(RECORD.pack(timestamp, energy, cost, power))
+        self._journal_timestamp = timestamp
+        self._journal_records += 1
+
+        if not self._journal_draining:
+            self._journal_draining = True
+            self.hass.async_create_task(self._async_drain_journal())
+
+    async def _async_drain_journal(self) -> None:
+        """Write queued journal records in order."""
+        try:
+            while self._journal_pending:
+                data = b"".join(self._journal_pending)
+                self._journal_pending.clear()
+                async with self._journal_lock:
+                    await self.hass.async_add_executor_job(self._journal.append, data)
+                self._journal_bytes += len(data)
+        except OSError as err:
+            _LOGGER.error("Error writing journal: %s", err)
+        finally:
+            self._journal_draining = False
+
+    async def _async_compact_journal(self) -> None:
+        """Write a snapshot and drop the journal records it contains."""
+        if self._journal_compacting:
+            return
+
+        self._journal_compacting = True
+        try:
+            snapshot_timestamp = self._journal_timestamp
+            await self._save_state()
+
+            async with self._journal_lock:
+                # Records still queued are newer than the snapshot and are
+                # kept by the compaction filter once written
+                if self._journal_pending:
+                    data = b"".join(self._journal_pending)
+                    self._journal_pending.clear()
+                    await self.hass.async_add_executor_job(self._journal.append, data)
+                    self._journal_bytes += len(data)
+                self._journal_records = await self.hass.async_add_executor_job(
+                    self._journal.compact, snapshot_timestamp
+                )
+        except OSError as err:
+            _LOGGER.error("Error compacting journal: %s", err)
+        finally:
+            self._journal_compacting = False
 
     async def _save_state(self) -> None:
-        """Save current accumulator state to persistent storage."""
+        """Save current accumulator state to persistent storage now."""
         try:
-            state_data = {
-                "daily_energy": self._daily_energy,
-                "daily_cost": self._daily_cost,
-                "daily_start": self._daily_start.isoformat(),
-                "weekly_energy": self._weekly_energy,
-                "weekly_cost": self._weekly_cost,
-                "weekly_start": self._weekly_start.isoformat(),
-                "monthly_energy": self._monthly_energy,
-                "monthly_cost": self._monthly_cost,
-                "monthly_start": self._monthly_start.isoformat(),
-                "yearly_energy": self._yearly_energy,
-                "yearly_cost": self._yearly_cost,
-                "yearly_start": self._yearly_start.isoformat(),
-                "hourly_energy": self._hourly_energy,
-                "hourly_cost": self._hourly_cost,
-                "hourly_start": self._hourly_start.isoformat(),
-                "previous_month_energy": self._previous_month_energy,
-                "previous_month_cost": self._previous_month_cost,
-                "previous_power": self._previous_power,
-                "previous_timestamp": self._previous_timestamp.isoformat() if self._previous_timestamp else None,
-            }
-            await self._store.async_save(state_data)
+            await self._store.async_save(self._state_data())
         except Exception as err:
             _LOGGER.error("Error saving state: %s", err)
 
+    def _state_data(self) -> dict[str, Any]:
+        """Serialize the accumulator state for a write.
+
+        Called by the Store at write time, so it also marks the state clean
+        and records write statistics.
+
+        Returns:
+            Dictionary of state to persist
+        """
+        state_data = {
+            "daily_energy": self._daily_energy,
+            "daily_cost": self._daily_cost,
+            "daily_start": self._daily_start.isoformat(),
+            "weekly_energy": self._weekly_energy,
+            "weekly_cost": self._weekly_cost,
+            "weekly_start": self._weekly_start.isoformat(),
+            "monthly_energy": self._monthly_energy,
+            "monthly_cost": self._monthly_cost,
+            "monthly_start": self._monthly_start.isoformat(),
+            "yearly_energy": self._yearly_energy,
+            "yearly_cost": self._yearly_cost,
+            "yearly_start": self._yearly_start.isoformat(),
+            "hourly_energy": self._hourly_energy,
+            "hourly_cost": self._hourly_cost,
+            "hourly_start": self._hourly_start.isoformat(),
+            "previous_month_energy": self._previous_month_energy,
+            "previous_month_cost": self._previous_month_cost,
+            "previous_power": self._previous_power,
+            "previous_timestamp": self._previous_timestamp.isoformat() if self._previous_timestamp else None,
+            "journal_timestamp": self._journal_timestamp,
+            "sources": self.sources.to_dict(),
+            "meters": self._meters.to_dict(),
+            "plan_comparison": self.comparison.to_dict(),
+        }
+
+        # Rollups are written next to the state, from a copy taken now
+        rollup_data = self.rollups.to_bytes()
+        self._rollup_write = self.hass.async_create_task(
+            self._async_write_rollups(self._rollup_write, rollup_data)
+        )
+
+        self._dirty = False
+        self._save_scheduled = False
+        self._save_count += 1
+        self._save_bytes += len(json_bytes(state_data)) + len(rollup_data)
+        self._last_save = self.clock.now()
+        return state_data
+
+    async def _async_write_rollups(self, previous: asyncio.Task | None, data: bytes) -> None:
+        """Write serialized rollups once the previous write has finished.
+
+        Writes replace the same file through the same temporary file, so
+        they run one at a time, in the order the state was saved.
+
+        Args:
+            previous: The previous write, if any
+            data: Serialized rollups
+        """
+        if previous is not None:
+            await previous
+        await self.hass.async_add_executor_job(self._write_rollups, data)
+
+    def _write_rollups(self, data: bytes) -> None:
+        """Write serialized rollups to disk (runs in the executor).
+
+        The minute history is flushed too, so it is durable even if the
+        system (not just Home Assistant) goes down.
+
+        Args:
+            data: Serialized rollups
+        """
+        try:
+            write_file(self._rollup_path, data)
+            self._minutes.flush()
+        except (OSError, ValueError) as err:
+            _LOGGER.error("Error saving rollups: %s", err)
+
+    @property
+    def persistence_stats(self) -> dict[str, Any]:
+        """Return write statistics for diagnostics."""
+        return {
+            "save_interval": self._save_interval,
+            "writes": self._save_count,
+            "bytes_written": self._save_bytes,
+            "last_write": self._last_save.isoformat() if self._last_save else None,
+            "dirty": self._dirty,
+            "journal": self._journal is not None,
+            "journal_records": self._journal_records,
+            "journal_bytes_written": self._journal_bytes,
+        }
+
+    async def _replay_journal(self) -> None:
+        """Apply journal records newer than the restored snapshot."""
+        try:
+            records = await self.hass.async_add_executor_job(
+                lambda: list(self._journal.read())
+            )
+        except OSError as err:
+            _LOGGER.error("Error reading journal: %s", err)
+            return
+
+        # The minute history is written with every update, so it may already
+        # hold records newer than the snapshot
+        minutes_position = (
+            self.rollups.minutes.last_timestamp if self.rollups.minutes is not None else 0.0
+        )
+
+        replayed = 0
+        for timestamp, energy, cost, power in records:
+            if timestamp <= self._journal_timestamp:
+                continue
+
+            self._add_record(timestamp, energy, cost, minutes=timestamp > minutes_position)
+
+            self._previous_power = power
+            self._previous_timestamp = datetime.fromtimestamp(
+                timestamp, dt_util.DEFAULT_TIME_ZONE
+            )
+            self._journal_timestamp = timestamp
+            replayed += 1
+
+        self._journal_records = len(records)
+        if replayed:
+            self._dirty = True
+            _LOGGER.info("Replayed %d journal records since last snapshot", replayed)
+
+    def _add_record(
+        self,
+        timestamp: float,
+        energy: float,
+        cost: float,
+        since: float | None = None,
+        minutes: bool = True,
+    ) -> None:
+        """Add a delta that ends at a timestamp, rolling periods over first.
+
+        Records never cross a rollover, so a record ending after the next
+        boundary belongs entirely to the periods that follow it.
+
+        Args:
+            timestamp: Epoch seconds at the end of the delta
+            energy: Energy in kWh
+            cost: Cost in dollars
+            since: If given, only add to rollup buckets starting at or after it
+            minutes: Whether to add to the minute history as well
+        """
+        if timestamp > self._next_boundary:
+            self._check_period_boundaries(
+                datetime.fromtimestamp(timestamp, dt_util.DEFAULT_TIME_ZONE)
+            )
+        self._add_delta(energy, cost)
+
+        # The delta ends at the timestamp, so bucket it just before
+        self.rollups.add(timestamp - 0.001, energy, cost, since, minutes)
+        self.comparison.add_energy(timestamp - 0.001, energy)
+
+    def _restore_from_minutes(self) -> None:
+        """Bring the restored snapshot up to date from the minute history.
+
+        Without the journal, the snapshot can be a save interval behind
+        after a crash, while the mapped minute history is current to the
+        last update. Only the minutes since the snapshot are added; the
+        snapshot's exact totals are kept rather than recalculated from the
+        history's single precision minutes.
+        """
+        minutes = self.rollups.minutes
+        if minutes is None or self._previous_timestamp is None:
+            return
+
+        snapshot_ts = self._previous_timestamp.timestamp()
+        position = minutes.last_timestamp
+        if position - snapshot_ts < RESOLUTION_SECONDS:
+            return
+
+        # The minute the snapshot was taken in is partly in it already
+        since = math.ceil(snapshot_ts / RESOLUTION_SECONDS) * RESOLUTION_SECONDS
+        for minute_start, energy, cost in minutes.query(since, position):
+            self._add_record(
+                minute_start + RESOLUTION_SECONDS, energy, cost, minutes=False
+            )
+        self._check_period_boundaries(
+            datetime.fromtimestamp(position, dt_util.DEFAULT_TIME_ZONE)
+        )
+
+        self._previous_timestamp = datetime.fromtimestamp(
+            position, dt_util.DEFAULT_TIME_ZONE
+        )
+        self._previous_power = minutes.last_power
+        self._dirty = True
+        _LOGGER.info(
+            "Restored %.1f minutes since the last snapshot from the minute history",
+            (position - snapshot_ts) / 60,
+        )
+
+    async def _async_backfill(self, current_time: datetime) -> None:
+        """Integrate recorded power history over the gap since the last reading.
+
+        The gap is queried and priced in chunks in the executor, so memory
+        stays bounded however long Home Assistant was stopped. If the
+        recorder has no history for the sensors, the next update integrates
+        across the gap as before.
+
+        Args:
+            current_time: Time live updates resume from
+        """
+        if self._previous_timestamp is None or "recorder" not in self.hass.config.components:
+            return
+
+        start_ts = self._previous_timestamp.timestamp()
+        end_ts = current_time.timestamp()
+        if end_ts - start_ts < BACKFILL_MIN_GAP_SECONDS:
+            return
+
+        last_values: dict[str, float | None] = {}
+        backfilled = 0.0
+        chunk_start = start_ts
+
+        while chunk_start < end_ts:
+            chunk_end = min(chunk_start + BACKFILL_CHUNK_SECONDS, end_ts)
+            try:
+                records, steps = await self._async_history_chunk(
+                    self.rate_calculator, chunk_start, chunk_end, last_values
+                )
+            except Exception as err:
+                _LOGGER.warning("Error backfilling from recorder history: %s", err)
+                return
+
+            for timestamp, energy, cost, power in records:
+                self._add_record(timestamp, energy, cost)
+                if self._journal is not None:
+                    self._async_journal_delta(timestamp, energy, cost, power or 0.0)
+                backfilled += energy
+
+            # Live updates continue from the power held at the end of the
+            # chunk, so a failed query never integrates the same time twice
+            if steps:
+                self._previous_power = steps[-1][1]
+                self._previous_timestamp = datetime.fromtimestamp(
+                    chunk_end, dt_util.DEFAULT_TIME_ZONE
+                )
+                self._dirty = True
+
+            chunk_start = chunk_end
+
+        if not last_values:
+            _LOGGER.debug("No recorder history for power sensors, not backfilling")
+            return
+
+        _LOGGER.info(
+            "Backfilled %.3f kWh over %.1f hours from recorder history",
+            backfilled,
+            (end_ts - start_ts) / 3600,
+        )
+
+    async def _async_history_chunk(
+        self,
+        calculator: RateCalculator,
+        start_ts: float,
+        end_ts: float,
+        last_values: dict[str, float | None],
+        last_readings: dict[str, tuple[float, float]] | None = None,
+    ) -> tuple[list[tuple[float, float, float, float | None]], list[tuple[float, float | None]]]:
+        """Query and price one chunk of power and energy sensor history.
+
+        The query runs on the recorder's executor and the pricing in the
+        default executor, so the event loop only waits.
+
+        Args:
+            calculator: Rate calculator to price the energy with
+            start_ts: Epoch seconds of the chunk start
+            end_ts: Epoch seconds of the chunk end
+            last_values: Latest value of each sensor, carried between chunks
+                and updated in place
+            last_readings: Latest reading of each energy meter, carried
+                between chunks and updated in place, or None to leave the
+                meters out
+
+        Returns:
+            Tuple of (records binned at minutes and period rollovers, total
+            power steps)
+        """
+        meters = self.energy_sensors if last_readings is not None else []
+        states = await get_instance(self.hass).async_add_executor_job(
+            partial(
+                history.get_significant_states,
+                self.hass,
+                dt_util.utc_from_timestamp(start_ts),
+                dt_util.utc_from_timestamp(end_ts),
+                self.power_sensors + meters,
+                significant_changes_only=False,
+                minimal_response=True,
+                no_attributes=True,
+                compressed_state_format=True,
+            )
+        )
+        meter_states = {
+            entity_id: states.pop(entity_id) for entity_id in meters if entity_id in states
+        }
+        # Bin each minute on its own too, so the minute history and the
+        # sliding windows see when within an hour the energy was used
+        cuts = [
+            *_rollover_times(start_ts, end_ts),
+            *(
+                minute * RESOLUTION_SECONDS
+                for minute in range(
+                    math.floor(start_ts / RESOLUTION_SECONDS) + 1,
+                    math.ceil(end_ts / RESOLUTION_SECONDS),
+                )
+            ),
+        ]
+
+        steps = await self.hass.async_add_executor_job(
+            power_steps, states, last_values, start_ts
+        )
+        records = await self.hass.async_add_executor_job(
+            integrate_steps, calculator, steps, end_ts, cuts, dt_util.DEFAULT_TIME_ZONE
+        )
+
+        if meter_states:
+            # Recorded readings are in the meters' current units
+            scales = {}
+            for entity_id in meter_states:
+                state = self.hass.states.get(entity_id)
+                try:
+                    scales[entity_id] = self._meter_scale(state) if state is not None else 1.0
+                except HomeAssistantError:
+                    scales[entity_id] = 1.0
+            meter_power = await self.hass.async_add_executor_job(
+                meter_steps, meter_states, scales, last_readings, start_ts
+            )
+            meter_records = await self.hass.async_add_executor_job(
+                integrate_steps,
+                calculator,
+                meter_power,
+                end_ts,
+                cuts,
+                dt_util.DEFAULT_TIME_ZONE,
+            )
+            records = sorted(records + meter_records, key=itemgetter(0))
+
+        return records, steps
+
+    async def async_recalculate(
+        self, start: datetime, end: datetime, rate_config: dict | None = None
+    ) -> None:
+        """Rebuild the accumulators from recorder history.
+
+        History from start to end is priced with rate_config, and from end
+        until now with the configured rates. The rebuilt state replaces the
+        live one in a single step once all history has been processed;
+        live updates aren't integrated until then. Accumulators whose
+        current period began before start keep their live totals.
+
+        Args:
+            start: Start of the history to recalculate
+            end: End of the history to price with rate_config
+            rate_config: Rate configuration to use, or None for the
+                configured rates
+
+        Raises:
+            HomeAssistantError: If the recorder history can't be read or
+                has no states for the power or energy sensors, or another
+                recalculation is running
+        """
+        if self._recalculating:
+            raise HomeAssistantError("A recalculation is already running")
+
+        calculator = RateCalculator(rate_config) if rate_config else self.rate_calculator
+        now = self.clock.now()
+        start_ts = start.timestamp()
+        end_ts = min(end.timestamp(), now.timestamp())
+
+        records: list[tuple[float, float, float, float | None]] = []
+        last_values: dict[str, float | None] = {}
+        last_readings: dict[str, tuple[float, float]] = {}
+        power: float | None = None
+
+        # History is read up to now while the event loop carries on, so
+        # live updates hold off until it replaces their periods. The next
+        # update integrates from now, without counting this time twice.
+        self._recalculating = True
+        try:
+            for range_calculator, range_start, range_end in (
+                (calculator, start_ts, end_ts),
+                (self.rate_calculator, end_ts, now.timestamp()),
+            ):
+                chunk_start = range_start
+                while chunk_start < range_end:
+                    chunk_end = min(chunk_start + BACKFILL_CHUNK_SECONDS, range_end)
+                    try:
+                        chunk_records, steps = await self._async_history_chunk(
+                            range_calculator, chunk_start, chunk_end, last_values, last_readings
+                        )
+                    except Exception as err:
+                        raise HomeAssistantError(
+                            f"Error reading recorder history: {err}"
+                        ) from err
+
+                    records.extend(chunk_records)
+                    if steps:
+                        power = steps[-1][1]
+                    chunk_start = chunk_end
+
+            # Don't wipe the accumulators if there is nothing to rebuild them from
+            if not last_values and not last_readings:
+                raise HomeAssistantError(
+                    "No recorder history found for the power or energy sensors"
+                )
+
+            self._rebuild(dt_util.as_local(start), now, records, power)
+        finally:
+            self._recalculating = False
+            if calculator is not self.rate_calculator:
+                calculator.close()
+
+            # Polls add the readings held back meanwhile themselves
+            if self.update_mode == UPDATE_MODE_EVENT:
+                readings, self._meter_readings = self._meter_readings, []
+                for index, state, reading_time in readings:
+                    self._add_held_meter_reading(index, state, reading_time)
+
+        _LOGGER.info(
+            "Recalculated history since %s: %.3f kWh, $%.2f",
+            start.isoformat(),
+            sum(record[1] for record in records),
+            sum(record[2] for record in records),
+        )
+
+        self._async_schedule_save()
+        self.async_set_updated_data(
+            self._build_data(self._previous_timestamp, self._previous_power)
+        )
+
+    def _rebuild(
+        self,
+        start: datetime,
+        now: datetime,
+        records: list[tuple[float, float, float, float | None]],
+        power: float | None,
+    ) -> None:
+        """Replace the accumulators with ones rebuilt from records.
+
+        Args:
+            start: Local time the records start at
+            now: Time the records end at
+            records: Records binned at minutes and period rollovers, in
+                time order
+            power: Total power at the end of the records in watts
+        """
+        start_ts = start.timestamp()
+        live = {
+            prefix: (
+                getattr(self, f"_{prefix}_start"),
+                getattr(self, f"_{prefix}_energy"),
+                getattr(self, f"_{prefix}_cost"),
+            )
+            for prefix in ("hourly", "daily", "weekly", "monthly", "yearly")
+        }
+        live_previous_month = (self._previous_month_energy, self._previous_month_cost)
+
+        # Sources aren't in the recorded history, so they keep their live
+        # totals through the rollovers below. Other plans are priced from
+        # the history only if it covers the whole month.
+        live_sources = self.sources.to_dict()
+        live_comparison = self.comparison.to_dict()
+        self.comparison.rollover()
+
+        for prefix, period in (
+            ("hourly", "hour"),
+            ("daily", "day"),
+            ("weekly", "week"),
+            ("monthly", "month"),
+            ("yearly", "year"),
+        ):
+            setattr(self, f"_{prefix}_start", _period_start(period, start))
+            setattr(self, f"_{prefix}_energy", 0)
+            setattr(self, f"_{prefix}_cost", 0)
+        self._previous_month_energy = 0
+        self._previous_month_cost = 0
+        self._update_boundaries()
+
+        self.rollups.clear(start_ts)
+        for timestamp, energy, cost, _ in records:
+            self._add_record(timestamp, energy, cost, since=start_ts)
+        self._check_period_boundaries(now)
+
+        # History only covers part of these periods, so keep the live totals
+        for prefix, (live_start, live_energy, live_cost) in live.items():
+            period_start = getattr(self, f"_{prefix}_start")
+            if period_start.timestamp() < start_ts and period_start == live_start:
+                setattr(self, f"_{prefix}_energy", live_energy)
+                setattr(self, f"_{prefix}_cost", live_cost)
+
+        previous_month_start = _period_start(
+            "month", self._monthly_start - timedelta(days=1)
+        )
+        if previous_month_start.timestamp() < start_ts and (
+            self._monthly_start == live["monthly"][0]
+        ):
+            self._previous_month_energy, self._previous_month_cost = live_previous_month
+        self.sources.from_dict(live_sources)
+        if self._monthly_start.timestamp() < start_ts and self._monthly_start == live["monthly"][0]:
+            self.comparison.from_dict(live_comparison)
+
+        # Live updates continue from the end of the history, and journal
+        # records written so far are superseded by the next snapshot
+        self._previous_power = power
+        self._previous_timestamp = now
+        self._previous_monotonic = None
+        self._integrator.reset()
+        self._journal_timestamp = max(self._journal_timestamp, now.timestamp())
+        self._dirty = True
+        self._flush_pending = True
+
     async def _restore_state(self) -> None:
         """Restore accumulator state from persistent storage."""
         try:
+            try:
+                await self.hass.async_add_executor_job(self._minutes.open)
+            except OSError as err:
+                _LOGGER.error("Error opening minute history, not keeping minutes: %s", err)
+            else:
+                self.rollups.minutes = self._minutes
+
+            rollup_data = await self.hass.async_add_executor_job(
+                read_file, self._rollup_path
+            )
+            if rollup_data is not None and not self.rollups.from_bytes(rollup_data):
+                _LOGGER.warning("Saved rollups are in an unknown format, starting fresh")
+
             state_data = await self._store.async_load()
 
             if state_data is None:
                 _LOGGER.info("No saved state found, starting fresh")
                 return
 
-            current_time = dt_util.now()
+            # Periods are restored as saved. Any that ended while stopped
+            # roll over at their precomputed boundaries on the next update,
+            # after the energy used before the boundary has been added.
 
-            # Restore daily state if still valid
-            daily_start = dt_util.parse_datetime(state_data.get("daily_start", ""))
-            if daily_start and dt_util.start_of_local_day() == daily_start.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE):
-                self._daily_energy = state_data.get("daily_energy", 0.0)
-                self._daily_cost = state_data.get("daily_cost", 0.0)
+            # Restore daily state
+            daily_start = self._restored_start(state_data, "daily_start")
+            if daily_start:
+                self._daily_energy = int(state_data.get("daily_energy", 0))
+                self._daily_cost = int(state_data.get("daily_cost", 0))
                 self._daily_start = daily_start
-                _LOGGER.info("Restored daily state: %.3f kWh, $%.2f", self._daily_energy, self._daily_cost)
+                _LOGGER.info("Restored daily state: %.3f kWh, $%.2f", self._daily_energy / ENERGY_SCALE, self._daily_cost / COST_SCALE)
             else:
-                _LOGGER.info("Daily period expired, starting fresh")
+                _LOGGER.info("No saved daily state, starting fresh")
 
-            # Restore weekly state if still valid
-            weekly_start = dt_util.parse_datetime(state_data.get("weekly_start", ""))
-            if weekly_start and self._get_week_start() == weekly_start.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE):
-                self._weekly_energy = state_data.get("weekly_energy", 0.0)
-                self._weekly_cost = state_data.get("weekly_cost", 0.0)
+            # Restore weekly state
+            weekly_start = self._restored_start(state_data, "weekly_start")
+            if weekly_start:
+                self._weekly_energy = int(state_data.get("weekly_energy", 0))
+                self._weekly_cost = int(state_data.get("weekly_cost", 0))
                 self._weekly_start = weekly_start
-                _LOGGER.info("Restored weekly state: %.3f kWh, $%.2f", self._weekly_energy, self._weekly_cost)
+                _LOGGER.info("Restored weekly state: %.3f kWh, $%.2f", self._weekly_energy / ENERGY_SCALE, self._weekly_cost / COST_SCALE)
             else:
-                _LOGGER.info("Weekly period expired, starting fresh")
-
-            # Restore monthly state if still valid
-            monthly_start = dt_util.parse_datetime(state_data.get("monthly_start", ""))
-            current_month_start = current_time.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            if monthly_start and current_month_start == monthly_start.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE):
-                self._monthly_energy = state_data.get("monthly_energy", 0.0)
-                self._monthly_cost = state_data.get("monthly_cost", 0.0)
+                _LOGGER.info("No saved weekly state, starting fresh")
+
+            # Restore monthly state
+            monthly_start = self._restored_start(state_data, "monthly_start")
+            if monthly_start:
+                self._monthly_energy = int(state_data.get("monthly_energy", 0))
+                self._monthly_cost = int(state_data.get("monthly_cost", 0))
                 self._monthly_start = monthly_start
-                _LOGGER.info("Restored monthly state: %.3f kWh, $%.2f", self._monthly_energy, self._monthly_cost)
+                _LOGGER.info("Restored monthly state: %.3f kWh, $%.2f", self._monthly_energy / ENERGY_SCALE, self._monthly_cost / COST_SCALE)
             else:
-                _LOGGER.info("Monthly period expired, starting fresh")
-
-            # Restore yearly state if still valid
-            yearly_start = dt_util.parse_datetime(state_data.get("yearly_start", ""))
-            current_year_start = current_time.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
-            if yearly_start and current_year_start == yearly_start.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE):
-                self._yearly_energy = state_data.get("yearly_energy", 0.0)
-                self._yearly_cost = state_data.get("yearly_cost", 0.0)
+                _LOGGER.info("No saved monthly state, starting fresh")
+
+            # Restore yearly state
+            yearly_start = self._restored_start(state_data, "yearly_start")
+            if yearly_start:
+                self._yearly_energy = int(state_data.get("yearly_energy", 0))
+                self._yearly_cost = int(state_data.get("yearly_cost", 0))
                 self._yearly_start = yearly_start
-                _LOGGER.info("Restored yearly state: %.3f kWh, $%.2f", self._yearly_energy, self._yearly_cost)
+                _LOGGER.info("Restored yearly state: %.3f kWh, $%.2f", self._yearly_energy / ENERGY_SCALE, self._yearly_cost / COST_SCALE)
             else:
-                _LOGGER.info("Yearly period expired, starting fresh")
-
-            # Restore hourly state if still valid
-            hourly_start = dt_util.parse_datetime(state_data.get("hourly_start", ""))
-            current_hour_start = current_time.replace(minute=0, second=0, microsecond=0)
-            if hourly_start and current_hour_start == hourly_start.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE):
-                self._hourly_energy = state_data.get("hourly_energy", 0.0)
-                self._hourly_cost = state_data.get("hourly_cost", 0.0)
+                _LOGGER.info("No saved yearly state, starting fresh")
+
+            # Restore hourly state
+            hourly_start = self._restored_start(state_data, "hourly_start")
+            if hourly_start:
+                self._hourly_energy = int(state_data.get("hourly_energy", 0))
+                self._hourly_cost = int(state_data.get("hourly_cost", 0))
                 self._hourly_start = hourly_start
-                _LOGGER.debug("Restored hourly state: %.3f kWh, $%.2f", self._hourly_energy, self._hourly_cost)
+                _LOGGER.debug("Restored hourly state: %.3f kWh, $%.2f", self._hourly_energy / ENERGY_SCALE, self._hourly_cost / COST_SCALE)
             else:
-                _LOGGER.debug("Hourly period expired, starting fresh")
+                _LOGGER.debug("No saved hourly state, starting fresh")
+
+            self._update_boundaries()
+            if self._next_boundary <= self.clock.now().timestamp():
+                _LOGGER.info("Periods ended while stopped, rolling over on next update")
 
             # Always restore previous month
-            self._previous_month_energy = state_data.get("previous_month_energy", 0.0)
-            self._previous_month_cost = state_data.get("previous_month_cost", 0.0)
+            self._previous_month_energy = int(state_data.get("previous_month_energy", 0))
+            self._previous_month_cost = int(state_data.get("previous_month_cost", 0))
             if self._previous_month_energy > 0 or self._previous_month_cost > 0:
-                _LOGGER.info("Restored previous month: %.3f kWh, $%.2f", self._previous_month_energy, self._previous_month_cost)
+                _LOGGER.info("Restored previous month: %.3f kWh, $%.2f", self._previous_month_energy / ENERGY_SCALE, self._previous_month_cost / COST_SCALE)
 
             # Restore previous power reading for energy calculation
             self._previous_power = state_data.get("previous_power")
             previous_timestamp_str = state_data.get("previous_timestamp")
             if previous_timestamp_str:
-                self._previous_timestamp = dt_util.parse_datetime(previous_timestamp_str)
+                previous_timestamp = dt_util.parse_datetime(previous_timestamp_str)
+                if previous_timestamp is not None:
+                    # Rate lookups use wall-clock fields, so keep local time
+                    self._previous_timestamp = dt_util.as_local(previous_timestamp)
+
+            self._journal_timestamp = state_data.get("journal_timestamp", 0.0)
+
+            # Per-source totals follow their periods, rolling over with them
+            self.sources.from_dict(state_data.get("sources", {}))
+
+            # Energy meters continue from their last saved readings, so the
+            # first reading covers the energy used while stopped
+            self._meters.from_dict(state_data.get("meters", {}))
+
+            self.comparison.from_dict(state_data.get("plan_comparison", {}))
 
         except Exception as err:
             _LOGGER.error("Error restoring state: %s", err)
+
+    def _restored_start(self, state_data: dict, key: str) -> datetime | None:
+        """Get a saved period start in local time.
+
+        Args:
+            state_data: Saved state
+            key: Key of the saved period start
+
+        Returns:
+            Local period start, or None if missing
+        """
+        saved = dt_util.parse_datetime(state_data.get(key) or "")
+        if saved is None:
+            return None
+        return dt_util.as_local(saved)
@@ -0,0 +1,24 @@
+"""Diagnostics support for Consumers Energy Cost Tracker."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import EnergyDataUpdateCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: EnergyDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "config": dict(entry.data),
+        "update_mode": coordinator.update_mode,
+        "persistence": coordinator.persistence_stats,
+        "data": coordinator.data,
+    }
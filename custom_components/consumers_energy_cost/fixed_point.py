@@ -0,0 +1,73 @@
+"""Fixed-point accumulation of energy and cost."""
+from __future__ import annotations
+
+import math
+from typing import Any
+
+# Accumulators count milliwatt-hours (millionths of a kWh) and micro-dollars
+ENERGY_SCALE = 1_000_000
+COST_SCALE = 1_000_000
+
+# Saved accumulator fields and their scale
+ACCUMULATOR_FIELDS = {
+    f"{prefix}_{kind}": ENERGY_SCALE if kind == "energy" else COST_SCALE
+    for prefix in ("hourly", "daily", "weekly", "monthly", "yearly", "previous_month")
+    for kind in ("energy", "cost")
+}
+
+
+def to_units(value: float, scale: int) -> int:
+    """Convert a float total to integer units, to the nearest unit."""
+    return round(value * scale)
+
+
+class UnitCarry:
+    """Turns float deltas into whole units, carrying the fraction left over.
+
+    Integer totals add exactly however many deltas go into them. Each delta
+    is rounded to the nearest unit and the part rounded off is carried into
+    the next one instead of being lost, so constant small deltas don't drift
+    in one direction. A total is off by at most half a unit, plus the float
+    rounding of each delta itself.
+    """
+
+    __slots__ = ("scale", "fraction")
+
+    def __init__(self, scale: int) -> None:
+        """Initialize with nothing carried.
+
+        Args:
+            scale: Units per whole (kWh or dollar)
+        """
+        self.scale = scale
+        self.fraction = 0.0
+
+    def units(self, delta: float) -> int:
+        """Convert a delta to whole units.
+
+        Args:
+            delta: Delta in kWh or dollars
+
+        Returns:
+            Whole units to add to the totals
+        """
+        scaled = delta * self.scale + self.fraction
+        whole = math.floor(scaled + 0.5)
+        self.fraction = scaled - whole
+        return whole
+
+
+def migrate_float_totals(data: dict[str, Any]) -> dict[str, Any]:
+    """Convert saved state from float totals to integer units.
+
+    Args:
+        data: State saved with accumulators in kWh and dollars
+
+    Returns:
+        The state with accumulators in units
+    """
+    migrated = dict(data)
+    for field, scale in ACCUMULATOR_FIELDS.items():
+        if field in migrated:
+            migrated[field] = to_units(float(migrated[field] or 0.0), scale)
+    return migrated
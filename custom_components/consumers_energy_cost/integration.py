@@ -0,0 +1,156 @@
+"""Integration rules applied between consecutive power samples."""
+from __future__ import annotations
+
+from collections import deque
+import statistics
+
+from .const import (
+    INTEGRATION_LEFT,
+    INTEGRATION_RIGHT,
+    INTEGRATION_SIMPSON,
+    INTEGRATION_TRAPEZOID,
+)
+
+INTEGRATION_METHODS = (
+    INTEGRATION_LEFT,
+    INTEGRATION_RIGHT,
+    INTEGRATION_TRAPEZOID,
+    INTEGRATION_SIMPSON,
+)
+
+# Share of a source's power change charged over the interval it changed in
+RAMP_WEIGHTS = {
+    INTEGRATION_LEFT: 0.0,
+    INTEGRATION_RIGHT: 1.0,
+    INTEGRATION_TRAPEZOID: 0.5,
+    INTEGRATION_SIMPSON: 0.5,
+}
+
+
+class SampleIntegrator:
+    """Turns power samples into the power held over each interval.
+
+    Every rule is expressed as the power at the start and end of the
+    interval, with power changing linearly in between, so intervals can
+    still be split at rate changes and period rollovers and priced as
+    before:
+
+    - left: the earlier sample is held until the next one, for sensors that
+      report step changes
+    - right: the later sample is held back to the earlier one
+    - trapezoid: power ramps from one sample to the next
+    - simpson: the parabola through the last three samples is integrated
+      over the newest interval. It is the trapezoid shifted by the
+      parabola's curvature, which is exact for quadratic power curves,
+      bounded by the range of the samples so steps don't overshoot.
+
+    Samples can optionally go through a median filter first, which drops
+    single-sample spikes at the cost of delaying real steps by half the
+    window. Intervals longer than the maximum gap are not integrated.
+    """
+
+    def __init__(
+        self,
+        method: str = INTEGRATION_TRAPEZOID,
+        median_window: int = 1,
+        max_gap: float = 0.0,
+    ) -> None:
+        """Initialize the integrator.
+
+        Args:
+            method: One of INTEGRATION_METHODS
+            median_window: Number of samples to take the median of, 1 for
+                no filter
+            max_gap: Seconds after which an interval is not integrated, 0
+                for no limit
+
+        Raises:
+            ValueError: If the method is unknown
+        """
+        if method not in RAMP_WEIGHTS:
+            raise ValueError(f"Unknown integration method: {method}")
+        self.method = method
+        self.ramp_weight = RAMP_WEIGHTS[method]
+        self.max_gap = max_gap
+        self._window: deque[float] = deque(maxlen=max(1, int(median_window)))
+
+        # Sample before the start of the next interval, for Simpson's rule
+        self._before: tuple[float, float] | None = None
+
+    def filter(self, power: float | None) -> float | None:
+        """Pass a new sample through the median filter.
+
+        Args:
+            power: Total power in watts, or None if unavailable
+
+        Returns:
+            Median of the latest available samples, or None if unavailable
+        """
+        if power is None:
+            return None
+        self._window.append(power)
+        if len(self._window) == 1:
+            return power
+        return statistics.median(self._window)
+
+    def reset(self) -> None:
+        """Forget the samples before the next interval."""
+        self._before = None
+
+    def endpoints(
+        self, start_ts: float, p_start: float, end_ts: float, p_end: float
+    ) -> tuple[float, float] | None:
+        """Get the power at either end of an interval between two samples.
+
+        Args:
+            start_ts: Epoch seconds of the earlier sample
+            p_start: Earlier sample in watts
+            end_ts: Epoch seconds of the later sample
+            p_end: Later sample in watts
+
+        Returns:
+            Tuple of (power at start, power at end) in watts, or None if the
+            interval is longer than the maximum gap
+        """
+        before = self._before
+        self._before = (start_ts, p_start)
+
+        if self.max_gap and end_ts - start_ts > self.max_gap:
+            self._before = None
+            return None
+
+        if self.method == INTEGRATION_LEFT:
+            return p_start, p_start
+        if self.method == INTEGRATION_RIGHT:
+            return p_end, p_end
+        if self.method == INTEGRATION_TRAPEZOID or before is None:
+            return p_start, p_end
+
+        before_ts, p_before = before
+        h1 = start_ts - before_ts
+        h2 = end_ts - start_ts
+        if h1 <= 0 or h2 <= 0:
+            return p_start, p_end
+
+        # The trapezoid overestimates a parabola by h^3 / 12 times its
+        # second derivative, so shift both ends down by h^2 / 12 of it
+        curvature = 2 * ((p_end - p_start) / h2 - (p_start - p_before) / h1) / (h1 + h2)
+        shift = -h2 * h2 / 12 * curvature
+
+        # A parabola through a step or spike overshoots wildly, above all
+        # with the uneven spacing of sensors that report on change. Where
+        # the samples turn or hold, keep both ends within their range;
+        # otherwise keep the average power within it, which leaves
+        # quadratics exact.
+        low = min(p_before, p_start, p_end)
+        high = max(p_before, p_start, p_end)
+        if (p_start - p_before) * (p_end - p_start) <= 0:
+            shift = min(max(shift, low - min(p_start, p_end)), high - max(p_start, p_end))
+        else:
+            mean = (p_start + p_end) / 2
+            shift = min(max(shift, low - mean), high - mean)
+
+        # Never let the correction turn consumption negative
+        if p_start >= 0 and p_end >= 0:
+            shift = max(shift, -min(p_start, p_end))
+        return p_start + shift, p_end + shift
@@ -0,0 +1,116 @@
+"""Energy deltas from cumulative energy meter readings."""
+from __future__ import annotations
+
+from array import array
+import math
+from typing import Any
+
+# A drop smaller than this fraction of the last reading is treated as meter
+# noise rather than a reset, like Home Assistant's statistics do
+RESET_THRESHOLD = 0.1
+
+
+def meter_delta(previous: float, value: float) -> float | None:
+    """Get the energy used between two readings of a cumulative meter.
+
+    Args:
+        previous: Earlier reading in kWh
+        value: Later reading in kWh
+
+    Returns:
+        Energy in kWh, or None if the reading dipped slightly and should be
+        ignored until the meter passes the earlier reading again
+    """
+    if value >= previous:
+        return value - previous
+    if previous - value < previous * RESET_THRESHOLD:
+        return None
+
+    # The meter was reset or rolled over and counts up from zero again
+    return value
+
+
+class EnergyMeters:
+    """Last reading of each energy meter, in parallel arrays by position.
+
+    Readings are kept across restarts, so the first reading after a clean
+    restart covers the energy used while Home Assistant was stopped.
+    """
+
+    def __init__(self, entity_ids: list[str]) -> None:
+        """Initialize with no readings.
+
+        Args:
+            entity_ids: Energy sensor entity IDs, in position order
+        """
+        self.entity_ids = list(entity_ids)
+        self._index = {entity_id: index for index, entity_id in enumerate(self.entity_ids)}
+        count = len(self.entity_ids)
+        self.values = array("d", [math.nan]) * count
+        self.timestamps = array("d", [0.0]) * count
+
+    def __len__(self) -> int:
+        """Return the number of meters."""
+        return len(self.entity_ids)
+
+    def index(self, entity_id: str) -> int | None:
+        """Get the position of a meter, or None if not tracked."""
+        return self._index.get(entity_id)
+
+    def update(self, index: int, value: float, timestamp: float) -> tuple[float, float] | None:
+        """Record a reading and get the energy used since the last one.
+
+        Args:
+            index: Meter position
+            value: Reading in kWh
+            timestamp: Epoch seconds of the reading
+
+        Returns:
+            Tuple of (epoch seconds of the last reading, energy kWh), or
+            None for the first reading or a dip that is ignored
+        """
+        previous = self.values[index]
+        previous_timestamp = self.timestamps[index]
+
+        if math.isnan(previous):
+            self.values[index] = value
+            self.timestamps[index] = timestamp
+            return None
+
+        energy = meter_delta(previous, value)
+        if energy is None:
+            return None
+
+        self.values[index] = value
+        self.timestamps[index] = timestamp
+        return previous_timestamp, energy
+
+    def forget(self) -> None:
+        """Drop all readings, so the next one of each meter starts afresh."""
+        for index in range(len(self.entity_ids)):
+            self.values[index] = math.nan
+            self.timestamps[index] = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the last readings.
+
+        Returns:
+            Dictionary of entity ID to reading and its timestamp
+        """
+        return {
+            entity_id: {"value": self.values[index], "timestamp": self.timestamps[index]}
+            for index, entity_id in enumerate(self.entity_ids)
+            if not math.isnan(self.values[index])
+        }
+
+    def from_dict(self, meters: dict[str, dict[str, float]]) -> None:
+        """Load readings serialized by to_dict, matched by entity ID.
+
+        Args:
+            meters: Serialized readings
+        """
+        for entity_id, reading in meters.items():
+            index = self._index.get(entity_id)
+            if index is not None:
+                self.values[index] = reading["value"]
+                self.timestamps[index] = reading["timestamp"]
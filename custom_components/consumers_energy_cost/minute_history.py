@@ -0,0 +1,286 @@
+"""Memory-mapped per-minute history of energy and cost."""
+from __future__ import annotations
+
+import logging
+import math
+import mmap
+import os
+import struct
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+_LOGGER = logging.getLogger(__name__)
+
+RESOLUTION_SECONDS = 60
+
+# One leap year of minutes, about 4 MB of records
+MINUTES_PER_YEAR = 366 * 24 * 60
+
+# magic, version, resolution (s), reserved, capacity, first minute written,
+# last minute written, last integrated timestamp, power at that timestamp
+HEADER = struct.Struct("<4sHHHIqqdd")
+HEADER_SIZE = 64
+MAGIC = b"CEMH"
+VERSION = 1
+
+# float32 energy (kWh) and cost per minute
+RECORD = struct.Struct("<ff")
+
+NO_MINUTE = -1
+
+
+class MinuteHistory:
+    """Fixed-width per-minute records in a preallocated, memory-mapped file.
+
+    Minute ``m`` lives in slot ``m % capacity``, so the file wraps around
+    once a year. Slots between the last minute written and a newer one are
+    zeroed as time moves on, so every minute in the last ``capacity`` is
+    either recorded or zero. The header also holds the last integrated
+    timestamp and power, which lets a restart pick up where the file ends.
+
+    ``open``, ``flush`` and ``close`` do blocking file I/O and must run in
+    the executor; everything else only touches mapped memory.
+    """
+
+    def __init__(self, path: str, capacity: int = MINUTES_PER_YEAR) -> None:
+        """Initialize the history.
+
+        Args:
+            path: Path of the history file
+            capacity: Number of minutes kept
+        """
+        self.path = path
+        self.capacity = capacity
+        self.first_minute = NO_MINUTE
+        self.head = NO_MINUTE
+        self.last_timestamp = 0.0
+        self.last_power: float | None = None
+        self._file = None
+        self._map: mmap.mmap | None = None
+
+    @property
+    def size(self) -> int:
+        """Return the file size in bytes."""
+        return HEADER_SIZE + self.capacity * RECORD.size
+
+    def open(self) -> None:
+        """Map the file, creating it if missing or in another format."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, "a+b")  # noqa: SIM115
+        self._file.seek(0)
+        header = self._file.read(HEADER.size)
+
+        valid = len(header) == HEADER.size and os.path.getsize(self.path) == self.size
+        if valid:
+            magic, version, resolution, _, capacity, first, head, timestamp, power = (
+                HEADER.unpack(header)
+            )
+            valid = (magic, version, resolution, capacity) == (
+                MAGIC,
+                VERSION,
+                RESOLUTION_SECONDS,
+                self.capacity,
+            )
+
+        if not valid:
+            if header:
+                _LOGGER.warning("Minute history %s is in another format, starting fresh", self.path)
+            self._file.truncate(0)
+            self._file.truncate(self.size)
+            if hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(self._file.fileno(), 0, self.size)
+            first, head, timestamp, power = NO_MINUTE, NO_MINUTE, 0.0, math.nan
+
+        self._map = mmap.mmap(self._file.fileno(), self.size)
+        self.first_minute = first
+        self.head = head
+        self.last_timestamp = timestamp
+        self.last_power = None if math.isnan(power) else power
+        self._write_header()
+
+    def _write_header(self) -> None:
+        """Write the header fields into the mapped file."""
+        HEADER.pack_into(
+            self._map,
+            0,
+            MAGIC,
+            VERSION,
+            RESOLUTION_SECONDS,
+            0,
+            self.capacity,
+            self.first_minute,
+            self.head,
+            self.last_timestamp,
+            math.nan if self.last_power is None else self.last_power,
+        )
+
+    def _slot_ranges(self, first: int, last: int) -> list[tuple[int, int]]:
+        """Split a run of minutes into contiguous slot ranges.
+
+        Args:
+            first: First minute
+            last: Last minute (inclusive), less than capacity after first
+
+        Returns:
+            One or two (start slot, end slot exclusive) ranges
+        """
+        if last < first:
+            return []
+        start = first % self.capacity
+        end = last % self.capacity + 1
+        if end > start:
+            return [(start, end)]
+        return [(start, self.capacity), (0, end)]
+
+    def _zero(self, first: int, last: int) -> None:
+        """Zero the records of a run of minutes."""
+        for start, end in self._slot_ranges(first, last):
+            self._map[HEADER_SIZE + start * RECORD.size:HEADER_SIZE + end * RECORD.size] = bytes(
+                (end - start) * RECORD.size
+            )
+
+    def _oldest(self) -> int:
+        """Get the oldest minute still recorded."""
+        return max(self.first_minute, self.head - self.capacity + 1)
+
+    def add(self, timestamp: float, energy: float, cost: float) -> None:
+        """Add energy and cost to the minute containing a timestamp.
+
+        Args:
+            timestamp: Epoch seconds inside the interval the delta covers
+            energy: Energy in kWh
+            cost: Cost in dollars
+        """
+        minute = int(timestamp // RESOLUTION_SECONDS)
+        if self.head == NO_MINUTE:
+            self.first_minute = self.head = minute
+            self._write_header()
+        elif minute > self.head:
+            # Zero the minutes skipped since the last write, and the slot
+            # being reused once the file has wrapped around
+            self._zero(max(self.head + 1, minute - self.capacity + 1), minute)
+            self.head = minute
+            self._write_header()
+        elif minute <= self.head - self.capacity:
+            return
+        elif minute < self.first_minute:
+            self._zero(minute, self.first_minute - 1)
+            self.first_minute = minute
+            self._write_header()
+
+        offset = HEADER_SIZE + minute % self.capacity * RECORD.size
+        old_energy, old_cost = RECORD.unpack_from(self._map, offset)
+        RECORD.pack_into(self._map, offset, old_energy + energy, old_cost + cost)
+
+    def set_position(self, timestamp: float, power: float | None) -> None:
+        """Record how far the history has been integrated.
+
+        Args:
+            timestamp: Epoch seconds of the last reading integrated
+            power: Total power at that reading in watts
+        """
+        self.last_timestamp = timestamp
+        self.last_power = power
+        self._write_header()
+
+    def covered_from(self) -> float | None:
+        """Get when the recorded minutes start.
+
+        Returns:
+            Epoch seconds of the oldest minute kept, or None if empty
+        """
+        if self.head == NO_MINUTE:
+            return None
+        return self._oldest() * float(RESOLUTION_SECONDS)
+
+    def _minute_range(self, start: float, end: float) -> tuple[int, int]:
+        """Get the recorded minutes starting within a time range."""
+        first = max(math.ceil(start / RESOLUTION_SECONDS), self._oldest())
+        last = min(math.ceil(end / RESOLUTION_SECONDS) - 1, self.head)
+        return first, last
+
+    def sum(self, start: float, end: float) -> tuple[float, float]:
+        """Sum the minutes starting within a time range.
+
+        Args:
+            start: Epoch seconds of the range start
+            end: Epoch seconds of the range end (exclusive)
+
+        Returns:
+            Tuple of (energy kWh, cost)
+        """
+        if self.head == NO_MINUTE:
+            return 0.0, 0.0
+
+        energy = 0.0
+        cost = 0.0
+        for slot_start, slot_end in self._slot_ranges(*self._minute_range(start, end)):
+            if np is not None:
+                values = np.frombuffer(
+                    self._map,
+                    dtype="<f4",
+                    count=(slot_end - slot_start) * 2,
+                    offset=HEADER_SIZE + slot_start * RECORD.size,
+                )
+                range_energy, range_cost = values.reshape(-1, 2).sum(axis=0, dtype=np.float64)
+                del values
+                energy += float(range_energy)
+                cost += float(range_cost)
+            else:
+                with memoryview(self._map) as view, view[
+                    HEADER_SIZE + slot_start * RECORD.size:HEADER_SIZE + slot_end * RECORD.size
+                ].cast("f") as floats:
+                    energy += math.fsum(floats[0::2])
+                    cost += math.fsum(floats[1::2])
+        return energy, cost
+
+    def query(self, start: float, end: float) -> list[tuple[float, float, float]]:
+        """Get the recorded minutes starting within a time range.
+
+        Args:
+            start: Epoch seconds of the range start
+            end: Epoch seconds of the range end (exclusive)
+
+        Returns:
+            List of (minute start timestamp, energy kWh, cost) in time order
+        """
+        if self.head == NO_MINUTE:
+            return []
+
+        first, last = self._minute_range(start, end)
+        return [
+            (
+                minute * float(RESOLUTION_SECONDS),
+                *RECORD.unpack_from(
+                    self._map, HEADER_SIZE + minute % self.capacity * RECORD.size
+                ),
+            )
+            for minute in range(first, last + 1)
+        ]
+
+    def clear(self, since: float) -> None:
+        """Zero the minutes starting at or after a timestamp.
+
+        Args:
+            since: Epoch seconds
+        """
+        if self.head != NO_MINUTE:
+            self._zero(*self._minute_range(since, (self.head + 1) * RESOLUTION_SECONDS))
+
+    def flush(self) -> None:
+        """Write the mapped pages to disk."""
+        if self._map is not None:
+            self._map.flush()
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,67 @@
+"""Incrementally maintained total of many power sensors."""
+from __future__ import annotations
+
+from array import array
+import math
+
+
+class PowerSum:
+    """Parsed power of each sensor and their running total.
+
+    Values are kept in parallel arrays by sensor position and replaced one
+    at a time as sensors change, subtracting the old value from the total
+    and adding the new one, so reading the total never touches the sensors.
+    The total is recalculated from the values once every ``len(self)``
+    changes, which keeps rounding error from building up at an amortized
+    cost of one addition per change.
+    """
+
+    def __init__(self, count: int) -> None:
+        """Initialize with every sensor unavailable.
+
+        Args:
+            count: Number of sensors
+        """
+        self.values = array("d", [0.0]) * count
+        self.valid = bytearray(count)
+        self.valid_count = 0
+        self._total = 0.0
+        self._changes = 0
+
+    def __len__(self) -> int:
+        """Return the number of sensors."""
+        return len(self.values)
+
+    def set(self, index: int, power: float | None) -> None:
+        """Replace a sensor's power.
+
+        Args:
+            index: Sensor position
+            power: Power in watts, or None if unavailable
+        """
+        if self.valid[index]:
+            self._total -= self.values[index]
+            self.valid_count -= 1
+
+        if power is None:
+            self.values[index] = 0.0
+            self.valid[index] = 0
+            if self.valid_count == 0:
+                self._total = 0.0
+        else:
+            self.values[index] = power
+            self.valid[index] = 1
+            self._total += power
+            self.valid_count += 1
+
+        self._changes += 1
+        if self._changes >= len(self.values):
+            self._total = math.fsum(self.values)
+            self._changes = 0
+
+    @property
+    def total(self) -> float | None:
+        """Return the total power in watts, or None if no sensor is available."""
+        if self.valid_count == 0:
+            return None
+        return self._total
@@ -1,9 +1,375 @@
 """Rate calculator for time-of-use and seasonal pricing."""
-from datetime import datetime, time
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+from datetime import datetime, time, timedelta, tzinfo
+import hashlib
+import json
 import logging
+import math
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
 
 _LOGGER = logging.getLogger(__name__)
 
+MINUTES_PER_DAY = 1440
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+SECONDS_PER_DAY = 86400
+
+# Width of the buckets UTC offsets are resolved in for batch lookups. Every
+# real-world zone transition falls on a quarter hour.
+OFFSET_BUCKET_SECONDS = 900
+
+# How many month starts next_change() walks before concluding the rate is flat
+MAX_MONTHS_SCANNED = 13
+
+# Step next_change() looks for UTC offset changes in
+OFFSET_PROBE_SECONDS = 7 * 86400
+
+# Period id 0 is reserved for months that have no season configured
+UNKNOWN_PERIOD_ID = 0
+UNKNOWN_PERIOD = (0.0, "Unknown")
+
+# How many compiled schedules no calculator uses are kept, so reloading an
+# entry or switching back to a plan doesn't compile it again
+MAX_UNUSED_SCHEDULES = 8
+
+
+class CompiledSchedule:
+    """Rate configuration compiled into minute-of-week lookup tables.
+
+    Each configured season is expanded once into an array of period ids
+    indexed by minute of the week (Monday 00:00 = 0). The period ids point
+    into a side table of (rate, name) tuples, so a lookup is a single index
+    without any string parsing or allocation.
+    """
+
+    def __init__(self, rate_config: dict) -> None:
+        """Compile the rate configuration.
+
+        Args:
+            rate_config: Rate configuration dictionary with summer/winter seasons
+        """
+        self.periods: list[tuple[float, str]] = [UNKNOWN_PERIOD]
+        self._period_ids: dict[tuple[float, str], int] = {UNKNOWN_PERIOD: UNKNOWN_PERIOD_ID}
+
+        # Table 0 is used for months without a season
+        self.tables: list[array] = [array("H", bytes(2 * MINUTES_PER_WEEK))]
+        self.month_table: list[int] = [0] * 13
+        self.month_season_name: list[str] = ["Unknown"] * 13
+
+        for season_config in rate_config.values():
+            months = [
+                month
+                for month in season_config.get("months", [])
+                if 1 <= month <= 12 and self.month_table[month] == 0
+            ]
+            if not months:
+                continue
+
+            self.tables.append(self._compile_season(season_config))
+            for month in months:
+                self.month_table[month] = len(self.tables) - 1
+
+        # Minutes of the week at which each table's period changes
+        self.boundaries: list[list[int]] = [
+            [
+                minute
+                for minute in range(MINUTES_PER_WEEK)
+                if table[minute] != table[minute - 1]
+            ]
+            for table in self.tables
+        ]
+
+        summer_months = rate_config.get("summer", {}).get("months", [])
+        winter_months = rate_config.get("winter", {}).get("months", [])
+        for month in range(1, 13):
+            if month in summer_months:
+                self.month_season_name[month] = "Summer"
+            elif month in winter_months:
+                self.month_season_name[month] = "Winter"
+
+        # NumPy copies of the tables, month table and rates, built on first
+        # batch lookup. Schedules are shared and batch lookups run in
+        # executor threads, so the three are published together.
+        self._np_arrays: tuple[Any, Any, Any] | None = None
+
+    def _period_id(self, rate: float, name: str) -> int:
+        """Return the id for a (rate, name) pair, registering it if new."""
+        key = (rate, name)
+        period_id = self._period_ids.get(key)
+        if period_id is None:
+            period_id = len(self.periods)
+            self.periods.append(key)
+            self._period_ids[key] = period_id
+        return period_id
+
+    def _compile_season(self, season_config: dict) -> array:
+        """Compile one season into a minute-of-week table."""
+        season_default = self._period_id(
+            season_config.get("default_rate", 0.0),
+            season_config.get("default_name", "Standard"),
+        )
+
+        weekday = self._compile_day(season_config.get("weekday"), season_default)
+        weekend = self._compile_day(season_config.get("weekend"), season_default)
+
+        return weekday * 5 + weekend * 2
+
+    def _compile_day(self, day_config: dict | None, season_default: int) -> array:
+        """Compile one day type into a minute-of-day table."""
+        if day_config is None:
+            return array("H", [season_default]) * MINUTES_PER_DAY
+
+        table = array(
+            "H",
+            [
+                self._period_id(
+                    day_config.get("default_rate", 0.0),
+                    day_config.get("default_name", "Off-Peak"),
+                )
+            ],
+        ) * MINUTES_PER_DAY
+
+        # Paint in reverse so the first matching period wins, as in a linear scan
+        for period in reversed(day_config.get("periods", [])):
+            period_id = self._period_id(period["rate"], period["name"])
+            start = _parse_minute(period["start"])
+            end = _parse_minute(period["end"])
+
+            if start <= end:
+                ranges = ((start, end),)
+            else:
+                # Range crosses midnight (e.g., 23:00 to 01:00)
+                ranges = ((start, MINUTES_PER_DAY), (0, end))
+
+            for range_start, range_end in ranges:
+                table[range_start:range_end] = array("H", [period_id]) * (
+                    range_end - range_start
+                )
+
+        return table
+
+    def period_id(self, dt: datetime) -> int:
+        """Return the period id in effect at a given datetime."""
+        return self.tables[self.month_table[dt.month]][
+            dt.weekday() * MINUTES_PER_DAY + dt.hour * 60 + dt.minute
+        ]
+
+    def period_ids(self, timestamps: Sequence[float], tz: tzinfo) -> tuple[Any, Any]:
+        """Look up rates and period ids for many epoch timestamps at once.
+
+        Args:
+            timestamps: Epoch seconds (NumPy array, array('d') or any sequence)
+            tz: Time zone the rate schedule is defined in
+
+        Returns:
+            Tuple of (rates, period_ids) as NumPy arrays when NumPy is
+            available, otherwise as array('d') and array('H')
+        """
+        if np is None:
+            return self._period_ids_python(timestamps, tz)
+        return self._period_ids_numpy(timestamps, tz)
+
+    def _period_ids_python(
+        self, timestamps: Sequence[float], tz: tzinfo
+    ) -> tuple[array, array]:
+        """Batch lookup without NumPy, one datetime per timestamp."""
+        rates = array("d")
+        ids = array("H")
+        periods = self.periods
+        for timestamp in timestamps:
+            period_id = self.period_id(datetime.fromtimestamp(timestamp, tz))
+            rates.append(periods[period_id][0])
+            ids.append(period_id)
+        return rates, ids
+
+    def _period_ids_numpy(self, timestamps: Sequence[float], tz: tzinfo) -> tuple[Any, Any]:
+        """Vectorized batch lookup."""
+        arrays = self._np_arrays
+        if arrays is None:
+            arrays = self._np_arrays = (
+                np.array(self.tables, dtype=np.uint16),
+                np.array(self.month_table, dtype=np.intp),
+                np.array([rate for rate, _ in self.periods], dtype=np.float64),
+            )
+        tables, month_table, rates = arrays
+
+        epoch = np.asarray(timestamps, dtype=np.float64)
+        local = np.floor(epoch + _utc_offsets(epoch, tz)).astype(np.int64)
+
+        days = local // SECONDS_PER_DAY
+        minute_of_day = (local - days * SECONDS_PER_DAY) // 60
+        # 1970-01-01 was a Thursday (weekday 3)
+        minute_of_week = ((days + 3) % 7) * MINUTES_PER_DAY + minute_of_day
+
+        ids = tables[month_table[_civil_month(days)], minute_of_week]
+        return rates[ids], ids
+
+
+def _utc_offsets(epoch: Any, tz: tzinfo) -> Any:
+    """Return the UTC offset in seconds for each epoch timestamp.
+
+    Offsets are resolved once per bucket; buckets containing a zone
+    transition fall back to a per-timestamp lookup.
+    """
+    buckets = np.floor(epoch / OFFSET_BUCKET_SECONDS).astype(np.int64)
+    unique, inverse = np.unique(buckets, return_inverse=True)
+
+    bucket_offsets = np.empty(len(unique), dtype=np.float64)
+    split_buckets = []
+    for index, bucket in enumerate(unique.tolist()):
+        start = bucket * OFFSET_BUCKET_SECONDS
+        offset = datetime.fromtimestamp(start, tz).utcoffset()
+        end_offset = datetime.fromtimestamp(
+            start + OFFSET_BUCKET_SECONDS - 1, tz
+        ).utcoffset()
+        bucket_offsets[index] = offset.total_seconds() if offset else 0.0
+        if offset != end_offset:
+            split_buckets.append(index)
+
+    offsets = bucket_offsets[inverse.reshape(-1)].reshape(epoch.shape)
+    for index in split_buckets:
+        for position in np.flatnonzero(inverse.reshape(-1) == index).tolist():
+            offset = datetime.fromtimestamp(float(epoch.flat[position]), tz).utcoffset()
+            offsets.flat[position] = offset.total_seconds() if offset else 0.0
+    return offsets
+
+
+def _civil_month(days: Any) -> Any:
+    """Return the calendar month (1-12) for days since the Unix epoch."""
+    # Howard Hinnant's days-to-civil algorithm, month part only
+    shifted = days + 719468
+    era = shifted // 146097
+    day_of_era = shifted - era * 146097
+    year_of_era = (
+        day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096
+    ) // 365
+    day_of_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+    month_index = (5 * day_of_year + 2) // 153
+    return np.where(month_index < 10, month_index + 3, month_index - 9)
+
+
+def _offset_change(
+    start_ts: float, end_ts: float, tz: tzinfo, offset: timedelta
+) -> int | None:
+    """Find the first UTC offset change in a zone after a timestamp.
+
+    The span is probed a week at a time, as zones never change offset
+    twice within a week, and the change is then bisected to the second.
+
+    Args:
+        start_ts: Epoch seconds to search from (exclusive)
+        end_ts: Epoch seconds to search to (inclusive)
+        tz: Time zone
+        offset: UTC offset at start_ts
+
+    Returns:
+        Epoch seconds of the first second at another offset, or None if
+        the offset doesn't change
+    """
+    low = math.floor(start_ts)
+    probe = low
+    while probe < end_ts:
+        high = min(probe + OFFSET_PROBE_SECONDS, math.ceil(end_ts))
+        if datetime.fromtimestamp(high, tz).utcoffset() != offset:
+            low = probe
+            while high - low > 1:
+                middle = (low + high) // 2
+                if datetime.fromtimestamp(middle, tz).utcoffset() == offset:
+                    low = middle
+                else:
+                    high = middle
+            return high
+        probe = high
+    return None
+
+
+def _parse_minute(time_str: str) -> int:
+    """Parse a time string in HH:MM format into minutes since midnight."""
+    hour, minute = map(int, time_str.split(":"))
+    # Validate the same way time() does for the reference implementation
+    time(hour, minute)
+    return hour * 60 + minute
+
+
+def schedule_key(rate_config: dict) -> str:
+    """Return a canonical key for a rate configuration.
+
+    Keys within a season are sorted, but the order of the seasons is kept,
+    as the first season listing a month is the one used for it.
+
+    Args:
+        rate_config: Rate configuration dictionary
+
+    Returns:
+        SHA-256 hex digest of the configuration
+    """
+    canonical = json.dumps(
+        list(rate_config.items()), sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+# Compiled schedules shared by every calculator with the same rates, and how
+# many calculators use each, by schedule key
+_schedules: dict[str, CompiledSchedule] = {}
+_schedule_users: dict[str, int] = {}
+# Schedules no calculator uses, least recently released first
+_unused_schedules: dict[str, CompiledSchedule] = {}
+
+
+def acquire_schedule(rate_config: dict) -> tuple[str, CompiledSchedule]:
+    """Get the compiled schedule for a rate configuration.
+
+    Config entries on the same plan share one schedule, which is only
+    compiled when no entry has used the configuration recently.
+
+    Args:
+        rate_config: Rate configuration dictionary
+
+    Returns:
+        Tuple of (schedule key, compiled schedule)
+    """
+    key = schedule_key(rate_config)
+    schedule = _schedules.get(key)
+    if schedule is None:
+        schedule = _unused_schedules.pop(key, None)
+        if schedule is None:
+            schedule = CompiledSchedule(rate_config)
+        _schedules[key] = schedule
+    _schedule_users[key] = _schedule_users.get(key, 0) + 1
+    return key, schedule
+
+
+def release_schedule(key: str) -> None:
+    """Stop using a compiled schedule.
+
+    A schedule no calculator uses is kept among the MAX_UNUSED_SCHEDULES
+    most recently released, then dropped.
+
+    Args:
+        key: Schedule key returned by acquire_schedule()
+    """
+    users = _schedule_users.get(key, 0) - 1
+    if users > 0:
+        _schedule_users[key] = users
+        return
+
+    _schedule_users.pop(key, None)
+    schedule = _schedules.pop(key, None)
+    if schedule is None:
+        return
+    _unused_schedules[key] = schedule
+    while len(_unused_schedules) > MAX_UNUSED_SCHEDULES:
+        del _unused_schedules[next(iter(_unused_schedules))]
+
 
 class RateCalculator:
     """Calculate electricity rates based on time, day, and season."""
@@ -15,10 +381,251 @@ class RateCalculator:
             rate_config: Rate configuration dictionary with summer/winter seasons
         """
         self.rate_config = rate_config
+        key, self.schedule = acquire_schedule(rate_config)
+        # Key of the shared schedule, until it's released
+        self._schedule_key: str | None = key
+
+        # Time zone, epoch span and rate of the last rate looked up by
+        # cost_for_interval, so consecutive intervals within one rate
+        # period are priced without searching for the next change
+        self._span: tuple[tzinfo | None, float, float, float] | None = None
+
+    def close(self) -> None:
+        """Release the shared compiled schedule.
+
+        The calculator keeps working, but its schedule may be dropped from
+        the cache and compiled again for the next calculator to use it.
+        """
+        if self._schedule_key is not None:
+            release_schedule(self._schedule_key)
+            self._schedule_key = None
 
     def get_rate(self, dt: datetime) -> tuple[float, str]:
         """Get the current rate and period name for a given datetime.
 
+        Args:
+            dt: The datetime to calculate rate for
+
+        Returns:
+            Tuple of (rate_per_kwh, period_name)
+        """
+        period_id = self.schedule.period_id(dt)
+
+        if period_id == UNKNOWN_PERIOD_ID:
+            _LOGGER.error("No season config found for month %s", dt.month)
+
+        return self.schedule.periods[period_id]
+
+    def get_season_name(self, dt: datetime) -> str:
+        """Get the season name for a given datetime.
+
+        Args:
+            dt: The datetime to check
+
+        Returns:
+            Season name ("summer" or "winter")
+        """
+        return self.schedule.month_season_name[dt.month]
+
+    def next_change(self, dt: datetime) -> tuple[datetime, float, str] | None:
+        """Find when the rate next changes after a given datetime.
+
+        Uses the compiled boundary index, so this is a bisect per month
+        instead of a scan. Rates follow the wall clock in the zone of
+        ``dt``; for an aware ``dt``, time is moved in epoch seconds and the wall
+        clock read from it, so a change inside the repeated hour when
+        clocks go back, or one made by the clocks changing, is found at
+        the right moment.
+
+        Args:
+            dt: The datetime to search from
+
+        Returns:
+            Tuple of (change_time, new_rate, new_period_name), or None if the
+            rate never changes
+        """
+        schedule = self.schedule
+        current = schedule.period_id(dt)
+        offset = dt.utcoffset()
+        if offset is None:
+            change = self._next_wall_change(dt, current)
+            if change is None:
+                return None
+            return (change[0], *schedule.periods[change[1]])
+
+        # Each pass covers one stretch of a single UTC offset, in which wall
+        # time and epoch seconds move together. Datetimes sharing a tzinfo
+        # add and subtract as wall-clock times.
+        tz = dt.tzinfo
+        timestamp = dt.timestamp()
+        wall = dt
+        for _ in range(MAX_MONTHS_SCANNED):
+            change = self._next_wall_change(wall, current)
+            if change is None:
+                return None
+            change_ts = timestamp + (change[0] - wall).total_seconds()
+
+            # Usually the change is within days and at the same offset
+            change_time = datetime.fromtimestamp(change_ts, tz)
+            if (
+                change_ts - timestamp <= OFFSET_PROBE_SECONDS
+                and change_time.utcoffset() == offset
+            ):
+                transition = None
+            else:
+                transition = _offset_change(timestamp, change_ts, tz, offset)
+            if transition is None:
+                return (change_time, *schedule.periods[change[1]])
+
+            # The wall clock jumps at the transition, which may change the rate
+            after = datetime.fromtimestamp(transition, tz)
+            period_id = schedule.period_id(after)
+            if period_id != current:
+                return (after, *schedule.periods[period_id])
+            timestamp = transition
+            wall = after
+            offset = after.utcoffset()
+
+        return None
+
+    def _next_wall_change(self, dt: datetime, current: int) -> tuple[datetime, int] | None:
+        """Find the next wall-clock time the period changes at.
+
+        Times are added as wall-clock times, as if the UTC offset never
+        changed.
+
+        Args:
+            dt: The wall-clock time to search from
+            current: Period id in effect at dt
+
+        Returns:
+            Tuple of (change_time, new_period_id), or None if the period
+            never changes
+        """
+        schedule = self.schedule
+        cursor = dt.replace(second=0, microsecond=0)
+
+        for _ in range(MAX_MONTHS_SCANNED):
+            month_end = (cursor.replace(day=28) + timedelta(days=4)).replace(
+                day=1, hour=0, minute=0
+            )
+            table_index = schedule.month_table[cursor.month]
+            boundaries = schedule.boundaries[table_index]
+
+            if boundaries:
+                minute_of_week = (
+                    cursor.weekday() * MINUTES_PER_DAY + cursor.hour * 60 + cursor.minute
+                )
+                index = bisect_right(boundaries, minute_of_week)
+                if index < len(boundaries):
+                    boundary = boundaries[index]
+                else:
+                    boundary = boundaries[0] + MINUTES_PER_WEEK
+
+                change_time = cursor + timedelta(minutes=boundary - minute_of_week)
+                if change_time < month_end:
+                    return (
+                        change_time,
+                        schedule.tables[table_index][boundary % MINUTES_PER_WEEK],
+                    )
+
+            # Season tables only change at month starts
+            period_id = schedule.period_id(month_end)
+            if period_id != current:
+                return (month_end, period_id)
+            cursor = month_end
+
+        return None
+
+    def cost_for_interval(
+        self, start: datetime, end: datetime, p_start: float, p_end: float
+    ) -> tuple[float, float]:
+        """Price an interval of linearly changing power.
+
+        The interval is split at every rate change inside it, and each
+        sub-segment is integrated with the trapezoidal rule at its own rate.
+
+        Args:
+            start: Start of the interval
+            end: End of the interval
+            p_start: Power at the start of the interval in watts
+            p_end: Power at the end of the interval in watts
+
+        Returns:
+            Tuple of (energy_kwh, cost)
+        """
+        start_ts = start.timestamp()
+        end_ts = end.timestamp()
+        duration = end_ts - start_ts
+        if duration <= 0:
+            return (0.0, 0.0)
+
+        span = self._span
+        if (
+            span is not None
+            and span[0] is start.tzinfo
+            and span[1] <= start_ts
+            and end_ts <= span[2]
+        ):
+            energy = (p_start + p_end) / 2 * duration / 3600000.0
+            return (energy, energy * span[3])
+
+        schedule = self.schedule
+        slope = (p_end - p_start) / duration
+        energy = 0.0
+        cost = 0.0
+
+        segment_start = start
+        segment_ts = start_ts
+        segment_power = p_start
+        rate = schedule.periods[schedule.period_id(start)][0]
+
+        while True:
+            change = self.next_change(segment_start)
+            change_ts = change[0].timestamp() if change else math.inf
+            self._span = (start.tzinfo, segment_ts, change_ts, rate)
+
+            if change_ts >= end_ts:
+                segment_energy = (segment_power + p_end) / 2 * (end_ts - segment_ts) / 3600000.0
+                return (energy + segment_energy, cost + segment_energy * rate)
+
+            change_power = p_start + slope * (change_ts - start_ts)
+            segment_energy = (
+                (segment_power + change_power) / 2 * (change_ts - segment_ts) / 3600000.0
+            )
+            energy += segment_energy
+            cost += segment_energy * rate
+
+            segment_start, rate = change[0], change[1]
+            segment_ts = change_ts
+            segment_power = change_power
+
+    def get_rates(self, timestamps: Sequence[float], tz: tzinfo) -> tuple[Any, Any]:
+        """Get rates and period ids for many timestamps in one pass.
+
+        Unknown-season timestamps get period id 0 and a rate of 0.0 without
+        logging. Period names are available as
+        ``self.schedule.periods[period_id][1]``.
+
+        Args:
+            timestamps: Epoch seconds (NumPy array or array('d'))
+            tz: Time zone the rate schedule is defined in, the local zone
+                get_rate() would be given datetimes in. There is no default,
+                as a wrong zone shifts every period by its UTC offset.
+
+        Returns:
+            Tuple of parallel (rates, period_ids) arrays. These are NumPy
+            arrays when NumPy is installed, otherwise array('d') and
+            array('H')
+        """
+        return self.schedule.period_ids(timestamps, tz)
+
+    def _reference_rate(self, dt: datetime) -> tuple[float, str]:
+        """Get the rate by walking the rate configuration directly.
+
+        This is the original uncompiled lookup. It is kept as the reference
+        the compiled schedule is validated against.
+
         Args:
             dt: The datetime to calculate rate for
 
@@ -30,7 +637,6 @@ class RateCalculator:
         season_config = self._get_season_config(month)
 
         if season_config is None:
-            _LOGGER.error("No season config found for month %s", month)
             return (0.0, "Unknown")
 
         # Determine if weekday or weekend
@@ -106,19 +712,3 @@ class RateCalculator:
         else:
             # Range crosses midnight (e.g., 23:00 to 01:00)
             return current >= start or current < end
-
-    def get_season_name(self, dt: datetime) -> str:
-        """Get the season name for a given datetime.
-
-        Args:
-            dt: The datetime to check
-
-        Returns:
-            Season name ("summer" or "winter")
-        """
-        month = dt.month
-        if month in self.rate_config.get("summer", {}).get("months", []):
-            return "Summer"
-        elif month in self.rate_config.get("winter", {}).get("months", []):
-            return "Winter"
-        return "Unknown"
@@ -0,0 +1,154 @@
+"""Sliding windows of energy and cost over the recent past."""
+from __future__ import annotations
+
+from array import array
+import math
+
+# Window name, bucket length (s) and window length in buckets: the last
+# 60 minutes in minutes, the last 24 hours in 5 minutes and the last 7 days
+# in hours
+WINDOWS = (
+    ("60m", 60, 60),
+    ("24h", 5 * 60, 24 * 12),
+    ("7d", 3600, 7 * 24),
+)
+
+NO_BUCKET = -1
+
+
+class RollingWindow:
+    """Fixed ring of epoch-aligned buckets with running sums.
+
+    The ring holds one bucket more than the window, so the oldest bucket
+    can be partly counted: as the current bucket fills, the same fraction
+    of the oldest one leaves the window. Moving the window on subtracts the
+    buckets that fall out of it from the running sums, so adding a delta
+    and reading the totals cost the same however long the window is.
+    """
+
+    __slots__ = ("bucket_seconds", "size", "head", "energy", "cost", "energy_sum", "cost_sum")
+
+    def __init__(self, bucket_seconds: int, buckets: int) -> None:
+        """Initialize an empty window.
+
+        Args:
+            bucket_seconds: Length of a bucket in seconds
+            buckets: Window length in buckets
+        """
+        self.bucket_seconds = bucket_seconds
+        self.size = buckets + 1
+        self.head = NO_BUCKET
+        self.energy = array("d", [0.0]) * self.size
+        self.cost = array("d", [0.0]) * self.size
+        self.energy_sum = 0.0
+        self.cost_sum = 0.0
+
+    def _advance(self, key: int) -> None:
+        """Move the newest bucket on to a key, dropping the buckets it passes."""
+        if self.head == NO_BUCKET or key - self.head >= self.size:
+            self.reset()
+        else:
+            for passed in range(self.head + 1, key + 1):
+                slot = passed % self.size
+                self.energy_sum -= self.energy[slot]
+                self.cost_sum -= self.cost[slot]
+                self.energy[slot] = 0.0
+                self.cost[slot] = 0.0
+                # Resum once per lap so subtraction error can't build up
+                if slot == 0:
+                    self._resum()
+        self.head = key
+
+    def _resum(self) -> None:
+        """Recalculate the running sums from the buckets."""
+        self.energy_sum = math.fsum(self.energy)
+        self.cost_sum = math.fsum(self.cost)
+
+    def add(self, timestamp: float, energy: float, cost: float, since: float | None = None) -> None:
+        """Add a delta to the bucket containing a timestamp.
+
+        Args:
+            timestamp: Epoch seconds inside the interval the delta covers
+            energy: Energy in kWh
+            cost: Cost in dollars
+            since: If given, only add to a bucket starting at or after it
+        """
+        key = int(timestamp // self.bucket_seconds)
+        if since is not None and key * self.bucket_seconds < since:
+            return
+        if key > self.head:
+            self._advance(key)
+        elif key <= self.head - self.size:
+            return
+
+        slot = key % self.size
+        self.energy[slot] += energy
+        self.cost[slot] += cost
+        self.energy_sum += energy
+        self.cost_sum += cost
+
+    def totals(self, timestamp: float) -> tuple[float, float]:
+        """Get the energy and cost in the window ending at a timestamp.
+
+        Args:
+            timestamp: Epoch seconds of the window end
+
+        Returns:
+            Tuple of (energy kWh, cost)
+        """
+        key = int(timestamp // self.bucket_seconds)
+        if key > self.head:
+            self._advance(key)
+        elif key < self.head:
+            # A late reading; the window already moved past it
+            key = self.head
+
+        # The part of the oldest bucket that is still in the window
+        oldest = (key + 1) % self.size
+        remaining = max(0.0, 1.0 - (timestamp - key * self.bucket_seconds) / self.bucket_seconds)
+        energy = self.energy_sum - self.energy[oldest] * (1.0 - remaining)
+        cost = self.cost_sum - self.cost[oldest] * (1.0 - remaining)
+        return max(energy, 0.0), max(cost, 0.0)
+
+    def clear(self, since: float) -> None:
+        """Zero the buckets starting at or after a timestamp.
+
+        Args:
+            since: Epoch seconds
+        """
+        if self.head == NO_BUCKET:
+            return
+        first = max(math.ceil(since / self.bucket_seconds), self.head - self.size + 1)
+        for key in range(first, self.head + 1):
+            self.energy[key % self.size] = 0.0
+            self.cost[key % self.size] = 0.0
+        self._resum()
+
+    def reset(self) -> None:
+        """Empty the window."""
+        for slot in range(self.size):
+            self.energy[slot] = 0.0
+            self.cost[slot] = 0.0
+        self.energy_sum = 0.0
+        self.cost_sum = 0.0
+
+    def to_bytes(self) -> bytes:
+        """Serialize the newest bucket key and the buckets."""
+        return array("q", [self.head]).tobytes() + self.energy.tobytes() + self.cost.tobytes()
+
+    def from_bytes(self, data: bytes) -> None:
+        """Load a window serialized by to_bytes.
+
+        Args:
+            data: Serialized window, ``byte_size`` bytes long
+        """
+        self.head = array("q", data[:8])[0]
+        size = self.size * 8
+        self.energy[:] = array("d", data[8:8 + size])
+        self.cost[:] = array("d", data[8 + size:8 + 2 * size])
+        self._resum()
+
+    @property
+    def byte_size(self) -> int:
+        """Return the serialized size in bytes."""
+        return 8 + self.size * 16
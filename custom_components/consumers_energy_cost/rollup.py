@@ -0,0 +1,298 @@
+"""Minute, hour, day and month rollups of energy and cost."""
+from __future__ import annotations
+
+from array import array
+from datetime import date, datetime, tzinfo
+import os
+import struct
+
+from .minute_history import MinuteHistory
+from .rolling import WINDOWS, RollingWindow
+
+# Resolution name and number of buckets kept: 90 days of hours, 3 years of
+# days and 10 years of months. Minutes are kept in a MinuteHistory file.
+LEVELS = (
+    ("hour", 90 * 24),
+    ("day", 3 * 366),
+    ("month", 10 * 12),
+)
+RESOLUTIONS = ("minute",) + tuple(name for name, _ in LEVELS)
+
+HEADER = struct.Struct("<4sH")
+MAGIC = b"CERU"
+VERSION = 1
+
+EMPTY_KEY = -1
+
+
+class _Level:
+    """Ring of buckets for one resolution, stored in parallel arrays.
+
+    A bucket lives in slot ``key % capacity``. A slot is reset when a newer
+    key claims it, so the oldest buckets are dropped as time moves on.
+    """
+
+    __slots__ = ("capacity", "keys", "energy", "cost")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty level.
+
+        Args:
+            capacity: Number of buckets kept
+        """
+        self.capacity = capacity
+        self.keys = array("q", [EMPTY_KEY]) * capacity
+        self.energy = array("d", [0.0]) * capacity
+        self.cost = array("d", [0.0]) * capacity
+
+    def add(self, key: int, energy: float, cost: float) -> None:
+        """Add energy and cost to a bucket.
+
+        A key older than the one its slot holds is past the oldest bucket
+        kept, so it is ignored rather than overwriting the newer bucket.
+        """
+        slot = key % self.capacity
+        if self.keys[slot] != key:
+            if self.keys[slot] > key:
+                return
+            self.keys[slot] = key
+            self.energy[slot] = 0.0
+            self.cost[slot] = 0.0
+        self.energy[slot] += energy
+        self.cost[slot] += cost
+
+    def get(self, key: int) -> tuple[float, float] | None:
+        """Get a bucket's energy and cost, or None if not kept."""
+        slot = key % self.capacity
+        if self.keys[slot] != key:
+            return None
+        return self.energy[slot], self.cost[slot]
+
+    def clear(self, first_key: int) -> None:
+        """Drop all buckets from a key on."""
+        for slot, key in enumerate(self.keys):
+            if key >= first_key:
+                self.keys[slot] = EMPTY_KEY
+                self.energy[slot] = 0.0
+                self.cost[slot] = 0.0
+
+
+class RollupStore:
+    """Energy and cost rolled up at several resolutions.
+
+    Every delta is added to its minute, hour, day and month bucket, so each
+    resolution is maintained incrementally and coarser ones outlive finer
+    ones. Minutes and hours are epoch aligned; days and months follow the
+    local calendar. Deltas also go into the sliding windows in ``windows``.
+    """
+
+    def __init__(self, tz: tzinfo, minutes: MinuteHistory | None = None) -> None:
+        """Initialize an empty store.
+
+        Args:
+            tz: Time zone of the local calendar
+            minutes: Opened per-minute history, or None to not keep minutes
+        """
+        self._tz = tz
+        self.minutes = minutes
+        self._levels = {name: _Level(capacity) for name, capacity in LEVELS}
+        self.windows = {
+            name: RollingWindow(bucket_seconds, buckets)
+            for name, bucket_seconds, buckets in WINDOWS
+        }
+
+    def _keys(self, timestamp: float) -> tuple[int, int, int, int]:
+        """Get the minute, hour, day and month keys containing a timestamp."""
+        day = datetime.fromtimestamp(timestamp, self._tz).date()
+        return (
+            int(timestamp // 60),
+            int(timestamp // 3600),
+            day.toordinal(),
+            day.year * 12 + day.month - 1,
+        )
+
+    def _key(self, resolution: str, timestamp: float) -> int:
+        """Get the bucket key containing a timestamp."""
+        return self._keys(timestamp)[RESOLUTIONS.index(resolution)]
+
+    def _bucket_start(self, resolution: str, key: int) -> float:
+        """Get the epoch timestamp a bucket starts at."""
+        if resolution == "hour":
+            return key * 3600.0
+
+        if resolution == "day":
+            day = date.fromordinal(key)
+        else:
+            day = date(key // 12, key % 12 + 1, 1)
+        return datetime(day.year, day.month, day.day, tzinfo=self._tz).timestamp()
+
+    def _first_full_key(self, resolution: str, since: float) -> int:
+        """Get the first bucket key that starts at or after a timestamp."""
+        key = self._key(resolution, since)
+        if self._bucket_start(resolution, key) < since:
+            key += 1
+        return key
+
+    def add(
+        self,
+        timestamp: float,
+        energy: float,
+        cost: float,
+        since: float | None = None,
+        minutes: bool = True,
+    ) -> None:
+        """Add a delta to the buckets containing a timestamp.
+
+        Args:
+            timestamp: Epoch seconds inside the interval the delta covers
+            energy: Energy in kWh
+            cost: Cost in dollars
+            since: If given, only add to buckets starting at or after it
+            minutes: Whether to add to the minute history as well
+        """
+        keys = self._keys(timestamp)
+        if (
+            minutes
+            and self.minutes is not None
+            and (since is None or keys[0] * 60 >= since)
+        ):
+            self.minutes.add(timestamp, energy, cost)
+
+        for (resolution, level), key in zip(self._levels.items(), keys[1:]):
+            if since is not None and key < self._first_full_key(resolution, since):
+                continue
+            level.add(key, energy, cost)
+
+        for window in self.windows.values():
+            window.add(timestamp, energy, cost, since)
+
+    def clear(self, since: float) -> None:
+        """Drop all buckets starting at or after a timestamp.
+
+        Buckets that straddle it are kept, so rebuilding from it with
+        ``add(..., since=since)`` leaves them unchanged.
+
+        Args:
+            since: Epoch seconds
+        """
+        if self.minutes is not None:
+            self.minutes.clear(since)
+        for resolution, level in self._levels.items():
+            level.clear(self._first_full_key(resolution, since))
+        for window in self.windows.values():
+            window.clear(since)
+
+    def query(
+        self, start: float, end: float, resolution: str
+    ) -> list[tuple[float, float, float]]:
+        """Get the buckets overlapping a time range.
+
+        Args:
+            start: Epoch seconds of the range start
+            end: Epoch seconds of the range end (exclusive)
+            resolution: One of RESOLUTIONS
+
+        Returns:
+            List of (bucket start timestamp, energy kWh, cost) in time order,
+            for the buckets still kept
+        """
+        if end <= start:
+            return []
+        if resolution == "minute":
+            return self.minutes.query(start, end) if self.minutes is not None else []
+
+        level = self._levels[resolution]
+
+        last_key = self._key(resolution, end)
+        if self._bucket_start(resolution, last_key) >= end:
+            last_key -= 1
+        # Older buckets can't be kept, no need to look for them
+        first_key = max(self._key(resolution, start), last_key - level.capacity + 1)
+
+        buckets = []
+        for key in range(first_key, last_key + 1):
+            bucket = level.get(key)
+            if bucket is not None:
+                buckets.append((self._bucket_start(resolution, key), *bucket))
+        return buckets
+
+    def window_totals(self, timestamp: float) -> dict[str, tuple[float, float]]:
+        """Get the energy and cost in each sliding window.
+
+        Args:
+            timestamp: Epoch seconds the windows end at
+
+        Returns:
+            Dictionary of window name to (energy kWh, cost)
+        """
+        return {name: window.totals(timestamp) for name, window in self.windows.items()}
+
+    def to_bytes(self) -> bytes:
+        """Serialize all levels and windows.
+
+        Returns:
+            Header followed by each level's keys, energy and cost arrays,
+            then each window
+        """
+        parts = [HEADER.pack(MAGIC, VERSION)]
+        for level in self._levels.values():
+            parts += [level.keys.tobytes(), level.energy.tobytes(), level.cost.tobytes()]
+        parts += [window.to_bytes() for window in self.windows.values()]
+        return b"".join(parts)
+
+    def from_bytes(self, data: bytes) -> bool:
+        """Load levels and windows serialized by to_bytes.
+
+        Args:
+            data: Serialized rollups
+
+        Returns:
+            True if loaded, False if the data doesn't match this format
+        """
+        offset = HEADER.size
+        levels_size = sum(capacity * 24 for _, capacity in LEVELS)
+        windows_size = sum(window.byte_size for window in self.windows.values())
+        if data[:HEADER.size] != HEADER.pack(MAGIC, VERSION):
+            return False
+        if len(data) != offset + levels_size + windows_size:
+            return False
+
+        for level in self._levels.values():
+            for values in (level.keys, level.energy, level.cost):
+                size = level.capacity * values.itemsize
+                values[:] = array(values.typecode, data[offset:offset + size])
+                offset += size
+        for window in self.windows.values():
+            window.from_bytes(data[offset:offset + window.byte_size])
+            offset += window.byte_size
+        return True
+
+
+def read_file(path: str) -> bytes | None:
+    """Read a rollup file.
+
+    Args:
+        path: Path of the file
+
+    Returns:
+        File contents, or None if there is no file
+    """
+    try:
+        with open(path, "rb") as rollup_file:
+            return rollup_file.read()
+    except FileNotFoundError:
+        return None
+
+
+def write_file(path: str, data: bytes) -> None:
+    """Replace a rollup file atomically.
+
+    Args:
+        path: Path of the file
+        data: Serialized rollups
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as rollup_file:
+        rollup_file.write(data)
+    os.replace(temp_path, path)
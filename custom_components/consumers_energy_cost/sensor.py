@@ -17,7 +17,14 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     CONF_INSTANCE_NAME,
+    CONF_PLAN_COMPARISON,
+    CONF_SOURCE_SENSORS,
     DOMAIN,
+    RATE_PLAN_TEMPLATES,
+    SENSOR_CHEAPEST_PLAN,
+    SENSOR_COST_24H,
+    SENSOR_COST_60M,
+    SENSOR_COST_7D,
     SENSOR_COST_HOUR,
     SENSOR_COST_MONTH,
     SENSOR_COST_PREVIOUS_MONTH,
@@ -26,13 +33,20 @@ from .const import (
     SENSOR_COST_WEEK,
     SENSOR_COST_YEAR,
     SENSOR_CURRENT_RATE,
+    SENSOR_ENERGY_24H,
+    SENSOR_ENERGY_60M,
+    SENSOR_ENERGY_7D,
     SENSOR_ENERGY_HOUR,
     SENSOR_ENERGY_MONTH,
     SENSOR_ENERGY_PREVIOUS_MONTH,
     SENSOR_ENERGY_TODAY,
     SENSOR_ENERGY_WEEK,
     SENSOR_ENERGY_YEAR,
+    SENSOR_PLAN_COST,
+    SENSOR_PLAN_PROJECTED_COST,
     SENSOR_RATE_PERIOD,
+    SENSOR_SOURCE_COST,
+    SENSOR_SOURCE_ENERGY,
     SENSOR_TOTAL_POWER,
 )
 from .coordinator import EnergyDataUpdateCoordinator
@@ -65,11 +79,42 @@ async def async_setup_entry(
         CostYearSensor(coordinator, config_entry),
         EnergyPreviousMonthSensor(coordinator, config_entry),
         CostPreviousMonthSensor(coordinator, config_entry),
+        Energy60MinutesSensor(coordinator, config_entry),
+        Cost60MinutesSensor(coordinator, config_entry),
+        Energy24HoursSensor(coordinator, config_entry),
+        Cost24HoursSensor(coordinator, config_entry),
+        Energy7DaysSensor(coordinator, config_entry),
+        Cost7DaysSensor(coordinator, config_entry),
     ]
 
+    # Optional energy and cost sensors for each power sensor
+    if config_entry.data.get(CONF_SOURCE_SENSORS, False):
+        for entity_id in coordinator.sources.entity_ids:
+            state = hass.states.get(entity_id)
+            source_name = state.name if state is not None else entity_id
+            entities += [
+                SourceEnergySensor(coordinator, config_entry, entity_id, source_name),
+                SourceCostSensor(coordinator, config_entry, entity_id, source_name),
+            ]
+
+    # Optional cost of this month's consumption under every plan
+    if config_entry.data.get(CONF_PLAN_COMPARISON, False) and coordinator.comparison:
+        for plan_id in coordinator.comparison.plan_ids:
+            entities += [
+                PlanCostSensor(coordinator, config_entry, plan_id),
+                PlanProjectedCostSensor(coordinator, config_entry, plan_id),
+            ]
+        entities.append(CheapestPlanSensor(coordinator, config_entry))
+
     async_add_entities(entities)
 
 
+def _plan_name(plan_id: str) -> str:
+    """Get the display name of a compared plan."""
+    template = RATE_PLAN_TEMPLATES.get(plan_id)
+    return template["name"] if template is not None else "Custom Rates"
+
+
 class ConsumersEnergySensorBase(CoordinatorEntity, SensorEntity):
     """Base class for Consumers Energy Cost sensors."""
 
@@ -98,7 +143,7 @@ class ConsumersEnergySensorBase(CoordinatorEntity, SensorEntity):
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return extra state attributes."""
         return {
-            "source_sensors": self.coordinator.power_sensors,
+            "source_sensors": self.coordinator.sources.entity_ids,
             "last_update": self.coordinator.data.get("last_update"),
         }
 
@@ -140,6 +185,15 @@ class CurrentRateSensor(ConsumersEnergySensorBase):
         """Return the state of the sensor."""
         return self.coordinator.data.get("current_rate")
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return extra state attributes, including the next rate change."""
+        return {
+            **super().extra_state_attributes,
+            "next_rate_change": self.coordinator.data.get("next_rate_change"),
+            "next_rate": self.coordinator.data.get("next_rate"),
+        }
+
 
 class CostRateSensor(ConsumersEnergySensorBase):
     """Sensor for current cost rate ($/hour)."""
@@ -178,7 +232,7 @@ class RatePeriodSensor(ConsumersEnergySensorBase):
 
 
 class EnergyHourSensor(ConsumersEnergySensorBase):
-    """Sensor for energy consumed in the last hour."""
+    """Sensor for energy consumed in the current clock hour."""
 
     def __init__(
         self, coordinator: EnergyDataUpdateCoordinator, config_entry: ConfigEntry
@@ -196,7 +250,7 @@ class EnergyHourSensor(ConsumersEnergySensorBase):
 
 
 class CostHourSensor(ConsumersEnergySensorBase):
-    """Sensor for cost in the last hour."""
+    """Sensor for cost in the current clock hour."""
 
     def __init__(
         self, coordinator: EnergyDataUpdateCoordinator, config_entry: ConfigEntry
@@ -391,3 +445,325 @@ class CostPreviousMonthSensor(ConsumersEnergySensorBase):
     def native_value(self) -> float | None:
         """Return the state of the sensor."""
         return self.coordinator.data.get("cost_previous_month")
+
+
+class Energy60MinutesSensor(ConsumersEnergySensorBase):
+    """Sensor for energy consumed in the last 60 minutes, as a sliding window."""
+
+    def __init__(
+        self, coordinator: EnergyDataUpdateCoordinator, config_entry: ConfigEntry
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry, SENSOR_ENERGY_60M, "Energy Last 60 Minutes")
+        self._attr_device_class = SensorDeviceClass.ENERGY
+        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self.coordinator.data.get("energy_60m")
+
+
+class Cost60MinutesSensor(ConsumersEnergySensorBase):
+    """Sensor for cost in the last 60 minutes, as a sliding window."""
+
+    def __init__(
+        self, coordinator: EnergyDataUpdateCoordinator, config_entry: ConfigEntry
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry, SENSOR_COST_60M, "Cost Last 60 Minutes")
+        self._attr_device_class = SensorDeviceClass.MONETARY
+        self._attr_native_unit_of_measurement = "USD"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self.coordinator.data.get("cost_60m")
+
+
+class Energy24HoursSensor(ConsumersEnergySensorBase):
+    """Sensor for energy consumed in the last 24 hours, as a sliding window."""
+
+    def __init__(
+        self, coordinator: EnergyDataUpdateCoordinator, config_entry: ConfigEntry
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry, SENSOR_ENERGY_24H, "Energy Last 24 Hours")
+        self._attr_device_class = SensorDeviceClass.ENERGY
+        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self.coordinator.data.get("energy_24h")
+
+
+class Cost24HoursSensor(ConsumersEnergySensorBase):
+    """Sensor for cost in the last 24 hours, as a sliding window."""
+
+    def __init__(
+        self, coordinator: EnergyDataUpdateCoordinator, config_entry: ConfigEntry
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry, SENSOR_COST_24H, "Cost Last 24 Hours")
+        self._attr_device_class = SensorDeviceClass.MONETARY
+        self._attr_native_unit_of_measurement = "USD"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self.coordinator.data.get("cost_24h")
+
+
+class Energy7DaysSensor(ConsumersEnergySensorBase):
+    """Sensor for energy consumed in the last 7 days, as a sliding window."""
+
+    def __init__(
+        self, coordinator: EnergyDataUpdateCoordinator, config_entry: ConfigEntry
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry, SENSOR_ENERGY_7D, "Energy Last 7 Days")
+        self._attr_device_class = SensorDeviceClass.ENERGY
+        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self.coordinator.data.get("energy_7d")
+
+
+class Cost7DaysSensor(ConsumersEnergySensorBase):
+    """Sensor for cost in the last 7 days, as a sliding window."""
+
+    def __init__(
+        self, coordinator: EnergyDataUpdateCoordinator, config_entry: ConfigEntry
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry, SENSOR_COST_7D, "Cost Last 7 Days")
+        self._attr_device_class = SensorDeviceClass.MONETARY
+        self._attr_native_unit_of_measurement = "USD"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self.coordinator.data.get("cost_7d")
+
+
+class SourceSensorBase(ConsumersEnergySensorBase):
+    """Base class for one power or energy sensor's share of the totals.
+
+    The state is this month's share; the other periods are attributes.
+    Values are read from the coordinator's source ledger when the entity is
+    written, so the ledger itself does no per-entity work on updates.
+    """
+
+    _quantity = "energy"
+
+    def __init__(
+        self,
+        coordinator: EnergyDataUpdateCoordinator,
+        config_entry: ConfigEntry,
+        entity_id: str,
+        source_name: str,
+        sensor_type: str,
+        name: str,
+    ) -> None:
+        """Initialize the sensor.
+
+        Args:
+            coordinator: Data update coordinator
+            config_entry: Config entry
+            entity_id: Power sensor entity ID
+            source_name: Power sensor name
+            sensor_type: Sensor type identifier
+            name: Sensor name, after the power sensor name
+        """
+        super().__init__(
+            coordinator, config_entry, f"{sensor_type}_{entity_id}", f"{source_name} {name}"
+        )
+        self._source = entity_id
+        self._index = coordinator.sources.index(entity_id)
+
+    def _value(self, period: str) -> float:
+        """Get the source's energy or cost in a period."""
+        energy, cost = self.coordinator.sources.totals(self._index, period)
+        return energy if self._quantity == "energy" else cost
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self._value("monthly")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the source and its share of the other periods."""
+        sources = self.coordinator.sources
+        previous_month = (
+            sources.previous_month_energy
+            if self._quantity == "energy"
+            else sources.previous_month_cost
+        )
+        return {
+            "source_sensor": self._source,
+            f"{self._quantity}_hour": self._value("hourly"),
+            f"{self._quantity}_today": self._value("daily"),
+            f"{self._quantity}_week": self._value("weekly"),
+            f"{self._quantity}_year": self._value("yearly"),
+            f"{self._quantity}_previous_month": previous_month[self._index],
+            "last_update": self.coordinator.data.get("last_update"),
+        }
+
+
+class SourceEnergySensor(SourceSensorBase):
+    """Sensor for one power sensor's energy this month."""
+
+    def __init__(
+        self,
+        coordinator: EnergyDataUpdateCoordinator,
+        config_entry: ConfigEntry,
+        entity_id: str,
+        source_name: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            coordinator, config_entry, entity_id, source_name, SENSOR_SOURCE_ENERGY, "Energy Month"
+        )
+        self._attr_device_class = SensorDeviceClass.ENERGY
+        self._attr_state_class = SensorStateClass.TOTAL
+        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+
+
+class SourceCostSensor(SourceSensorBase):
+    """Sensor for one power sensor's cost this month."""
+
+    _quantity = "cost"
+
+    def __init__(
+        self,
+        coordinator: EnergyDataUpdateCoordinator,
+        config_entry: ConfigEntry,
+        entity_id: str,
+        source_name: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            coordinator, config_entry, entity_id, source_name, SENSOR_SOURCE_COST, "Cost Month"
+        )
+        self._attr_device_class = SensorDeviceClass.MONETARY
+        self._attr_state_class = SensorStateClass.TOTAL
+        self._attr_native_unit_of_measurement = "USD"
+
+
+class PlanSensorBase(ConsumersEnergySensorBase):
+    """Base class for this month's cost under one of the compared plans."""
+
+    _field = "cost_month"
+
+    def __init__(
+        self,
+        coordinator: EnergyDataUpdateCoordinator,
+        config_entry: ConfigEntry,
+        plan_id: str,
+        sensor_type: str,
+        name: str,
+    ) -> None:
+        """Initialize the sensor.
+
+        Args:
+            coordinator: Data update coordinator
+            config_entry: Config entry
+            plan_id: Compared plan ID
+            sensor_type: Sensor type identifier
+            name: Sensor name, after the plan name
+        """
+        self._plan_name = _plan_name(plan_id)
+        super().__init__(
+            coordinator, config_entry, f"{sensor_type}_{plan_id}", f"{self._plan_name} {name}"
+        )
+        self._plan_id = plan_id
+        self._attr_device_class = SensorDeviceClass.MONETARY
+        self._attr_native_unit_of_measurement = "USD"
+
+    def _plan(self) -> dict[str, Any]:
+        """Get the plan's costs from the latest data."""
+        comparison = self.coordinator.data.get("plan_comparison", {})
+        return comparison.get("plans", {}).get(self._plan_id, {})
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self._plan().get(self._field)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the plan and the month's energy."""
+        comparison = self.coordinator.data.get("plan_comparison", {})
+        return {
+            "rate_plan": self._plan_name,
+            "energy_month": comparison.get("energy_month"),
+            "cheapest": comparison.get("cheapest") == self._plan_id,
+            "last_update": self.coordinator.data.get("last_update"),
+        }
+
+
+class PlanCostSensor(PlanSensorBase):
+    """Sensor for this month's cost under one plan."""
+
+    def __init__(
+        self, coordinator: EnergyDataUpdateCoordinator, config_entry: ConfigEntry, plan_id: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry, plan_id, SENSOR_PLAN_COST, "Cost Month")
+        self._attr_state_class = SensorStateClass.TOTAL
+
+
+class PlanProjectedCostSensor(PlanSensorBase):
+    """Sensor for this month's projected cost under one plan."""
+
+    _field = "projected_cost_month"
+
+    def __init__(
+        self, coordinator: EnergyDataUpdateCoordinator, config_entry: ConfigEntry, plan_id: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            coordinator, config_entry, plan_id, SENSOR_PLAN_PROJECTED_COST, "Projected Cost Month"
+        )
+
+
+class CheapestPlanSensor(ConsumersEnergySensorBase):
+    """Sensor for the plan this month's consumption would cost least under."""
+
+    def __init__(
+        self, coordinator: EnergyDataUpdateCoordinator, config_entry: ConfigEntry
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry, SENSOR_CHEAPEST_PLAN, "Cheapest Plan")
+        self._attr_icon = "mdi:scale-balance"
+
+    @property
+    def native_value(self) -> str | None:
+        """Return the state of the sensor."""
+        cheapest = self.coordinator.data.get("plan_comparison", {}).get("cheapest")
+        return _plan_name(cheapest) if cheapest is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return every plan's cost and the saving over the current plan."""
+        comparison = self.coordinator.data.get("plan_comparison", {})
+        plans = comparison.get("plans", {})
+        cheapest = plans.get(comparison.get("cheapest"), {})
+        cost_month = self.coordinator.data.get("cost_month")
+
+        savings = None
+        if cheapest and cost_month is not None:
+            savings = max(cost_month - cheapest["cost_month"], 0.0)
+
+        return {
+            "cost_month": {_plan_name(plan_id): plan["cost_month"] for plan_id, plan in plans.items()},
+            "projected_cost_month": {
+                _plan_name(plan_id): plan["projected_cost_month"] for plan_id, plan in plans.items()
+            },
+            "savings_month": savings,
+            "last_update": self.coordinator.data.get("last_update"),
+        }
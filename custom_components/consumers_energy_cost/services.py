@@ -0,0 +1,125 @@
+"""Services for Consumers Energy Cost Tracker."""
+from __future__ import annotations
+
+from datetime import datetime
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_END,
+    ATTR_ENTRY_ID,
+    ATTR_RATE_PLAN,
+    ATTR_RESOLUTION,
+    ATTR_START,
+    DOMAIN,
+    RATE_PLAN_TEMPLATES,
+    SERVICE_GET_HISTORY,
+    SERVICE_RECALCULATE,
+)
+from .coordinator import EnergyDataUpdateCoordinator
+from .rollup import RESOLUTIONS
+
+RECALCULATE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_RATE_PLAN): vol.In(list(RATE_PLAN_TEMPLATES)),
+    }
+)
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_RESOLUTION, default="day"): vol.In(RESOLUTIONS),
+    }
+)
+
+
+def _as_local(value: datetime) -> datetime:
+    """Interpret a service datetime, naive ones in local time.
+
+    Args:
+        value: Datetime from the service call
+
+    Returns:
+        Aware local datetime
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return dt_util.as_local(value)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services.
+
+    Args:
+        hass: Home Assistant instance
+    """
+    if hass.services.has_service(DOMAIN, SERVICE_RECALCULATE):
+        return
+
+    def get_coordinator(call: ServiceCall) -> EnergyDataUpdateCoordinator:
+        """Get the coordinator of the entry a call targets."""
+        coordinator = hass.data.get(DOMAIN, {}).get(call.data[ATTR_ENTRY_ID])
+        if coordinator is None:
+            raise ServiceValidationError(
+                f"No loaded {DOMAIN} entry with ID {call.data[ATTR_ENTRY_ID]}"
+            )
+        return coordinator
+
+    async def async_recalculate(call: ServiceCall) -> None:
+        """Rebuild an entry's accumulators from recorder history."""
+        coordinator = get_coordinator(call)
+        if "recorder" not in hass.config.components:
+            raise ServiceValidationError("The recorder integration is required")
+
+        now = coordinator.clock.now()
+        start = _as_local(call.data[ATTR_START])
+        end = _as_local(call.data[ATTR_END]) if ATTR_END in call.data else now
+        if not start < end <= now:
+            raise ServiceValidationError("Start must be before end, and end not in the future")
+
+        rate_config = None
+        if ATTR_RATE_PLAN in call.data:
+            rate_config = RATE_PLAN_TEMPLATES[call.data[ATTR_RATE_PLAN]]["config"]
+
+        await coordinator.async_recalculate(start, end, rate_config)
+
+    async def async_get_history(call: ServiceCall) -> ServiceResponse:
+        """Get an entry's energy and cost history from its rollups."""
+        coordinator = get_coordinator(call)
+        start = _as_local(call.data[ATTR_START])
+        end = _as_local(call.data[ATTR_END]) if ATTR_END in call.data else coordinator.clock.now()
+        resolution = call.data[ATTR_RESOLUTION]
+
+        buckets = coordinator.rollups.query(start.timestamp(), end.timestamp(), resolution)
+        return {
+            "resolution": resolution,
+            "buckets": [
+                {
+                    "start": dt_util.as_local(dt_util.utc_from_timestamp(bucket_start)).isoformat(),
+                    "energy": energy,
+                    "cost": cost,
+                }
+                for bucket_start, energy, cost in buckets
+            ],
+        }
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_RECALCULATE, async_recalculate, schema=RECALCULATE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
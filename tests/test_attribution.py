@@ -0,0 +1,113 @@
+"""Tests for per-source attribution."""
+import os
+import unittest
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from custom_components.consumers_energy_cost.attribution import SourceLedger
+
+# One watt for an hour, priced at $0.20/kWh
+HOUR = (0.001, 0.0002)
+
+
+def _update(ledger, powers, segments=1):
+    """Set source powers and integrate a number of one-hour segments."""
+    for index, power in enumerate(powers):
+        ledger.set_power(index, power)
+    for _ in range(segments):
+        ledger.advance(*HOUR)
+    ledger.end_update()
+
+
+class TestSourceLedger(unittest.TestCase):
+    """Test the SourceLedger class."""
+
+    def setUp(self):
+        """Set up a ledger of three sources."""
+        self.ledger = SourceLedger(["sensor.dryer", "sensor.fridge", "sensor.tv"])
+
+    def test_steady_power(self):
+        """Test steady sources are charged without being settled."""
+        _update(self.ledger, [1000.0, 100.0, 0.0], segments=0)
+        _update(self.ledger, [1000.0, 100.0, 0.0], segments=2)
+
+        energy, cost = self.ledger.totals(0, "daily")
+        self.assertAlmostEqual(energy, 2.0)
+        self.assertAlmostEqual(cost, 0.4)
+        self.assertAlmostEqual(self.ledger.totals(1, "daily")[0], 0.2)
+        self.assertEqual(self.ledger.totals(2, "daily"), (0.0, 0.0))
+        # Nothing changed, so nothing was settled
+        self.assertEqual(list(self.ledger.energy), [0.0, 0.0, 0.0])
+
+    def test_ramp_matches_trapezoid(self):
+        """Test a changed source is integrated like the total."""
+        _update(self.ledger, [0.0, 100.0, 0.0], segments=0)
+        # Total ramps from 100 W to 1100 W: 0.6 kWh over the hour
+        _update(self.ledger, [1000.0, 100.0, 0.0])
+
+        dryer = self.ledger.totals(0, "daily")[0]
+        fridge = self.ledger.totals(1, "daily")[0]
+        self.assertAlmostEqual(dryer, 0.5)
+        self.assertAlmostEqual(fridge, 0.1)
+        self.assertAlmostEqual(dryer + fridge, (100.0 + 1100.0) / 2 * 0.001)
+
+    def test_ramp_weight(self):
+        """Test a Riemann rule charges none or all of a change."""
+        _update(self.ledger, [0.0, 0.0, 0.0], segments=0)
+        for index, power in enumerate([1000.0, 0.0, 0.0]):
+            self.ledger.set_power(index, power)
+        self.ledger.advance(*HOUR)
+        self.ledger.end_update(0.0)
+        self.assertAlmostEqual(self.ledger.totals(0, "daily")[0], 0.0)
+
+        self.ledger.set_power(0, 2000.0)
+        self.ledger.advance(*HOUR)
+        self.ledger.end_update(1.0)
+        self.assertAlmostEqual(self.ledger.totals(0, "daily")[0], 2.0)
+
+    def test_only_changes_are_pending(self):
+        """Test an update only queues the sources whose power changed."""
+        _update(self.ledger, [1000.0, 100.0, 0.0], segments=0)
+        for index, power in enumerate([1000.0, 150.0, 0.0]):
+            self.ledger.set_power(index, power)
+
+        self.assertEqual(self.ledger._pending, {1: 150.0})
+
+    def test_rollover(self):
+        """Test periods restart and the month that ended is kept."""
+        _update(self.ledger, [1000.0, 0.0, 0.0], segments=0)
+        _update(self.ledger, [1000.0, 0.0, 0.0])
+
+        self.ledger.rollover("daily")
+        self.ledger.rollover("monthly")
+        _update(self.ledger, [1000.0, 0.0, 0.0])
+
+        self.assertAlmostEqual(self.ledger.totals(0, "daily")[0], 1.0)
+        self.assertAlmostEqual(self.ledger.totals(0, "monthly")[0], 1.0)
+        self.assertAlmostEqual(self.ledger.totals(0, "yearly")[0], 2.0)
+        self.assertAlmostEqual(self.ledger.previous_month_energy[0], 1.0)
+
+        # Skipped months leave the previous month empty
+        self.ledger.rollover("monthly", keep_previous=False)
+        self.assertEqual(self.ledger.previous_month_energy[0], 0.0)
+
+    def test_serialize(self):
+        """Test period totals survive a restart, matched by entity ID."""
+        _update(self.ledger, [1000.0, 100.0, 0.0], segments=0)
+        _update(self.ledger, [1000.0, 100.0, 0.0])
+        self.ledger.rollover("hourly")
+
+        restored = SourceLedger(["sensor.fridge", "sensor.dryer", "sensor.new"])
+        restored.from_dict(self.ledger.to_dict())
+
+        self.assertEqual(restored.totals(1, "hourly"), (0.0, 0.0))
+        energy, cost = restored.totals(1, "daily")
+        self.assertAlmostEqual(energy, 1.0)
+        self.assertAlmostEqual(cost, 0.2)
+        self.assertAlmostEqual(restored.totals(0, "daily")[0], 0.1)
+        self.assertEqual(restored.totals(2, "daily"), (0.0, 0.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+"""Tests for recorder history backfill."""
+import os
+import unittest
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from custom_components.consumers_energy_cost.backfill import integrate_steps, meter_steps, power_steps
+from custom_components.consumers_energy_cost.const import RATE_PLAN_TEMPLATES, RATE_PLAN_SUMMER_TOU
+from custom_components.consumers_energy_cost.rate_calculator import RateCalculator
+
+TZ = ZoneInfo("America/Detroit")
+
+
+def _ts(hour, minute=0):
+    """Epoch seconds on Tuesday July 15, 2025 in Detroit."""
+    return datetime(2025, 7, 15, hour, minute, tzinfo=TZ).timestamp()
+
+
+class TestPowerSteps(unittest.TestCase):
+    """Test merging recorded states into total power steps."""
+
+    def test_merge_sensors(self):
+        """Test states of several sensors are summed in time order."""
+        history = {
+            "sensor.a": [{"s": "100", "lu": _ts(12)}, {"s": "300", "lu": _ts(13, 30)}],
+            "sensor.b": [{"s": "50", "lu": _ts(13)}, {"s": "unavailable", "lu": _ts(14)}],
+        }
+        last_values = {}
+
+        steps = power_steps(history, last_values, _ts(13))
+
+        # The state before the chunk start is moved to it and merged with
+        # the other sensor's state at the same time
+        self.assertEqual(steps, [(_ts(13), 150.0), (_ts(13, 30), 350.0), (_ts(14), 300.0)])
+        self.assertEqual(last_values, {"sensor.a": 300.0, "sensor.b": None})
+
+    def test_carry_between_chunks(self):
+        """Test the values at the end of one chunk start the next."""
+        last_values = {"sensor.a": 300.0, "sensor.b": None}
+
+        steps = power_steps({"sensor.b": [{"s": "25", "lu": _ts(15)}]}, last_values, _ts(14))
+
+        self.assertEqual(steps, [(_ts(14), 300.0), (_ts(15), 325.0)])
+
+    def test_all_unavailable(self):
+        """Test no available sensor gives no power."""
+        steps = power_steps({"sensor.a": [{"s": "unknown", "lu": _ts(13)}]}, {}, _ts(13))
+
+        self.assertEqual(steps, [(_ts(13), None)])
+
+
+class TestMeterSteps(unittest.TestCase):
+    """Test turning energy meter readings into power steps."""
+
+    def test_spread_between_readings(self):
+        """Test energy between readings becomes their average power."""
+        history = {
+            "sensor.a": [{"s": "1000", "lu": _ts(12)}, {"s": "3000", "lu": _ts(14)}],
+            "sensor.b": [{"s": "5", "lu": _ts(13)}, {"s": "unknown", "lu": _ts(13, 30)}, {"s": "6", "lu": _ts(14)}],
+        }
+        last_readings = {}
+
+        steps = meter_steps(history, {"sensor.a": 0.001}, last_readings, _ts(12))
+
+        # 2 kWh over two hours, then 1 kWh over one hour
+        self.assertEqual(steps, [(_ts(12), 1000.0), (_ts(13), 2000.0), (_ts(14), 0.0)])
+        self.assertEqual(last_readings, {"sensor.a": (_ts(14), 3.0), "sensor.b": (_ts(14), 6.0)})
+
+    def test_carry_between_chunks(self):
+        """Test a reading from an earlier chunk is spread from the chunk start."""
+        last_readings = {"sensor.a": (_ts(12), 1.0)}
+
+        steps = meter_steps({"sensor.a": [{"s": "2", "lu": _ts(14)}]}, {}, last_readings, _ts(13))
+
+        self.assertEqual(steps, [(_ts(13), 1000.0), (_ts(14), 0.0)])
+
+    def test_reset_and_dip(self):
+        """Test a reset counts from zero and a small dip is ignored."""
+        history = {
+            "sensor.a": [
+                {"s": "100", "lu": _ts(12)},
+                {"s": "99", "lu": _ts(13)},
+                {"s": "1", "lu": _ts(14)},
+            ],
+        }
+
+        steps = meter_steps(history, {}, {}, _ts(12))
+
+        self.assertEqual(steps, [(_ts(12), 500.0), (_ts(14), 0.0)])
+
+
+class TestIntegrateSteps(unittest.TestCase):
+    """Test pricing total power steps."""
+
+    def setUp(self):
+        """Set up a Summer TOU calculator (on-peak 14:00-19:00 weekdays)."""
+        self.calculator = RateCalculator(RATE_PLAN_TEMPLATES[RATE_PLAN_SUMMER_TOU]["config"])
+
+    def test_split_at_rate_change(self):
+        """Test each value is held and billed at the rate in effect."""
+        steps = [(_ts(13), 1000.0), (_ts(14, 30), 2000.0)]
+
+        records = integrate_steps(self.calculator, steps, _ts(15), [], TZ)
+
+        self.assertEqual(len(records), 1)
+        end, energy, cost, power = records[0]
+        self.assertEqual(end, _ts(15))
+        self.assertAlmostEqual(energy, 2.5)
+        self.assertAlmostEqual(cost, 1.0 * 0.178 + 1.5 * 0.23)
+        self.assertEqual(power, 2000.0)
+
+    def test_bins_at_cuts(self):
+        """Test energy is binned between period rollovers."""
+        steps = [(_ts(13), 1000.0), (_ts(14, 30), 2000.0)]
+
+        records = integrate_steps(self.calculator, steps, _ts(15), [_ts(14), _ts(16)], TZ)
+
+        self.assertEqual([record[0] for record in records], [_ts(14), _ts(15)])
+        self.assertAlmostEqual(records[0][1], 1.0)
+        self.assertAlmostEqual(records[0][2], 0.178)
+        self.assertAlmostEqual(records[1][1], 1.5)
+        self.assertAlmostEqual(records[1][2], 1.5 * 0.23)
+
+    def test_unavailable_power_skipped(self):
+        """Test time without available power adds nothing."""
+        steps = [(_ts(12), None), (_ts(13), 1000.0), (_ts(13, 30), None)]
+
+        records = integrate_steps(self.calculator, steps, _ts(15), [_ts(13), _ts(14)], TZ)
+
+        # Only the 13:00-14:00 bin had power, and only for half an hour
+        self.assertEqual(len(records), 1)
+        end, energy, cost, power = records[0]
+        self.assertEqual(end, _ts(14))
+        self.assertAlmostEqual(energy, 0.5)
+        self.assertAlmostEqual(cost, 0.5 * 0.178)
+        self.assertIsNone(power)
+
+    def test_empty(self):
+        """Test no steps give no records."""
+        self.assertEqual(integrate_steps(self.calculator, [], _ts(15), [], TZ), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
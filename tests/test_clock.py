@@ -0,0 +1,346 @@
+"""Tests for the clock sources."""
+from datetime import datetime
+import os
+import tempfile
+import unittest
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.consumers_energy_cost import coordinator as coordinator_module
+from custom_components.consumers_energy_cost.clock import VirtualClock, elapsed_end
+from custom_components.consumers_energy_cost.const import RATE_PLAN_TEMPLATES
+from custom_components.consumers_energy_cost.coordinator import EnergyDataUpdateCoordinator
+from custom_components.consumers_energy_cost.fixed_point import ENERGY_SCALE
+
+TZ = ZoneInfo("America/Detroit")
+
+
+class TestVirtualClock(unittest.TestCase):
+    """Test the VirtualClock class."""
+
+    def setUp(self):
+        """Use Detroit local time."""
+        self._default_time_zone = dt_util.DEFAULT_TIME_ZONE
+        dt_util.set_default_time_zone(TZ)
+
+    def tearDown(self):
+        """Restore the default time zone."""
+        dt_util.set_default_time_zone(self._default_time_zone)
+
+    def test_advance_across_dst(self):
+        """Test advancing an hour over the spring change skips 2 AM."""
+        clock = VirtualClock(datetime(2025, 3, 9, 1, 30, tzinfo=TZ))
+        clock.advance(3600)
+
+        self.assertEqual(clock.now(), datetime(2025, 3, 9, 3, 30, tzinfo=TZ))
+        self.assertEqual(clock.now().utcoffset().total_seconds(), -4 * 3600)
+        self.assertEqual(clock.monotonic(), 3600)
+
+    def test_step(self):
+        """Test stepping moves the wall clock alone."""
+        clock = VirtualClock(datetime(2025, 7, 15, 12, 0, tzinfo=TZ))
+        clock.step(-600)
+
+        self.assertEqual(clock.now(), datetime(2025, 7, 15, 11, 50, tzinfo=TZ))
+        self.assertEqual(clock.monotonic(), 0)
+
+
+class TestElapsedEnd(unittest.TestCase):
+    """Test measuring intervals on the monotonic clock."""
+
+    def test_clocks_agree(self):
+        """Test the wall-clock time is used when both clocks agree."""
+        previous = datetime(2025, 3, 9, 1, 59, 30, tzinfo=TZ)
+        now = datetime(2025, 3, 9, 3, 0, 0, tzinfo=TZ)
+
+        self.assertEqual(elapsed_end(previous, 100.0, now, 130.5), now)
+
+    def test_clock_stepped(self):
+        """Test a stepped wall clock is replaced by the elapsed time."""
+        previous = datetime(2025, 7, 15, 12, 0, tzinfo=TZ)
+
+        forward = elapsed_end(previous, 0.0, datetime(2025, 7, 15, 13, 0, 30, tzinfo=TZ), 30.0)
+        back = elapsed_end(previous, 0.0, datetime(2025, 7, 15, 11, 59, 0, tzinfo=TZ), 30.0)
+
+        self.assertEqual(forward, datetime(2025, 7, 15, 12, 0, 30, tzinfo=TZ))
+        self.assertEqual(back, forward)
+
+
+class TestCoordinatorClock(unittest.IsolatedAsyncioTestCase):
+    """Test driving the coordinator from a virtual clock."""
+
+    async def asyncSetUp(self):
+        """Create a coordinator on a virtual clock at 1 kW."""
+        self.hass = HomeAssistant(tempfile.mkdtemp())
+        self._default_time_zone = dt_util.DEFAULT_TIME_ZONE
+        self.hass.config.set_time_zone("America/Detroit")
+        self.hass.states.async_set("sensor.heater", "1000")
+
+        self.clock = VirtualClock(datetime(2025, 1, 31, 23, 0, tzinfo=TZ))
+        self.coordinator = EnergyDataUpdateCoordinator(
+            self.hass,
+            ["sensor.heater"],
+            RATE_PLAN_TEMPLATES["summer_tou_1001"]["config"],
+            "clock_test",
+            clock=self.clock,
+        )
+        self.coordinator._state_restored = True
+
+    async def asyncTearDown(self):
+        """Stop Home Assistant."""
+        await self.coordinator.async_shutdown()
+        await self.hass.async_stop(force=True)
+        dt_util.set_default_time_zone(self._default_time_zone)
+
+    async def test_month_rollover(self):
+        """Test polled updates roll the month over at virtual midnight."""
+        await self.coordinator._async_update_data()
+        for _ in range(120):
+            self.clock.advance(60)
+            data = await self.coordinator._async_update_data()
+
+        # The update ending at midnight belongs to January
+        self.assertAlmostEqual(data["energy_previous_month"], 1.0)
+        self.assertAlmostEqual(data["energy_month"], 1.0)
+        self.assertEqual(data["last_update"], "2025-02-01T01:00:00-05:00")
+
+    async def test_segment_split_at_rollover(self):
+        """Test a ramp across midnight is split between the months."""
+        await self.coordinator._async_update_data()
+        self.clock.advance(59 * 60)
+        await self.coordinator._async_update_data()
+
+        # 1 kW to 3 kW over the two minutes around midnight
+        self.hass.states.async_set("sensor.heater", "3000")
+        self.clock.advance(120)
+        data = await self.coordinator._async_update_data()
+
+        # January gets the ramp to 2 kW, February the rest
+        january = (59 + 1.5) / 60
+        self.assertAlmostEqual(data["energy_previous_month"], january, places=5)
+        self.assertAlmostEqual(data["cost_previous_month"], january * 0.164, places=5)
+        self.assertAlmostEqual(data["energy_month"], 2.5 / 60, places=5)
+        self.assertAlmostEqual(data["energy_today"], 2.5 / 60, places=5)
+        self.assertAlmostEqual(data["energy_year"], january + 2.5 / 60, places=5)
+        self.assertAlmostEqual(data["cost_month"], 2.5 / 60 * 0.164, places=5)
+
+    async def test_save_coalescing(self):
+        """Test updates share one delayed save until a rollover flushes it."""
+        await self.coordinator._async_update_data()
+        for _ in range(30):
+            self.clock.advance(60)
+            await self.coordinator._async_update_data()
+        await self.hass.async_block_till_done()
+
+        # One delayed save is pending and nothing has been written
+        self.assertTrue(self.coordinator._dirty)
+        self.assertTrue(self.coordinator._save_scheduled)
+        self.assertEqual(self.coordinator._save_count, 0)
+
+        # The month rolling over is written right away, in place of the
+        # pending save
+        for _ in range(30):
+            self.clock.advance(60)
+            await self.coordinator._async_update_data()
+        await self.hass.async_block_till_done()
+
+        self.assertEqual(self.coordinator._save_count, 1)
+        self.assertFalse(self.coordinator._dirty)
+        self.assertFalse(self.coordinator._save_scheduled)
+        saved = await self.coordinator._store.async_load()
+        self.assertEqual(saved["monthly_start"], "2025-02-01T00:00:00-05:00")
+        self.assertEqual(saved["previous_month_energy"], 1_000_000)
+
+        # The next update schedules a new delayed save
+        self.clock.advance(60)
+        await self.coordinator._async_update_data()
+        self.assertTrue(self.coordinator._save_scheduled)
+        self.assertEqual(self.coordinator._save_count, 1)
+
+    async def test_rebuild_keeps_live_totals(self):
+        """Test a rebuild only replaces periods the history fully covers."""
+        await self.coordinator._async_update_data()
+        for _ in range(120):
+            self.clock.advance(60)
+            await self.coordinator._async_update_data()
+
+        # History for February so far says 3 kW, not the 1 kW seen live
+        start = datetime(2025, 2, 1, 0, 0, tzinfo=TZ)
+        records = [
+            (start.timestamp() + minute * 60, 3 / 60, 3 / 60 * 0.164, 3000.0)
+            for minute in range(1, 61)
+        ]
+        self.coordinator._rebuild(start, self.clock.now(), records, 3000.0)
+
+        def energy(prefix):
+            return getattr(self.coordinator, f"_{prefix}_energy") / ENERGY_SCALE
+
+        # The day and month start with the history and are rebuilt
+        self.assertAlmostEqual(energy("daily"), 3.0, places=5)
+        self.assertAlmostEqual(energy("monthly"), 3.0, places=5)
+        self.assertEqual(energy("hourly"), 0)
+
+        # The week, year and January began before it and stay live
+        self.assertAlmostEqual(energy("weekly"), 2.0, places=5)
+        self.assertAlmostEqual(energy("yearly"), 2.0, places=5)
+        self.assertAlmostEqual(energy("previous_month"), 1.0, places=5)
+
+        # Live updates carry on from the end of the history
+        self.assertEqual(self.coordinator._previous_timestamp, self.clock.now())
+        self.assertEqual(self.coordinator._previous_power, 3000.0)
+
+    async def test_history_binned_by_minute(self):
+        """Test rebuilt history lands in the minutes it was used in."""
+        await self.coordinator._async_update_data()
+
+        # 1 kW for the last hour, then 2 kW from half a minute past 22:30
+        start = datetime(2025, 1, 31, 22, 0, tzinfo=TZ)
+        states = {
+            "sensor.heater": [
+                {"s": "1000", "lu": start.timestamp()},
+                {"s": "2000", "lu": start.timestamp() + 30.5 * 60},
+            ]
+        }
+        with mock.patch.object(
+            coordinator_module, "get_instance", return_value=self.hass
+        ), mock.patch.object(
+            coordinator_module.history, "get_significant_states", return_value=states
+        ):
+            records, _ = await self.coordinator._async_history_chunk(
+                self.coordinator.rate_calculator,
+                start.timestamp(),
+                self.clock.now().timestamp(),
+                {},
+            )
+        self.assertEqual(
+            [record[0] - start.timestamp() for record in records], list(range(60, 3601, 60))
+        )
+        self.coordinator._rebuild(start, self.clock.now(), records, 2000.0)
+
+        # Half an hour on, the hour window only holds the last half hour
+        rollups = self.coordinator.rollups
+        now = self.clock.now().timestamp()
+        self.assertAlmostEqual(rollups.window_totals(now)["60m"][0], 89.5 / 60, places=5)
+        self.assertAlmostEqual(
+            rollups.window_totals(now + 1800)["60m"][0], (0.5 + 29.5 * 2) / 60, places=5
+        )
+
+    async def test_recalculate_during_updates(self):
+        """Test updates while history is read aren't counted twice."""
+        await self.coordinator._async_update_data()
+        for _ in range(120):
+            self.clock.advance(60)
+            await self.coordinator._async_update_data()
+
+        async def history_chunk(calculator, start_ts, end_ts, last_values, last_readings):
+            # Ten minutes of polls go by while the recorder is queried
+            for _ in range(10):
+                self.clock.advance(60)
+                await self.coordinator._async_update_data()
+            last_values["sensor.heater"] = 1000.0
+            records = [
+                (minute, 1 / 60, 0.164 / 60, 1000.0)
+                for minute in range(int(start_ts) + 60, int(end_ts) + 1, 60)
+            ]
+            return records, [(start_ts, 1000.0)]
+
+        start = datetime(2025, 2, 1, 0, 0, tzinfo=TZ)
+        with mock.patch.object(self.coordinator, "_async_history_chunk", history_chunk):
+            await self.coordinator.async_recalculate(start, self.clock.now())
+        self.clock.advance(60)
+        await self.coordinator._async_update_data()
+
+        def energy(prefix):
+            return getattr(self.coordinator, f"_{prefix}_energy") / ENERGY_SCALE
+
+        # An hour of history, then the 11 minutes since it was read. The
+        # week keeps its live total, which held off during the recalculation.
+        self.assertAlmostEqual(energy("daily"), 71 / 60, places=5)
+        self.assertAlmostEqual(energy("weekly"), 131 / 60, places=5)
+        self.assertEqual(self.coordinator._previous_timestamp, self.clock.now())
+
+    async def test_clock_step_not_integrated(self):
+        """Test an NTP step forward adds only the time that passed."""
+        await self.coordinator._async_update_data()
+        self.clock.advance(30)
+        self.clock.step(3600)
+        await self.coordinator._async_update_data()
+        self.clock.advance(30)
+        data = await self.coordinator._async_update_data()
+
+        # A minute at 1 kW, though the wall clock moved an hour and a minute.
+        # The half minute after the step is in the new day.
+        self.assertAlmostEqual(data["energy_year"], 1 / 60, places=5)
+        self.assertAlmostEqual(data["energy_today"], 1 / 120, places=5)
+        self.assertEqual(data["last_update"], "2025-02-01T00:01:00-05:00")
+
+
+class TestCoordinatorTimers(unittest.IsolatedAsyncioTestCase):
+    """Test the coordinator's timers run on its clock."""
+
+    async def asyncSetUp(self):
+        """Create a coordinator ten minutes before a summer peak."""
+        self.hass = HomeAssistant(tempfile.mkdtemp())
+        self._default_time_zone = dt_util.DEFAULT_TIME_ZONE
+        self.hass.config.set_time_zone("America/Detroit")
+        self.hass.states.async_set("sensor.heater", "1000")
+
+        self.clock = VirtualClock(datetime(2025, 7, 15, 13, 50, tzinfo=TZ))
+        self.coordinator = EnergyDataUpdateCoordinator(
+            self.hass,
+            ["sensor.heater"],
+            RATE_PLAN_TEMPLATES["summer_tou_1001"]["config"],
+            "timer_test",
+            clock=self.clock,
+        )
+        self.coordinator._state_restored = True
+
+    async def asyncTearDown(self):
+        """Stop Home Assistant."""
+        await self.coordinator.async_shutdown()
+        await self.hass.async_stop(force=True)
+        dt_util.set_default_time_zone(self._default_time_zone)
+
+    async def test_rate_change(self):
+        """Test the refresh at a rate change waits for the virtual clock."""
+        await self.coordinator.async_refresh()
+        await self.hass.async_block_till_done()
+
+        # The virtual clock is behind the real one, so the change is past
+        # in real time but must not run until the virtual clock gets there
+        self.clock.advance(599)
+        await self.hass.async_block_till_done()
+        self.assertEqual(self.coordinator.data["last_update"], "2025-07-15T13:50:00-04:00")
+        self.assertEqual(self.coordinator.data["current_rate"], 0.178)
+
+        self.clock.advance(1)
+        await self.hass.async_block_till_done()
+        data = self.coordinator.data
+        self.assertEqual(data["last_update"], "2025-07-15T14:00:00-04:00")
+        self.assertEqual(data["current_rate"], 0.23)
+        self.assertAlmostEqual(data["energy_today"], 1 / 6, places=5)
+        self.assertAlmostEqual(data["cost_today"], 0.178 / 6, places=5)
+        self.assertEqual(
+            self.coordinator._rate_change_time, datetime(2025, 7, 15, 19, 0, tzinfo=TZ)
+        )
+
+    async def test_cancel(self):
+        """Test a cancelled virtual timer never runs."""
+        calls = []
+        cancel = self.clock.call_later(self.hass, 10, calls.append)
+        self.clock.call_at(self.hass, datetime(2025, 7, 15, 13, 50, 5, tzinfo=TZ), calls.append)
+        cancel()
+        self.clock.advance(20)
+        await self.hass.async_block_till_done()
+
+        self.assertEqual(calls, [datetime(2025, 7, 15, 13, 50, 20, tzinfo=TZ)])
+
+
+if __name__ == "__main__":
+    unittest.main()
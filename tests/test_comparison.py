@@ -0,0 +1,101 @@
+"""Tests for comparing rate plans."""
+from datetime import datetime, timedelta
+import os
+import unittest
+from zoneinfo import ZoneInfo
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from custom_components.consumers_energy_cost.comparison import PlanComparison
+from custom_components.consumers_energy_cost.const import RATE_PLAN_TEMPLATES
+from custom_components.consumers_energy_cost.rate_calculator import RateCalculator
+
+TZ = ZoneInfo("America/Detroit")
+PLANS = {plan_id: template["config"] for plan_id, template in RATE_PLAN_TEMPLATES.items()}
+
+
+class TestPlanComparison(unittest.TestCase):
+    """Test the PlanComparison class."""
+
+    def test_matches_each_plan(self):
+        """Test every plan's cost matches pricing the stream under it alone."""
+        comparison = PlanComparison(PLANS, TZ)
+        calculators = {plan_id: RateCalculator(config) for plan_id, config in PLANS.items()}
+        expected = dict.fromkeys(PLANS, 0.0)
+
+        # Two days of changing power in uneven steps, across peak changes
+        start = datetime(2025, 7, 15, 0, 0, 7, tzinfo=TZ)
+        when, power = start, 400.0
+        for step in range(4000):
+            end = when + timedelta(seconds=17 + step % 41)
+            next_power = 300 + (step * 7919) % 3000
+            comparison.add(when.timestamp(), end.timestamp(), power, next_power)
+            for plan_id, calculator in calculators.items():
+                expected[plan_id] += calculator.cost_for_interval(when, end, power, next_power)[1]
+            when, power = end, next_power
+
+        for plan_id, cost in zip(comparison.plan_ids, comparison.costs):
+            self.assertAlmostEqual(cost, expected[plan_id], places=9)
+
+    def test_split_at_rate_change(self):
+        """Test an interval is billed at both rates it spans."""
+        comparison = PlanComparison(PLANS, TZ)
+        calculator = RateCalculator(PLANS["summer_tou_1001"])
+        start = datetime(2025, 7, 15, 13, 30, tzinfo=TZ)
+        end = datetime(2025, 7, 15, 14, 30, tzinfo=TZ)
+
+        comparison.add(start.timestamp(), end.timestamp(), 1000, 1000)
+
+        index = comparison.plan_ids.index("summer_tou_1001")
+        off_peak = calculator.get_rate(start)[0]
+        on_peak = calculator.get_rate(end)[0]
+        self.assertNotEqual(off_peak, on_peak)
+        self.assertAlmostEqual(comparison.costs[index], 0.5 * off_peak + 0.5 * on_peak)
+        self.assertAlmostEqual(comparison.energy, 1.0)
+
+    def test_summary_and_rollover(self):
+        """Test projection, the cheapest plan and starting a new month."""
+        comparison = PlanComparison(PLANS, TZ)
+        month_start = datetime(2025, 7, 1, tzinfo=TZ).timestamp()
+        month_end = datetime(2025, 8, 1, tzinfo=TZ).timestamp()
+        when = datetime(2025, 7, 1, 15, tzinfo=TZ).timestamp()
+        comparison.add_energy(when, 2.0)
+
+        early = comparison.summary(month_start + 60, month_start, month_end)
+        self.assertIsNone(early["plans"]["summer_tou_1001"]["projected_cost_month"])
+
+        summary = comparison.summary(month_start + 3 * 86400, month_start, month_end)
+        costs = {plan_id: plan["cost_month"] for plan_id, plan in summary["plans"].items()}
+        self.assertEqual(summary["cheapest"], min(costs, key=costs.get))
+        plan = summary["plans"]["summer_tou_1001"]
+        self.assertAlmostEqual(plan["projected_cost_month"], plan["cost_month"] * 31 / 3)
+
+        comparison.rollover()
+        self.assertEqual(comparison.energy, 0.0)
+        self.assertEqual(list(comparison.costs), [0.0] * len(PLANS))
+
+    def test_serialization(self):
+        """Test totals round trip by plan ID and new plans start empty."""
+        comparison = PlanComparison(PLANS, TZ)
+        comparison.add_energy(datetime(2025, 7, 1, 15, tzinfo=TZ).timestamp(), 2.0)
+        data = comparison.to_dict()
+
+        restored = PlanComparison({"custom": PLANS["summer_tou_1001"], **PLANS}, TZ)
+        restored.from_dict(data)
+
+        self.assertEqual(restored.energy, 2.0)
+        self.assertEqual(restored.to_dict()["costs"], {"custom": 0.0, **data["costs"]})
+
+    def test_no_plans(self):
+        """Test an empty comparison adds nothing."""
+        comparison = PlanComparison({}, TZ)
+        comparison.add(0, 60, 1000, 1000)
+
+        self.assertEqual(len(comparison), 0)
+        self.assertEqual(comparison.energy, 0.0)
+        self.assertIsNone(comparison.summary(7200, 0, 86400)["cheapest"])
+
+
+if __name__ == "__main__":
+    unittest.main()
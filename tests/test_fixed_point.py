@@ -0,0 +1,82 @@
+"""Tests for fixed-point accumulation."""
+import math
+import os
+import unittest
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from custom_components.consumers_energy_cost.fixed_point import (
+    COST_SCALE,
+    ENERGY_SCALE,
+    UnitCarry,
+    migrate_float_totals,
+    to_units,
+)
+
+
+class TestUnitCarry(unittest.TestCase):
+    """Test the UnitCarry class."""
+
+    def test_whole_units(self):
+        """Test deltas in whole units pass through unchanged."""
+        carry = UnitCarry(ENERGY_SCALE)
+        self.assertEqual(carry.units(0.25), 250_000)
+        self.assertEqual(carry.units(-0.000002), -2)
+
+    def test_fraction_carried(self):
+        """Test fractions of a unit add up instead of being rounded away."""
+        carry = UnitCarry(ENERGY_SCALE)
+        # A third of a unit at a time
+        total = sum(carry.units(1 / 3 / ENERGY_SCALE) for _ in range(3000))
+
+        self.assertEqual(total, 1000)
+        self.assertLessEqual(abs(carry.fraction), 0.5)
+
+    def test_year_at_one_hz(self):
+        """Test a year of one-second deltas stays within half a unit."""
+        # An hour of power varying between 300 W and 2.1 kW, as kWh per second
+        hour = [(300 + second * 0.5 + (second * 7919) % 50) / 3_600_000.0 for second in range(3600)]
+        exact = math.fsum(hour) * 365 * 24
+
+        carry = UnitCarry(ENERGY_SCALE)
+        units = carry.units
+        total = 0
+        for _ in range(365 * 24):
+            for delta in hour:
+                total += units(delta)
+
+        self.assertLessEqual(abs(total / ENERGY_SCALE - exact), 0.5 / ENERGY_SCALE + 1e-9)
+
+
+class TestMigration(unittest.TestCase):
+    """Test migrating saved float totals."""
+
+    def test_migrate(self):
+        """Test accumulators are converted and other fields kept."""
+        data = {
+            "daily_energy": 12.3456789,
+            "daily_cost": 1.7,
+            "previous_month_cost": None,
+            "daily_start": "2025-07-15T00:00:00-04:00",
+            "previous_power": 350.5,
+        }
+
+        migrated = migrate_float_totals(data)
+
+        self.assertEqual(migrated["daily_energy"], 12_345_679)
+        self.assertEqual(migrated["daily_cost"], 1_700_000)
+        self.assertEqual(migrated["previous_month_cost"], 0)
+        self.assertEqual(migrated["daily_start"], data["daily_start"])
+        self.assertEqual(migrated["previous_power"], 350.5)
+        # The saved state itself is left alone
+        self.assertEqual(data["daily_energy"], 12.3456789)
+
+    def test_to_units(self):
+        """Test totals round to the nearest unit."""
+        self.assertEqual(to_units(0.1 + 0.2, COST_SCALE), 300_000)
+        self.assertEqual(to_units(0.0000004, ENERGY_SCALE), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
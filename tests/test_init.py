@@ -0,0 +1,110 @@
+"""Tests for setting up, unloading and reloading a config entry."""
+import os
+import shutil
+import tempfile
+import unittest
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from homeassistant.core import HomeAssistant
+from homeassistant import bootstrap, loader
+from homeassistant.config_entries import ConfigEntries, ConfigEntry, ConfigEntryState
+from homeassistant.helpers.event import TRACK_STATE_CHANGE_CALLBACKS
+from homeassistant.util import dt as dt_util
+
+from custom_components.consumers_energy_cost import rate_calculator
+from custom_components.consumers_energy_cost.const import (
+    CONF_POWER_SENSORS,
+    CONF_RATE_CONFIG,
+    CONF_RATE_PLAN,
+    CONF_UPDATE_MODE,
+    CONF_USE_JOURNAL,
+    DOMAIN,
+    RATE_PLAN_TEMPLATES,
+    UPDATE_MODE_EVENT,
+)
+
+PLAN = "summer_tou_1001"
+PACKAGE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestEntryReload(unittest.IsolatedAsyncioTestCase):
+    """Test an entry reload leaves a single live coordinator."""
+
+    async def asyncSetUp(self):
+        """Set up Home Assistant with the integration loadable."""
+        self.config_dir = tempfile.mkdtemp()
+        os.symlink(
+            os.path.join(PACKAGE_DIR, "custom_components"),
+            os.path.join(self.config_dir, "custom_components"),
+        )
+        self._default_time_zone = dt_util.DEFAULT_TIME_ZONE
+        self.hass = HomeAssistant(self.config_dir)
+        self.hass.config.set_time_zone("America/Detroit")
+        self.hass.config.skip_pip = True
+        loader.async_setup(self.hass)
+        self.hass.config_entries = ConfigEntries(self.hass, {})
+        await bootstrap.async_load_base_functionality(self.hass)
+        await self.hass.async_start()
+        self.hass.states.async_set("sensor.heater", "1000")
+
+        # Other tests may still hold calculators for the same plan
+        self.key = rate_calculator.schedule_key(RATE_PLAN_TEMPLATES[PLAN]["config"])
+        self.users = rate_calculator._schedule_users.get(self.key, 0)
+
+        self.entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="Heater",
+            data={
+                CONF_POWER_SENSORS: ["sensor.heater"],
+                CONF_RATE_PLAN: PLAN,
+                CONF_RATE_CONFIG: RATE_PLAN_TEMPLATES[PLAN]["config"],
+                CONF_UPDATE_MODE: UPDATE_MODE_EVENT,
+                CONF_USE_JOURNAL: True,
+            },
+            source="user",
+            options={},
+            unique_id=None,
+        )
+        await self.hass.config_entries.async_add(self.entry)
+        await self.hass.async_block_till_done()
+
+    async def asyncTearDown(self):
+        """Stop Home Assistant."""
+        await self.hass.async_stop(force=True)
+        dt_util.set_default_time_zone(self._default_time_zone)
+        shutil.rmtree(self.config_dir)
+
+    async def test_reload(self):
+        """Test a reload shuts the old coordinator down."""
+        old = self.hass.data[DOMAIN][self.entry.entry_id]
+        self.hass.states.async_set("sensor.heater", "1500")
+        await self.hass.async_block_till_done()
+
+        # Options flows update the entry and let the listener reload it
+        self.hass.config_entries.async_update_entry(self.entry, title="Heater 2")
+        await self.hass.async_block_till_done()
+
+        new = self.hass.data[DOMAIN][self.entry.entry_id]
+        self.assertEqual(self.entry.state, ConfigEntryState.LOADED)
+        self.assertIsNot(new, old)
+
+        # One state subscription, one open journal, one schedule user
+        callbacks = self.hass.data[TRACK_STATE_CHANGE_CALLBACKS]["sensor.heater"]
+        self.assertEqual(len(callbacks), 1)
+        self.assertIsNone(old._journal._file)
+        self.hass.states.async_set("sensor.heater", "2000")
+        await self.hass.async_block_till_done()
+        self.assertIsNotNone(new._journal._file)
+        self.assertEqual(rate_calculator._schedule_users[self.key], self.users + 1)
+
+        await self.hass.config_entries.async_unload(self.entry.entry_id)
+        self.assertEqual(rate_calculator._schedule_users.get(self.key, 0), self.users)
+        self.assertIsNone(new._journal._file)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""Tests for the integration rules between power samples."""
+import os
+import unittest
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from custom_components.consumers_energy_cost.const import (
+    INTEGRATION_LEFT,
+    INTEGRATION_RIGHT,
+    INTEGRATION_SIMPSON,
+    INTEGRATION_TRAPEZOID,
+)
+from custom_components.consumers_energy_cost.integration import SampleIntegrator
+
+
+def _energy(integrator, samples):
+    """Integrate samples in watt-seconds."""
+    total = 0.0
+    for (start_ts, p_start), (end_ts, p_end) in zip(samples, samples[1:]):
+        ends = integrator.endpoints(start_ts, p_start, end_ts, p_end)
+        if ends is not None:
+            total += (ends[0] + ends[1]) / 2 * (end_ts - start_ts)
+    return total
+
+
+class TestSampleIntegrator(unittest.TestCase):
+    """Test the SampleIntegrator class."""
+
+    def test_riemann(self):
+        """Test left and right rules hold one sample over the interval."""
+        self.assertEqual(SampleIntegrator(INTEGRATION_LEFT).endpoints(0, 100, 30, 300), (100, 100))
+        self.assertEqual(SampleIntegrator(INTEGRATION_RIGHT).endpoints(0, 100, 30, 300), (300, 300))
+
+    def test_trapezoid(self):
+        """Test the trapezoid ramps between the samples."""
+        self.assertEqual(SampleIntegrator(INTEGRATION_TRAPEZOID).endpoints(0, 100, 30, 300), (100, 300))
+
+    def test_simpson_exact_for_parabola(self):
+        """Test Simpson's rule integrates a quadratic exactly over uneven steps."""
+        def power(t):
+            return 500 + 20 * t - 0.1 * t * t
+
+        times = [0, 10, 25, 30, 60, 100]
+        integrator = SampleIntegrator(INTEGRATION_SIMPSON)
+        integrator.endpoints(times[0], power(times[0]), times[1], power(times[1]))
+        total = _energy(integrator, [(t, power(t)) for t in times[1:]])
+
+        # Antiderivative from 10 to 100
+        def exact(t):
+            return 500 * t + 10 * t * t - 0.1 / 3 * t ** 3
+
+        self.assertAlmostEqual(total, exact(100) - exact(10), places=6)
+
+    def test_simpson_first_interval(self):
+        """Test Simpson's rule falls back to the trapezoid without history."""
+        integrator = SampleIntegrator(INTEGRATION_SIMPSON)
+        self.assertEqual(integrator.endpoints(0, 100, 30, 300), (100, 300))
+
+        integrator.reset()
+        self.assertEqual(integrator.endpoints(30, 300, 60, 0), (300, 0))
+
+    def test_simpson_never_negative(self):
+        """Test the curvature correction can't make consumption negative."""
+        integrator = SampleIntegrator(INTEGRATION_SIMPSON)
+        integrator.endpoints(0, 0, 30, 3000)
+        p_start, p_end = integrator.endpoints(30, 3000, 60, 0)
+
+        self.assertGreaterEqual(min(p_start, p_end), 0)
+
+    def test_simpson_step_load_on_change(self):
+        """Test steps reported on change don't make the parabola overshoot."""
+        # A compressor cycling 150 W on and off, reported when it switches
+        # and every five minutes while it holds. Each switch lands 20 s
+        # before a heartbeat, so a short step precedes a long flat interval.
+        changes = [(0, 0.0)]
+        for cycle in range(1, 13):
+            changes.append((cycle * 900 - 20, 150.0 if cycle % 2 else 0.0))
+        held = [
+            (t, next(power for when, power in reversed(changes) if when <= t))
+            for t in range(300, 12 * 900, 300)
+        ]
+        samples = sorted(changes + held)
+        exact = sum(
+            p_start * (end_ts - start_ts)
+            for (start_ts, p_start), (end_ts, _) in zip(samples, samples[1:])
+        )
+
+        simpson = _energy(SampleIntegrator(INTEGRATION_SIMPSON), samples)
+        trapezoid = _energy(SampleIntegrator(INTEGRATION_TRAPEZOID), samples)
+        self.assertAlmostEqual(simpson, trapezoid)
+        self.assertLess(abs(simpson - exact) / exact, 0.01)
+
+    def test_median_filter(self):
+        """Test a single spike is dropped by the median filter."""
+        integrator = SampleIntegrator(median_window=3)
+        filtered = [integrator.filter(power) for power in (100, 110, 65535, 120, 130)]
+
+        self.assertEqual(filtered, [100, 105, 110, 120, 130])
+        self.assertIsNone(integrator.filter(None))
+
+    def test_max_gap(self):
+        """Test intervals longer than the maximum gap aren't integrated."""
+        integrator = SampleIntegrator(INTEGRATION_TRAPEZOID, max_gap=600)
+
+        self.assertEqual(integrator.endpoints(0, 100, 600, 200), (100, 200))
+        self.assertIsNone(integrator.endpoints(600, 200, 1300, 200))
+
+    def test_unknown_method(self):
+        """Test an unknown method is rejected."""
+        with self.assertRaises(ValueError):
+            SampleIntegrator("midpoint")
+
+
+if __name__ == "__main__":
+    unittest.main()
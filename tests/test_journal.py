@@ -0,0 +1,158 @@
+"""Tests for the delta journal."""
+from datetime import datetime, timedelta
+import os
+import tempfile
+import unittest
+from zoneinfo import ZoneInfo
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, State
+from homeassistant.util import dt as dt_util
+
+from custom_components.consumers_energy_cost.clock import VirtualClock
+from custom_components.consumers_energy_cost.const import RATE_PLAN_TEMPLATES, UPDATE_MODE_EVENT
+from custom_components.consumers_energy_cost.coordinator import EnergyDataUpdateCoordinator
+from custom_components.consumers_energy_cost.fixed_point import ENERGY_SCALE
+from custom_components.consumers_energy_cost.journal import RECORD, DeltaJournal
+
+TZ = ZoneInfo("America/Detroit")
+
+
+class TestDeltaJournal(unittest.TestCase):
+    """Test the DeltaJournal class."""
+
+    def setUp(self):
+        """Set up a journal in a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, ".storage", "state.journal")
+        self.journal = DeltaJournal(self.path)
+
+    def tearDown(self):
+        """Close the journal and remove the temporary directory."""
+        self.journal.close()
+        self.temp_dir.cleanup()
+
+    def test_append_and_read(self):
+        """Test records are read back in order."""
+        self.assertEqual(list(self.journal.read()), [])
+
+        self.journal.append(RECORD.pack(100.0, 0.5, 0.1, 1000.0))
+        self.journal.append(
+            RECORD.pack(130.0, 0.25, 0.05, 500.0) + RECORD.pack(160.0, 0.0, 0.0, 0.0)
+        )
+
+        self.assertEqual(
+            list(self.journal.read()),
+            [(100.0, 0.5, 0.1, 1000.0), (130.0, 0.25, 0.05, 500.0), (160.0, 0.0, 0.0, 0.0)],
+        )
+
+    def test_truncated_record_ignored(self):
+        """Test a record cut short by a crash is skipped."""
+        self.journal.append(RECORD.pack(100.0, 0.5, 0.1, 1000.0))
+        self.journal.append(RECORD.pack(130.0, 0.25, 0.05, 500.0)[:10])
+
+        with self.assertLogs(level="WARNING"):
+            records = list(self.journal.read())
+        self.assertEqual(records, [(100.0, 0.5, 0.1, 1000.0)])
+
+    def test_compact(self):
+        """Test compaction drops records contained in the snapshot."""
+        for timestamp in (100.0, 130.0, 160.0):
+            self.journal.append(RECORD.pack(timestamp, 0.1, 0.01, 200.0))
+
+        self.assertEqual(self.journal.compact(130.0), 1)
+        self.assertEqual(list(self.journal.read()), [(160.0, 0.1, 0.01, 200.0)])
+
+        # Appending after compaction reopens the new file
+        self.journal.append(RECORD.pack(190.0, 0.1, 0.01, 200.0))
+        self.assertEqual(os.path.getsize(self.path), 2 * RECORD.size)
+
+
+class TestCoordinatorJournal(unittest.IsolatedAsyncioTestCase):
+    """Test the coordinator's journal records replay after a crash."""
+
+    async def asyncSetUp(self):
+        """Create a journaling coordinator with an energy meter."""
+        self.hass = HomeAssistant(tempfile.mkdtemp())
+        self._default_time_zone = dt_util.DEFAULT_TIME_ZONE
+        self.hass.config.set_time_zone("America/Detroit")
+        self.hass.states.async_set("sensor.heater", "1000")
+
+        self.start = datetime(2025, 1, 15, 12, 0, tzinfo=TZ)
+        self.clock = VirtualClock(self.start)
+        self.coordinator = self._coordinator()
+        await self.coordinator._async_update_data()
+        self.coordinator.async_start_event_tracking()
+
+    async def asyncTearDown(self):
+        """Stop Home Assistant."""
+        await self.coordinator.async_shutdown()
+        await self.hass.async_stop(force=True)
+        dt_util.set_default_time_zone(self._default_time_zone)
+
+    def _coordinator(self):
+        """Create a coordinator on the shared storage."""
+        return EnergyDataUpdateCoordinator(
+            self.hass,
+            ["sensor.heater"],
+            RATE_PLAN_TEMPLATES["summer_tou_1001"]["config"],
+            "journal_test",
+            update_mode=UPDATE_MODE_EVENT,
+            use_journal=True,
+            energy_sensors=["sensor.dryer_energy"],
+            clock=self.clock,
+        )
+
+    def _event(self, entity_id, state, seconds, attributes=None):
+        """Send a state change some seconds after the start to the coordinator."""
+        when = self.start + timedelta(seconds=seconds)
+        event = Event(
+            EVENT_STATE_CHANGED,
+            {
+                "entity_id": entity_id,
+                "new_state": State(entity_id, state, attributes, when, when),
+            },
+        )
+        if entity_id == "sensor.heater":
+            self.coordinator._async_handle_power_event(event)
+        else:
+            self.coordinator._async_handle_meter_event(event)
+
+    async def test_reading_at_snapshot_replayed(self):
+        """Test a meter reading at the snapshot's timestamp survives a crash."""
+        kwh = {ATTR_UNIT_OF_MEASUREMENT: "kWh"}
+        self._event("sensor.dryer_energy", "10.0", 30, kwh)
+        self._event("sensor.heater", "3000", 60)
+        await self.hass.async_block_till_done()
+        await self.coordinator._async_compact_journal()
+
+        # Priced at the same time as the power change the snapshot ends with
+        self._event("sensor.dryer_energy", "10.5", 60, kwh)
+        await self.hass.async_block_till_done()
+
+        # Only the reading is journaled, after the snapshot
+        records = list(self.coordinator._journal.read())
+        snapshot_ts = (self.start + timedelta(seconds=60)).timestamp()
+        self.assertEqual(len(records), 1)
+        self.assertGreater(records[0][0], snapshot_ts)
+        self.assertAlmostEqual(records[0][1], 0.5)
+
+        # Restart from the snapshot without a clean shutdown
+        restarted = self._coordinator()
+        await restarted._restore_state()
+        await restarted._replay_journal()
+
+        self.assertAlmostEqual(
+            restarted._daily_energy / ENERGY_SCALE,
+            self.coordinator._daily_energy / ENERGY_SCALE,
+            places=5,
+        )
+        self.assertEqual(restarted._previous_power, 3000)
+        await restarted.async_shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
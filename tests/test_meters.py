@@ -0,0 +1,279 @@
+"""Tests for energy meter readings."""
+from datetime import datetime, timedelta
+import math
+import os
+import tempfile
+import unittest
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, State
+from homeassistant.util import dt as dt_util
+
+from custom_components.consumers_energy_cost.clock import VirtualClock
+from custom_components.consumers_energy_cost.const import (
+    INTEGRATION_SIMPSON,
+    RATE_PLAN_TEMPLATES,
+    UPDATE_MODE_EVENT,
+)
+from custom_components.consumers_energy_cost.coordinator import EnergyDataUpdateCoordinator
+from custom_components.consumers_energy_cost.fixed_point import COST_SCALE, ENERGY_SCALE
+from custom_components.consumers_energy_cost.meters import EnergyMeters, meter_delta
+
+TZ = ZoneInfo("America/Detroit")
+
+
+class TestMeterDelta(unittest.TestCase):
+    """Test the energy between two meter readings."""
+
+    def test_increase(self):
+        """Test a rising meter gives the difference."""
+        self.assertAlmostEqual(meter_delta(10.0, 12.5), 2.5)
+        self.assertEqual(meter_delta(10.0, 10.0), 0.0)
+
+    def test_small_dip_ignored(self):
+        """Test a drop under the reset threshold is ignored."""
+        self.assertIsNone(meter_delta(100.0, 95.0))
+
+    def test_reset(self):
+        """Test a large drop is a reset counting up from zero."""
+        self.assertEqual(meter_delta(100.0, 3.0), 3.0)
+        self.assertEqual(meter_delta(100.0, 0.0), 0.0)
+
+
+class TestEnergyMeters(unittest.TestCase):
+    """Test the EnergyMeters class."""
+
+    def setUp(self):
+        """Set up two meters."""
+        self.meters = EnergyMeters(["sensor.a", "sensor.b"])
+
+    def test_first_reading(self):
+        """Test the first reading only sets the baseline."""
+        self.assertIsNone(self.meters.update(0, 10.0, 100.0))
+        self.assertEqual(self.meters.update(0, 11.0, 160.0), (100.0, 1.0))
+        self.assertEqual(self.meters.update(0, 11.5, 220.0), (160.0, 0.5))
+
+    def test_dip_keeps_reading(self):
+        """Test a dip leaves the last reading in place."""
+        self.meters.update(1, 10.0, 100.0)
+        self.assertIsNone(self.meters.update(1, 9.5, 160.0))
+        self.assertEqual(self.meters.update(1, 10.5, 220.0), (100.0, 0.5))
+
+    def test_forget(self):
+        """Test forgotten readings start afresh."""
+        self.meters.update(0, 10.0, 100.0)
+        self.meters.forget()
+
+        self.assertTrue(math.isnan(self.meters.values[0]))
+        self.assertIsNone(self.meters.update(0, 20.0, 160.0))
+
+    def test_round_trip(self):
+        """Test readings serialize and load by entity ID."""
+        self.meters.update(1, 10.0, 100.0)
+        data = self.meters.to_dict()
+        self.assertEqual(data, {"sensor.b": {"value": 10.0, "timestamp": 100.0}})
+
+        # Sensors reordered, one added
+        restored = EnergyMeters(["sensor.c", "sensor.b"])
+        restored.from_dict(data)
+
+        self.assertEqual(restored.index("sensor.b"), 1)
+        self.assertEqual(restored.update(1, 12.0, 160.0), (100.0, 2.0))
+        self.assertIsNone(restored.update(0, 1.0, 160.0))
+
+
+class TestCoordinatorMeters(unittest.IsolatedAsyncioTestCase):
+    """Test pricing meter readings in an event-driven coordinator."""
+
+    async def asyncSetUp(self):
+        """Create a coordinator with a power sensor and an energy meter."""
+        self.hass = HomeAssistant(tempfile.mkdtemp())
+        self._default_time_zone = dt_util.DEFAULT_TIME_ZONE
+        self.hass.config.set_time_zone("America/Detroit")
+        self.hass.states.async_set("sensor.heater", "1000")
+
+        self.start = datetime(2025, 1, 31, 23, 0, tzinfo=TZ)
+        self.clock = VirtualClock(self.start)
+        self.coordinator = EnergyDataUpdateCoordinator(
+            self.hass,
+            ["sensor.heater"],
+            RATE_PLAN_TEMPLATES["summer_tou_1001"]["config"],
+            "meter_test",
+            update_mode=UPDATE_MODE_EVENT,
+            energy_sensors=["sensor.dryer_energy"],
+            median_window=3,
+            clock=self.clock,
+        )
+        self.coordinator._state_restored = True
+        await self.coordinator._async_update_data()
+        self.coordinator.async_start_event_tracking()
+
+    async def asyncTearDown(self):
+        """Stop Home Assistant."""
+        await self.coordinator.async_shutdown()
+        await self.hass.async_stop(force=True)
+        dt_util.set_default_time_zone(self._default_time_zone)
+
+    def _event(self, entity_id, state, seconds, attributes=None):
+        """Send a state change some seconds after the start to the coordinator."""
+        when = self.start + timedelta(seconds=seconds)
+        event = Event(
+            EVENT_STATE_CHANGED,
+            {
+                "entity_id": entity_id,
+                "new_state": State(entity_id, state, attributes, when, when),
+            },
+        )
+        if entity_id == "sensor.heater":
+            self.coordinator._async_handle_power_event(event)
+        else:
+            self.coordinator._async_handle_meter_event(event)
+
+    def _meter(self, kwh, seconds):
+        """Send an energy meter reading."""
+        self._event("sensor.dryer_energy", str(kwh), seconds, {ATTR_UNIT_OF_MEASUREMENT: "kWh"})
+
+    def test_meter_not_filtered(self):
+        """Test meter readings don't add samples to the median filter."""
+        self._meter(10.0, 60)
+        self._meter(10.5, 120)
+        self._event("sensor.heater", "3000", 180)
+
+        # The median of the two power samples, not of three with a repeat
+        self.assertEqual(self.coordinator._previous_power, 2000)
+        # Two minutes held at 1 kW, a minute ramping to 2 kW and the meter
+        self.assertAlmostEqual(
+            self.coordinator._daily_energy / ENERGY_SCALE, 2 / 60 + 1.5 / 60 + 0.5, places=5
+        )
+
+    def test_reading_split_at_rollover(self):
+        """Test a reading spanning midnight credits January its share."""
+        self._meter(10.0, 30 * 60)
+        self._meter(11.0, 90 * 60)
+
+        # The power sensor's 1 kW for the hour and a half, plus the meter's
+        # kWh spread evenly over the hour either side of midnight
+        coordinator = self.coordinator
+        self.assertAlmostEqual(coordinator._previous_month_energy / ENERGY_SCALE, 1.5, places=5)
+        self.assertAlmostEqual(coordinator._previous_month_cost / COST_SCALE, 1.5 * 0.164, places=5)
+        self.assertAlmostEqual(coordinator._monthly_energy / ENERGY_SCALE, 1.0, places=5)
+        self.assertAlmostEqual(coordinator._daily_energy / ENERGY_SCALE, 1.0, places=5)
+
+        days = coordinator.rollups.query(
+            datetime(2025, 1, 31, tzinfo=TZ).timestamp(),
+            datetime(2025, 2, 2, tzinfo=TZ).timestamp(),
+            "day",
+        )
+        self.assertEqual([round(energy, 5) for _, energy, _ in days], [1.5, 1.0])
+
+    async def test_reading_during_recalculate(self):
+        """Test a reading that comes in while history is read isn't lost."""
+        self._meter(10.0, 60)
+        self.clock.advance(600)
+
+        async def history_chunk(calculator, start_ts, end_ts, last_values, last_readings):
+            self._meter(10.5, 660)
+            last_values["sensor.heater"] = 1000.0
+            return [(end_ts, 1 / 6, 0.164 / 6, 1000.0)], [(start_ts, 1000.0)]
+
+        coordinator = self.coordinator
+        with mock.patch.object(coordinator, "_async_history_chunk", history_chunk):
+            await coordinator.async_recalculate(self.start, self.clock.now())
+
+        # Ten minutes of history, a minute held at 1 kW up to the reading
+        # and the reading itself
+        self.assertAlmostEqual(coordinator._hourly_energy / ENERGY_SCALE, 11 / 60 + 0.5, places=5)
+        self.assertEqual(coordinator._meter_readings, [])
+
+
+class TestPolledMeters(unittest.IsolatedAsyncioTestCase):
+    """Test meter readings between polls leave polled power alone."""
+
+    async def asyncSetUp(self):
+        """Set up Home Assistant with a varying power sensor."""
+        self.hass = HomeAssistant(tempfile.mkdtemp())
+        self._default_time_zone = dt_util.DEFAULT_TIME_ZONE
+        self.hass.config.set_time_zone("America/Detroit")
+        self.start = datetime(2025, 1, 31, 23, 0, tzinfo=TZ)
+
+    async def asyncTearDown(self):
+        """Stop Home Assistant."""
+        await self.hass.async_stop(force=True)
+        dt_util.set_default_time_zone(self._default_time_zone)
+
+    async def _run(self, with_meter):
+        """Poll a load across midnight, with or without meter readings.
+
+        Returns:
+            The coordinator after the last poll
+        """
+        clock = VirtualClock(self.start)
+        coordinator = EnergyDataUpdateCoordinator(
+            self.hass,
+            ["sensor.heater"],
+            RATE_PLAN_TEMPLATES["summer_tou_1001"]["config"],
+            f"polled_meter_{with_meter}",
+            energy_sensors=["sensor.dryer_energy"],
+            integration_method=INTEGRATION_SIMPSON,
+            clock=clock,
+        )
+        coordinator._state_restored = True
+        self.hass.states.async_set("sensor.heater", "1000")
+        await coordinator._async_update_data()
+
+        meter = 10.0
+        for poll in range(1, 241):
+            if with_meter and poll % 4 == 0:
+                # A reading 17 s into the poll interval
+                clock.advance(17)
+                meter += 0.01
+                when = clock.now()
+                coordinator._async_handle_meter_event(
+                    Event(
+                        EVENT_STATE_CHANGED,
+                        {
+                            "entity_id": "sensor.dryer_energy",
+                            "new_state": State(
+                                "sensor.dryer_energy",
+                                str(meter),
+                                {ATTR_UNIT_OF_MEASUREMENT: "kWh"},
+                                when,
+                                when,
+                            ),
+                        },
+                    )
+                )
+                clock.advance(13)
+            else:
+                clock.advance(30)
+            self.hass.states.async_set("sensor.heater", str(1000 + 800 * math.sin(poll / 5)))
+            await coordinator._async_update_data()
+
+        await coordinator.async_shutdown()
+        return coordinator
+
+    async def test_meter_between_polls(self):
+        """Test polled totals only gain the meter's energy."""
+        plain = await self._run(False)
+        metered = await self._run(True)
+
+        # The first reading sets the baseline; 59 more add 0.01 kWh each
+        for name in ("_previous_month_energy", "_monthly_energy"):
+            self.assertGreater(getattr(plain, name), 0)
+        total_plain = plain._previous_month_energy + plain._monthly_energy
+        total_metered = metered._previous_month_energy + metered._monthly_energy
+        self.assertAlmostEqual((total_metered - total_plain) / ENERGY_SCALE, 0.59, places=5)
+
+        # The last January reading is 13 s before midnight, so a reading
+        # two minutes later credits January 13/120 of its energy
+        january = (metered._previous_month_energy - plain._previous_month_energy) / ENERGY_SCALE
+        self.assertAlmostEqual(january, 0.29 + 0.01 * 13 / 120, places=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+"""Tests for the memory-mapped minute history."""
+from datetime import datetime
+import os
+import tempfile
+import unittest
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.consumers_energy_cost import minute_history
+from custom_components.consumers_energy_cost.clock import VirtualClock
+from custom_components.consumers_energy_cost.const import RATE_PLAN_TEMPLATES
+from custom_components.consumers_energy_cost.coordinator import EnergyDataUpdateCoordinator
+from custom_components.consumers_energy_cost.fixed_point import ENERGY_SCALE
+from custom_components.consumers_energy_cost.minute_history import MinuteHistory
+
+# A day of minutes, so wrap-around is quick to reach
+CAPACITY = 1440
+START = 1_743_480_000.0  # minute aligned
+
+TZ = ZoneInfo("America/Detroit")
+
+
+class TestMinuteHistory(unittest.TestCase):
+    """Test the MinuteHistory class."""
+
+    def setUp(self):
+        """Set up a history in a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, ".storage", "state.minutes")
+        self.history = MinuteHistory(self.path, capacity=CAPACITY)
+        self.history.open()
+
+    def tearDown(self):
+        """Close the history and remove the temporary directory."""
+        self.history.close()
+        self.temp_dir.cleanup()
+
+    def test_preallocated(self):
+        """Test the file is created at its full size."""
+        self.assertEqual(os.path.getsize(self.path), minute_history.HEADER_SIZE + CAPACITY * 8)
+        self.assertIsNone(self.history.covered_from())
+        self.assertEqual(self.history.sum(0, START * 2), (0.0, 0.0))
+
+    def test_add_sum_query(self):
+        """Test deltas are summed per minute and over ranges."""
+        self.history.add(START + 10, 0.5, 0.125)
+        self.history.add(START + 50, 0.25, 0.0625)
+        self.history.add(START + 130, 1.0, 0.25)
+
+        self.assertEqual(self.history.covered_from(), START)
+        self.assertEqual(
+            self.history.query(START, START + 180),
+            [(START, 0.75, 0.1875), (START + 60, 0.0, 0.0), (START + 120, 1.0, 0.25)],
+        )
+        self.assertEqual(self.history.sum(START, START + 180), (1.75, 0.4375))
+        # Only minutes starting in the range are summed
+        self.assertEqual(self.history.sum(START + 1, START + 180), (1.0, 0.25))
+
+    def test_python_sum(self):
+        """Test range sums without NumPy."""
+        for minute in range(100):
+            self.history.add(START + minute * 60, 0.5, 0.25)
+
+        with mock.patch.object(minute_history, "np", None):
+            self.assertEqual(self.history.sum(START, START + 6000), (50.0, 25.0))
+
+    def test_wrap_around(self):
+        """Test old minutes are dropped when the file wraps around."""
+        for minute in range(CAPACITY + 100):
+            self.history.add(START + minute * 60, 1.0, 0.5)
+
+        self.assertEqual(self.history.covered_from(), START + 100 * 60)
+        self.assertEqual(self.history.sum(0, START * 2), (CAPACITY, CAPACITY / 2))
+
+        # A gap zeroes the minutes skipped, including reused slots
+        self.history.add(START + (CAPACITY + 200) * 60, 2.0, 1.0)
+        self.assertEqual(self.history.sum(0, START * 2), (CAPACITY - 101 + 2.0, (CAPACITY - 101) / 2 + 1.0))
+
+        # Minutes older than the file holds are ignored
+        self.history.add(START, 5.0, 5.0)
+        self.assertEqual(self.history.sum(0, START * 2), (CAPACITY - 101 + 2.0, (CAPACITY - 101) / 2 + 1.0))
+
+    def test_reopen(self):
+        """Test records and position survive closing and reopening."""
+        self.history.add(START + 10, 0.5, 0.125)
+        self.history.set_position(START + 30, 1234.5)
+        self.history.close()
+
+        reopened = MinuteHistory(self.path, capacity=CAPACITY)
+        reopened.open()
+        self.assertEqual(reopened.sum(START, START + 60), (0.5, 0.125))
+        self.assertEqual(reopened.last_timestamp, START + 30)
+        self.assertEqual(reopened.last_power, 1234.5)
+        reopened.close()
+
+        # Another capacity is another format, so the file starts fresh
+        resized = MinuteHistory(self.path, capacity=CAPACITY * 2)
+        resized.open()
+        self.assertIsNone(resized.covered_from())
+        self.assertIsNone(resized.last_power)
+        resized.close()
+
+    def test_clear(self):
+        """Test minutes from a time on are zeroed."""
+        for minute in range(10):
+            self.history.add(START + minute * 60, 1.0, 0.5)
+
+        self.history.clear(START + 300)
+        self.assertEqual(self.history.sum(START, START + 600), (5.0, 2.5))
+
+
+class TestRestoreFromMinutes(unittest.IsolatedAsyncioTestCase):
+    """Test bringing a stale snapshot up to date from the minute history."""
+
+    async def asyncSetUp(self):
+        """Create a coordinator at 1 kW that keeps minutes from 12:55."""
+        self.hass = HomeAssistant(tempfile.mkdtemp())
+        self._default_time_zone = dt_util.DEFAULT_TIME_ZONE
+        self.hass.config.set_time_zone("America/Detroit")
+        self.hass.states.async_set("sensor.heater", "1000")
+
+        self.clock = VirtualClock(datetime(2025, 7, 15, 12, 55, tzinfo=TZ))
+        self.coordinator = EnergyDataUpdateCoordinator(
+            self.hass,
+            ["sensor.heater"],
+            RATE_PLAN_TEMPLATES["summer_tou_1001"]["config"],
+            "minutes_test",
+            clock=self.clock,
+        )
+        self.coordinator._state_restored = True
+        self.coordinator._minutes.open()
+        self.coordinator.rollups.minutes = self.coordinator._minutes
+
+    async def asyncTearDown(self):
+        """Stop Home Assistant."""
+        await self.coordinator.async_shutdown()
+        await self.hass.async_stop(force=True)
+        dt_util.set_default_time_zone(self._default_time_zone)
+
+    async def _run(self, minutes):
+        """Update once a minute."""
+        for _ in range(minutes):
+            self.clock.advance(60)
+            await self.coordinator._async_update_data()
+
+    async def test_snapshot_totals_kept(self):
+        """Test only the minutes after the snapshot are added to its totals."""
+        await self.coordinator._async_update_data()
+        await self._run(25)
+
+        # The snapshot holds energy the minute history doesn't, as totals
+        # counted before the history was kept would
+        fields = ("_hourly_energy", "_daily_energy", "_monthly_energy", "_yearly_energy")
+        self.coordinator._hourly_energy += ENERGY_SCALE
+        snapshot = {field: getattr(self.coordinator, field) for field in fields}
+        snapshot_time = self.coordinator._previous_timestamp
+
+        await self._run(10)
+
+        # Crash: the saved state is ten minutes behind the minute history
+        for field, value in snapshot.items():
+            setattr(self.coordinator, field, value)
+        self.coordinator._previous_timestamp = snapshot_time
+        self.coordinator._restore_from_minutes()
+
+        # Ten minutes at 1 kW on top of every snapshot total
+        for field in fields:
+            self.assertAlmostEqual(
+                getattr(self.coordinator, field) - snapshot[field], ENERGY_SCALE / 6, delta=1
+            )
+        self.assertEqual(self.coordinator._previous_timestamp, self.clock.now())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+"""Tests for the incrementally maintained power total."""
+import os
+import unittest
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from custom_components.consumers_energy_cost.power_sum import PowerSum
+
+
+class TestPowerSum(unittest.TestCase):
+    """Test the PowerSum class."""
+
+    def setUp(self):
+        """Set up a total of three sensors."""
+        self.power = PowerSum(3)
+
+    def test_unavailable_until_set(self):
+        """Test there is no total until a sensor is available."""
+        self.assertIsNone(self.power.total)
+
+        self.power.set(1, 0.0)
+        self.assertEqual(self.power.total, 0.0)
+
+    def test_replace_values(self):
+        """Test changes replace a sensor's old value in the total."""
+        self.power.set(0, 100.0)
+        self.power.set(1, 250.0)
+        self.power.set(0, 1000.0)
+        self.assertEqual(self.power.total, 1250.0)
+        self.assertEqual(self.power.valid_count, 2)
+
+        self.power.set(1, None)
+        self.assertEqual(self.power.total, 1000.0)
+        self.power.set(0, None)
+        self.assertIsNone(self.power.total)
+        self.assertEqual(self.power.valid_count, 0)
+
+    def test_no_drift(self):
+        """Test rounding error doesn't build up over many changes."""
+        power = PowerSum(100)
+        for step in range(100_000):
+            power.set(step % 100, (step % 7) * 0.1 + 1e6)
+
+        expected = sum((step % 7) * 0.1 + 1e6 for step in range(100_000 - 100, 100_000))
+        self.assertAlmostEqual(power.total, expected, places=6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,15 +1,56 @@
 """Tests for the rate calculator."""
+import threading
 import unittest
-from datetime import datetime
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from unittest import mock
+from zoneinfo import ZoneInfo
 
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from custom_components.consumers_energy_cost import rate_calculator
 from custom_components.consumers_energy_cost.rate_calculator import RateCalculator
 from custom_components.consumers_energy_cost.const import RATE_PLAN_TEMPLATES, RATE_PLAN_SUMMER_TOU, RATE_PLAN_NIGHTTIME_SAVERS
 
 
+# Custom configuration exercising midnight-crossing and overlapping periods
+OVERLAPPING_CONFIG = {
+    "summer": {
+        "months": [6, 7, 8],
+        "weekday": {
+            "periods": [
+                {"name": "Late", "start": "22:00", "end": "02:00", "rate": 0.11},
+                {"name": "Peak", "start": "14:00", "end": "19:00", "rate": 0.25},
+                {"name": "Shoulder", "start": "12:00", "end": "20:30", "rate": 0.19},
+                {"name": "Empty", "start": "09:00", "end": "09:00", "rate": 0.99},
+            ],
+        },
+    },
+    "winter": {
+        "months": [12, 1, 2],
+        "weekend": {"default_rate": 0.12},
+        "default_rate": 0.15,
+    },
+}
+
+
+# Periods at the hours clocks change in, every day of the year
+_DST_DAY = {
+    "periods": [
+        {"name": "Early", "start": "01:30", "end": "02:00", "rate": 0.3},
+        {"name": "Gap", "start": "02:15", "end": "02:45", "rate": 0.5},
+    ],
+    "default_rate": 0.1,
+    "default_name": "Standard",
+}
+DST_CONFIG = {
+    "all": {"months": list(range(1, 13)), "weekday": _DST_DAY, "weekend": _DST_DAY},
+}
+
+
 class TestRateCalculator(unittest.TestCase):
     """Test the RateCalculator class."""
 
@@ -184,6 +225,343 @@ class TestRateCalculator(unittest.TestCase):
         dt_may = datetime(2025, 5, 15, 12, 0, 0)
         self.assertEqual(calculator.get_season_name(dt_may), "Winter")
 
+    def test_compiled_schedule_matches_reference(self):
+        """Test the compiled lookup table against the original config walk."""
+        configs = [template["config"] for template in RATE_PLAN_TEMPLATES.values()]
+        configs.append(OVERLAPPING_CONFIG)
+
+        for config in configs:
+            calculator = RateCalculator(config)
+            for month in range(1, 13):
+                # One full week of minutes in every month
+                dt = datetime(2025, month, 3, 0, 0, 30)
+                for _ in range(7 * 1440):
+                    self.assertEqual(
+                        calculator.get_rate(dt),
+                        calculator._reference_rate(dt),
+                        f"Compiled rate differs at {dt}",
+                    )
+                    dt += timedelta(minutes=1)
+
+    def test_unknown_season(self):
+        """Test months without a configured season."""
+        calculator = RateCalculator(OVERLAPPING_CONFIG)
+
+        dt_april = datetime(2025, 4, 15, 15, 0, 0)
+        self.assertEqual(calculator.get_rate(dt_april), (0.0, "Unknown"))
+        self.assertEqual(calculator.get_season_name(dt_april), "Unknown")
+
+    def test_next_change(self):
+        """Test finding the next rate change."""
+        calculator = RateCalculator(self.nighttime_savers_config)
+
+        # Tuesday morning: next change is on-peak at 2pm
+        change = calculator.next_change(datetime(2025, 7, 15, 10, 30, 15))
+        self.assertEqual(change, (datetime(2025, 7, 15, 14, 0), 0.212, "On-Peak"))
+
+        # The 23:59 minute of the last Super Off-Peak period is Off-Peak
+        change = calculator.next_change(datetime(2025, 7, 15, 23, 30))
+        self.assertEqual(change, (datetime(2025, 7, 15, 23, 59), 0.173, "Off-Peak"))
+
+        # Friday 23:59 is Off-Peak, the weekend starts Super Off-Peak
+        change = calculator.next_change(datetime(2025, 7, 18, 23, 59))
+        self.assertEqual(change, (datetime(2025, 7, 19, 0, 0), 0.133, "Super Off-Peak"))
+
+        # Super Off-Peak continues through Monday 6am
+        change = calculator.next_change(datetime(2025, 7, 19, 0, 0))
+        self.assertEqual(change, (datetime(2025, 7, 21, 6, 0), 0.173, "Off-Peak"))
+
+        # Season change on a weekend
+        change = calculator.next_change(datetime(2025, 9, 30, 23, 59))
+        self.assertEqual(change, (datetime(2025, 10, 1, 0, 0), 0.141, "Super Off-Peak"))
+
+    def test_next_change_across_months(self):
+        """Test next change agrees with get_rate and skips flat seasons."""
+        calculator = RateCalculator(self.summer_tou_config)
+
+        # Winter is flat, so the next change is the start of summer
+        change = calculator.next_change(datetime(2025, 1, 15, 12, 0))
+        self.assertEqual(change, (datetime(2025, 6, 1, 0, 0), 0.178, "Off-Peak"))
+
+        dt = datetime(2025, 5, 20, 12, 0)
+        for _ in range(50):
+            change_time, rate, name = calculator.next_change(dt)
+            self.assertEqual(calculator.get_rate(change_time), (rate, name))
+            self.assertEqual(
+                calculator.get_rate(change_time - timedelta(minutes=1)),
+                calculator.get_rate(dt),
+            )
+            dt = change_time
+
+        flat = RateCalculator({"all": {"months": list(range(1, 13)), "default_rate": 0.1}})
+        self.assertIsNone(flat.next_change(datetime(2025, 1, 15, 12, 0)))
+
+    def test_cost_for_interval_splits_at_rate_changes(self):
+        """Test an interval straddling the on-peak start is billed per part."""
+        calculator = RateCalculator(self.nighttime_savers_config)
+
+        # Constant 1 kW from 1:30pm to 2:30pm: half Off-Peak, half On-Peak
+        energy, cost = calculator.cost_for_interval(
+            datetime(2025, 7, 15, 13, 30), datetime(2025, 7, 15, 14, 30), 1000.0, 1000.0
+        )
+        self.assertAlmostEqual(energy, 1.0)
+        self.assertAlmostEqual(cost, 0.5 * 0.173 + 0.5 * 0.212)
+
+        # Power ramps from 0 to 2 kW over the same hour. The first half uses
+        # 0.25 kWh and the second half 0.75 kWh.
+        energy, cost = calculator.cost_for_interval(
+            datetime(2025, 7, 15, 13, 30), datetime(2025, 7, 15, 14, 30), 0.0, 2000.0
+        )
+        self.assertAlmostEqual(energy, 1.0)
+        self.assertAlmostEqual(cost, 0.25 * 0.173 + 0.75 * 0.212)
+
+        # Four hours from 10pm crosses 11pm, 11:59pm and midnight
+        energy, cost = calculator.cost_for_interval(
+            datetime(2025, 7, 15, 22, 0), datetime(2025, 7, 16, 2, 0), 1000.0, 1000.0
+        )
+        self.assertAlmostEqual(energy, 4.0)
+        self.assertAlmostEqual(
+            cost, 0.173 + (59 / 60) * 0.133 + (1 / 60) * 0.173 + 2 * 0.133
+        )
+
+        # Empty and reversed intervals cost nothing
+        self.assertEqual(
+            calculator.cost_for_interval(
+                datetime(2025, 7, 15, 14, 0), datetime(2025, 7, 15, 14, 0), 500.0, 500.0
+            ),
+            (0.0, 0.0),
+        )
+
+    def test_cost_for_interval_consecutive(self):
+        """Test consecutive intervals are priced the same as one at a time."""
+        calculator = RateCalculator(self.nighttime_savers_config)
+        start = datetime(2025, 7, 15, 12, 0, 7)
+        total_cost = 0.0
+        for _ in range(200):
+            end = start + timedelta(seconds=53)
+            cost = calculator.cost_for_interval(start, end, 1000.0, 1000.0)[1]
+            alone = RateCalculator(self.nighttime_savers_config).cost_for_interval(
+                start, end, 1000.0, 1000.0
+            )[1]
+            self.assertAlmostEqual(cost, alone)
+            total_cost += cost
+            start = end
+
+        # 176 minutes at 1 kW, of which 2 pm to 2:56:47 pm are On-Peak
+        on_peak = (56 * 60 + 47) / 3600
+        self.assertAlmostEqual(
+            total_cost, (200 * 53 / 3600 - on_peak) * 0.173 + on_peak * 0.212
+        )
+
+        # The same wall-clock times in another zone aren't priced from it
+        utc = ZoneInfo("UTC")
+        detroit = ZoneInfo("America/Detroit")
+        calculator.cost_for_interval(
+            datetime(2025, 7, 15, 13, 0, tzinfo=detroit),
+            datetime(2025, 7, 15, 13, 1, tzinfo=detroit),
+            1000.0,
+            1000.0,
+        )
+        _, cost = calculator.cost_for_interval(
+            datetime(2025, 7, 15, 17, 1, tzinfo=utc),
+            datetime(2025, 7, 15, 17, 2, tzinfo=utc),
+            1000.0,
+            1000.0,
+        )
+        self.assertAlmostEqual(cost, 0.212 / 60)
+
+    def test_dst_fall_back(self):
+        """Test changes inside the hour repeated when clocks go back."""
+        calculator = RateCalculator(DST_CONFIG)
+        tz = ZoneInfo("America/Detroit")
+
+        # Clocks go back from 2:00 EDT to 1:00 EST on November 2, 2025, so
+        # Early starts twice
+        early_edt = datetime(2025, 11, 2, 1, 40, tzinfo=tz)
+        self.assertEqual(
+            calculator.next_change(early_edt),
+            (datetime(2025, 11, 2, 1, 0, fold=1, tzinfo=tz), 0.1, "Standard"),
+        )
+        change_time = calculator.next_change(early_edt)[0]
+        self.assertEqual(change_time.timestamp() - early_edt.timestamp(), 20 * 60)
+
+        standard_est = datetime(2025, 11, 2, 1, 10, fold=1, tzinfo=tz)
+        change_time, rate, _ = calculator.next_change(standard_est)
+        self.assertEqual(rate, 0.3)
+        self.assertEqual(change_time.timestamp() - standard_est.timestamp(), 20 * 60)
+
+        # Four hours at 1 kW, of which two half hours are Early and half an
+        # hour is Gap
+        energy, cost = calculator.cost_for_interval(
+            datetime(2025, 11, 2, 0, 0, tzinfo=tz),
+            datetime(2025, 11, 2, 3, 0, tzinfo=tz),
+            1000.0,
+            1000.0,
+        )
+        self.assertAlmostEqual(energy, 4.0)
+        self.assertAlmostEqual(cost, 2.5 * 0.1 + 1 * 0.3 + 0.5 * 0.5)
+
+    def test_dst_spring_forward(self):
+        """Test changes made by the clocks going forward over a period."""
+        calculator = RateCalculator(DST_CONFIG)
+        tz = ZoneInfo("America/Detroit")
+
+        # Clocks go forward from 2:00 EST to 3:00 EDT on March 9, 2025, ending
+        # Early and skipping Gap entirely
+        self.assertEqual(
+            calculator.next_change(datetime(2025, 3, 9, 1, 50, tzinfo=tz)),
+            (datetime(2025, 3, 9, 3, 0, tzinfo=tz), 0.1, "Standard"),
+        )
+        self.assertEqual(
+            calculator.next_change(datetime(2025, 3, 9, 3, 0, tzinfo=tz)),
+            (datetime(2025, 3, 10, 1, 30, tzinfo=tz), 0.3, "Early"),
+        )
+
+        # Two hours at 1 kW, of which half an hour is Early
+        energy, cost = calculator.cost_for_interval(
+            datetime(2025, 3, 9, 1, 0, tzinfo=tz),
+            datetime(2025, 3, 9, 4, 0, tzinfo=tz),
+            1000.0,
+            1000.0,
+        )
+        self.assertAlmostEqual(energy, 2.0)
+        self.assertAlmostEqual(cost, 1.5 * 0.1 + 0.5 * 0.3)
+
+    def test_get_rates_matches_get_rate(self):
+        """Test batch lookups against scalar lookups across DST changes."""
+        calculator = RateCalculator(self.nighttime_savers_config)
+        tz = ZoneInfo("America/Detroit")
+
+        # March 8-10 and November 1-3, 2025 in 7-minute steps, spanning
+        # spring forward and fall back
+        timestamps = array("d")
+        for day in (datetime(2025, 3, 8, tzinfo=tz), datetime(2025, 11, 1, tzinfo=tz)):
+            start = day.timestamp()
+            timestamps.extend(start + step * 420.0 for step in range(3 * 206))
+        expected = [
+            calculator.get_rate(datetime.fromtimestamp(ts, tz)) for ts in timestamps
+        ]
+
+        rates, period_ids = calculator.get_rates(timestamps, tz)
+        self.assertEqual(list(rates), [rate for rate, _ in expected])
+        self.assertEqual(
+            [calculator.schedule.periods[period_id][1] for period_id in period_ids],
+            [name for _, name in expected],
+        )
+
+        with mock.patch.object(rate_calculator, "np", None):
+            py_rates, py_period_ids = calculator.get_rates(timestamps, tz)
+        self.assertIsInstance(py_rates, array)
+        self.assertEqual(list(py_rates), list(rates))
+        self.assertEqual(list(py_period_ids), list(period_ids))
+
+        # Epoch seconds alone don't say which local time to price them at
+        with self.assertRaises(TypeError):
+            calculator.get_rates(timestamps)
+
+
+class TestScheduleCache(unittest.TestCase):
+    """Test sharing compiled schedules between calculators."""
+
+    def _config(self, rate):
+        """Return a configuration no other test uses."""
+        return {
+            "summer": {"months": [6, 7, 8], "default_rate": rate},
+            "winter": {"months": [1, 2, 12], "default_rate": 0.1},
+        }
+
+    def test_shared_schedule(self):
+        """Test equal configurations share one compiled schedule."""
+        first = RateCalculator(self._config(0.5101))
+        # The same rates in a different dict, with keys in another order
+        second = RateCalculator({
+            "summer": {"default_rate": 0.5101, "months": [6, 7, 8]},
+            "winter": {"default_rate": 0.1, "months": [1, 2, 12]},
+        })
+        other = RateCalculator(self._config(0.5102))
+
+        self.assertIs(first.schedule, second.schedule)
+        self.assertIsNot(first.schedule, other.schedule)
+
+    def test_season_order_kept(self):
+        """Test seasons in another order aren't taken to be the same rates."""
+        config = self._config(0.5103)
+        reordered = {"winter": config["winter"], "summer": config["summer"]}
+
+        self.assertNotEqual(
+            rate_calculator.schedule_key(config), rate_calculator.schedule_key(reordered)
+        )
+
+    def test_release(self):
+        """Test a released schedule is reused until evicted."""
+        config = self._config(0.5104)
+        first = RateCalculator(config)
+        second = RateCalculator(config)
+        schedule = first.schedule
+        key = rate_calculator.schedule_key(config)
+
+        first.close()
+        first.close()
+        self.assertEqual(rate_calculator._schedule_users[key], 1)
+
+        second.close()
+        self.assertNotIn(key, rate_calculator._schedules)
+        # A reload gets the same schedule back without compiling it
+        with mock.patch.object(rate_calculator, "CompiledSchedule") as compile_schedule:
+            reloaded = RateCalculator(config)
+        compile_schedule.assert_not_called()
+        self.assertIs(reloaded.schedule, schedule)
+        reloaded.close()
+
+        # Released schedules beyond the limit are dropped, oldest first
+        for index in range(rate_calculator.MAX_UNUSED_SCHEDULES):
+            RateCalculator(self._config(0.6 + index / 1000)).close()
+        self.assertNotIn(key, rate_calculator._unused_schedules)
+        self.assertEqual(first.get_rate(datetime(2025, 7, 1, 12, 0))[0], 0.5104)
+
+    @unittest.skipIf(rate_calculator.np is None, "NumPy not installed")
+    def test_concurrent_first_batch_lookup(self):
+        """Test a lookup while another thread builds the NumPy tables."""
+        numpy = rate_calculator.np
+        building = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        class PausingNumpy:
+            """NumPy that pauses the first lookup partway through its arrays."""
+
+            def __getattr__(self, name):
+                return getattr(numpy, name)
+
+            def array(self, *args, **kwargs):
+                calls.append(args)
+                if len(calls) == 2:
+                    building.set()
+                    release.wait(5)
+                return numpy.array(*args, **kwargs)
+
+        config = self._config(0.5105)
+        first = RateCalculator(config)
+        second = RateCalculator(config)
+        tz = ZoneInfo("America/Detroit")
+        timestamps = [datetime(2025, 7, 1, tzinfo=tz).timestamp() + hour * 3600 for hour in range(24)]
+
+        try:
+            with mock.patch.object(rate_calculator, "np", PausingNumpy()):
+                with ThreadPoolExecutor(1) as executor:
+                    pending = executor.submit(first.get_rates, timestamps, tz)
+                    self.assertTrue(building.wait(5))
+                    try:
+                        rates, _ = second.get_rates(timestamps, tz)
+                    finally:
+                        release.set()
+                    first_rates, _ = pending.result()
+        finally:
+            first.close()
+            second.close()
+
+        self.assertEqual(list(rates), [0.5105] * 24)
+        self.assertEqual(list(first_rates), [0.5105] * 24)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,373 @@
+"""Differential fuzzing of the compiled rate engine against the reference.
+
+Random valid rate configurations are looked up at random timestamps and
+around every DST change, with the compiled scalar and batch lookups and
+next_change compared against RateCalculator._reference_rate. A mismatch is
+shrunk to a minimal configuration that still shows it. The unit test runs
+a fixed seed; run the module for a longer search:
+
+    python tests/test_rate_fuzz.py --configs 2000 --timestamps 5000 --seed 7
+"""
+import argparse
+import copy
+from datetime import datetime, timezone
+import json
+import logging
+import os
+import random
+import unittest
+from zoneinfo import ZoneInfo
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from custom_components.consumers_energy_cost.rate_calculator import RateCalculator
+
+# Zones with unusual offsets and DST rules, and one without DST
+ZONES = [
+    ZoneInfo("America/Detroit"),
+    ZoneInfo("Europe/London"),
+    ZoneInfo("Australia/Lord_Howe"),
+    ZoneInfo("America/St_Johns"),
+    ZoneInfo("Pacific/Chatham"),
+    ZoneInfo("Asia/Kolkata"),
+]
+
+# Times weighted towards midnight, 23:59 and the hours clocks change in
+EDGE_TIMES = ["00:00", "00:01", "01:00", "01:59", "02:00", "02:30", "03:00", "23:00", "23:59"]
+RATES = [0.0, 0.1, 0.133, 0.173, 0.212]
+NAMES = ["Peak", "Off-Peak", "Standard", "Super Off-Peak", "Unknown"]
+SEASON_NAMES = ["summer", "winter", "shoulder"]
+
+FIRST_YEAR = 1995
+LAST_YEAR = 2035
+
+
+def random_time(rng):
+    """Pick a period start or end, often at an edge."""
+    if rng.random() < 0.5:
+        return rng.choice(EDGE_TIMES)
+    return f"{rng.randrange(24):02d}:{rng.randrange(60):02d}"
+
+
+def random_day(rng):
+    """Generate a weekday or weekend configuration."""
+    day = {"periods": []}
+    for _ in range(rng.randrange(5)):
+        start = random_time(rng)
+        # Sometimes empty or crossing midnight on purpose
+        end = start if rng.random() < 0.05 else random_time(rng)
+        day["periods"].append(
+            {"start": start, "end": end, "rate": rng.choice(RATES), "name": rng.choice(NAMES)}
+        )
+    if rng.random() < 0.7:
+        day["default_rate"] = rng.choice(RATES)
+    if rng.random() < 0.7:
+        day["default_name"] = rng.choice(NAMES)
+    return day
+
+
+def random_config(rng):
+    """Generate a valid rate configuration.
+
+    Seasons may overlap or leave months uncovered, and may leave out
+    weekday or weekend schedules and default names and rates.
+    """
+    config = {}
+    for name in rng.sample(SEASON_NAMES, rng.randrange(1, 4)):
+        season = {"months": sorted(rng.sample(range(1, 13), rng.randrange(13)))}
+        for day_type in ("weekday", "weekend"):
+            if rng.random() < 0.8:
+                season[day_type] = random_day(rng)
+        if rng.random() < 0.5:
+            season["default_rate"] = rng.choice(RATES)
+        if rng.random() < 0.5:
+            season["default_name"] = rng.choice(NAMES)
+        config[name] = season
+    return config
+
+
+def transition_times(tz):
+    """Epoch seconds of every UTC offset change in a zone over the years fuzzed."""
+    times = []
+    start = datetime(FIRST_YEAR, 1, 1, tzinfo=timezone.utc).timestamp()
+    end = datetime(LAST_YEAR, 12, 31, tzinfo=timezone.utc).timestamp()
+    step = 6 * 3600
+    previous = datetime.fromtimestamp(start, tz).utcoffset()
+    timestamp = start
+    while timestamp < end:
+        offset = datetime.fromtimestamp(timestamp + step, tz).utcoffset()
+        if offset != previous:
+            low, high = timestamp, timestamp + step
+            while high - low > 1:
+                middle = (low + high) // 2
+                if datetime.fromtimestamp(middle, tz).utcoffset() == previous:
+                    low = middle
+                else:
+                    high = middle
+            times.append(high)
+            previous = offset
+        timestamp += step
+    return times
+
+
+def random_timestamps(rng, tz, transitions, count):
+    """Generate epoch timestamps, many of them near offset changes and midnight."""
+    start = datetime(FIRST_YEAR, 1, 1, tzinfo=timezone.utc).timestamp()
+    end = datetime(LAST_YEAR, 12, 31, tzinfo=timezone.utc).timestamp()
+    timestamps = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.3 and transitions:
+            # Within a few hours of a clock change, to the second
+            timestamps.append(rng.choice(transitions) + rng.randint(-4 * 3600, 4 * 3600))
+        elif roll < 0.5:
+            # Around local midnight and 23:59
+            when = datetime.fromtimestamp(rng.uniform(start, end), tz)
+            midnight = when.replace(hour=0, minute=0, second=0, microsecond=0)
+            timestamps.append(midnight.timestamp() + rng.randint(-120, 120))
+        else:
+            timestamps.append(rng.uniform(start, end))
+    return timestamps
+
+
+def find_mismatch(config, timestamps, tz):
+    """Compare the engines at every timestamp.
+
+    Returns:
+        Dictionary describing the first mismatch, or None
+    """
+    calculator = RateCalculator(config)
+    try:
+        return _compare(calculator, timestamps, tz)
+    finally:
+        calculator.close()
+
+
+def _compare(calculator, timestamps, tz):
+    """Compare one calculator's engines at every timestamp."""
+    config = calculator.rate_config
+    rates, ids = calculator.get_rates(timestamps, tz)
+    periods = calculator.schedule.periods
+
+    for index, timestamp in enumerate(timestamps):
+        when = datetime.fromtimestamp(timestamp, tz)
+        expected = calculator._reference_rate(when)
+        results = {
+            "get_rate": calculator.get_rate(when),
+            "get_rates": periods[int(ids[index])],
+        }
+        if float(rates[index]) != results["get_rates"][0]:
+            results["get_rates"] = (float(rates[index]), results["get_rates"][1])
+
+        for engine, result in results.items():
+            if result != expected:
+                return _mismatch(config, timestamp, tz, engine, expected, results)
+
+        # The change is later, to a rate the reference agrees with, and the
+        # current rate holds until the minute before it and past any clock
+        # change before it. Times are compared as epoch seconds, as the
+        # wall clock repeats and skips times.
+        change = calculator.next_change(when)
+        if change is None:
+            continue
+        change_time, rate, name = change
+        change_ts = change_time.timestamp()
+        at_change = calculator._reference_rate(change_time)
+        if change_ts <= timestamp or (rate, name) != at_change:
+            return _mismatch(
+                config, timestamp, tz, "next_change", at_change,
+                {"next_change": (change_time.isoformat(), rate, name)},
+            )
+        checks = [change_ts - 60]
+        clock_change = _offset_change(timestamp, change_ts, tz)
+        if clock_change is not None:
+            checks.append(clock_change)
+        for check_ts in checks:
+            if timestamp <= check_ts < change_ts:
+                held = calculator._reference_rate(datetime.fromtimestamp(check_ts, tz))
+                if held != expected:
+                    return _mismatch(
+                        config, timestamp, tz, "next_change", expected,
+                        {"held_until_change": (check_ts, held)},
+                    )
+    return None
+
+
+def _offset_change(start_ts, end_ts, tz):
+    """First whole second after start_ts at another UTC offset, up to end_ts."""
+    offset = datetime.fromtimestamp(start_ts, tz).utcoffset()
+    if datetime.fromtimestamp(end_ts, tz).utcoffset() == offset:
+        return None
+    low, high = int(start_ts), int(end_ts) + 1
+    while high - low > 1:
+        middle = (low + high) // 2
+        if datetime.fromtimestamp(middle, tz).utcoffset() == offset:
+            low = middle
+        else:
+            high = middle
+    return high
+
+
+def _mismatch(config, timestamp, tz, engine, expected, results):
+    """Describe a mismatch."""
+    when = datetime.fromtimestamp(timestamp, tz)
+    return {
+        "engine": engine,
+        "timestamp": timestamp,
+        "local_time": when.isoformat(),
+        "time_zone": str(tz),
+        "expected": expected,
+        "results": results,
+        "config": config,
+    }
+
+
+def _smaller_configs(config):
+    """Yield copies of a configuration with one part removed or simplified."""
+    for season in config:
+        smaller = copy.deepcopy(config)
+        del smaller[season]
+        yield smaller
+
+        for key in ("weekday", "weekend", "default_rate", "default_name"):
+            if key in config[season]:
+                smaller = copy.deepcopy(config)
+                del smaller[season][key]
+                yield smaller
+
+        for month in config[season]["months"]:
+            smaller = copy.deepcopy(config)
+            smaller[season]["months"].remove(month)
+            yield smaller
+
+        for day_type in ("weekday", "weekend"):
+            day = config[season].get(day_type)
+            if day is None:
+                continue
+            for index in range(len(day["periods"])):
+                smaller = copy.deepcopy(config)
+                del smaller[season][day_type]["periods"][index]
+                yield smaller
+            for key in ("default_rate", "default_name"):
+                if key in day:
+                    smaller = copy.deepcopy(config)
+                    del smaller[season][day_type][key]
+                    yield smaller
+
+
+def shrink(mismatch):
+    """Remove parts of the configuration while the mismatch remains.
+
+    Returns:
+        The mismatch with a configuration none of whose parts can be
+        removed without it going away
+    """
+    tz = ZoneInfo(mismatch["time_zone"])
+    timestamps = [mismatch["timestamp"]]
+    current = mismatch
+    shrunk = True
+    while shrunk:
+        shrunk = False
+        for smaller in _smaller_configs(current["config"]):
+            found = find_mismatch(smaller, timestamps, tz)
+            if found is not None:
+                current = found
+                shrunk = True
+                break
+    return current
+
+
+def fuzz(seed, configs, timestamps_per_config):
+    """Fuzz random configurations.
+
+    Returns:
+        Tuple of (shrunk mismatches, timestamps checked)
+    """
+    rng = random.Random(seed)
+    transitions = {str(tz): transition_times(tz) for tz in ZONES}
+    mismatches = []
+    checked = 0
+    for _ in range(configs):
+        config = random_config(rng)
+        tz = rng.choice(ZONES)
+        timestamps = random_timestamps(rng, tz, transitions[str(tz)], timestamps_per_config)
+        checked += len(timestamps)
+        mismatch = find_mismatch(config, timestamps, tz)
+        if mismatch is not None:
+            mismatches.append(shrink(mismatch))
+    return mismatches, checked
+
+
+class TestRateFuzz(unittest.TestCase):
+    """Fuzz the compiled engine with a fixed seed."""
+
+    def test_engines_agree(self):
+        """Test random configurations give the reference rates."""
+        mismatches, checked = fuzz(seed=1050, configs=60, timestamps_per_config=1000)
+
+        self.assertEqual(checked, 60_000)
+        self.assertEqual(mismatches, [], json.dumps(mismatches[:1], indent=2, default=str))
+
+    def test_shrink(self):
+        """Test a mismatch is shrunk to the parts that cause it."""
+        tz = ZONES[0]
+        config = {
+            "summer": {
+                "months": [6, 7],
+                "weekday": {
+                    "periods": [
+                        {"start": "14:00", "end": "19:00", "rate": 0.212, "name": "Peak"},
+                        {"start": "23:00", "end": "01:00", "rate": 0.1, "name": "Night"},
+                    ],
+                    "default_rate": 0.133,
+                },
+                "weekend": {"periods": [], "default_rate": 0.1},
+            },
+            "winter": {"months": [1, 2], "default_rate": 0.1},
+        }
+        timestamp = datetime(2025, 7, 15, 15, 0, tzinfo=tz).timestamp()
+
+        # A reference that ignores the peak period mismatches inside it
+        reference = RateCalculator._reference_rate
+
+        def skip_first(calculator, when):
+            summer = calculator.rate_config.get("summer", {})
+            if 14 <= when.hour < 19 and when.month in summer.get("months", []):
+                periods = summer.get("weekday", {}).get("periods", [])
+                if any(period["name"] == "Peak" for period in periods):
+                    return (0.0, "Broken")
+            return reference(calculator, when)
+
+        RateCalculator._reference_rate = skip_first
+        try:
+            mismatch = find_mismatch(config, [timestamp], tz)
+            shrunk = shrink(mismatch)
+        finally:
+            RateCalculator._reference_rate = reference
+
+        self.assertEqual(list(shrunk["config"]), ["summer"])
+        self.assertEqual(shrunk["config"]["summer"]["months"], [7])
+        self.assertNotIn("weekend", shrunk["config"]["summer"])
+        self.assertEqual(len(shrunk["config"]["summer"]["weekday"]["periods"]), 1)
+
+
+def main():
+    """Run a longer search and print minimal counterexamples."""
+    parser = argparse.ArgumentParser(description="Fuzz the compiled rate engine against the reference")
+    parser.add_argument("--seed", type=int, default=random.randrange(1 << 30))
+    parser.add_argument("--configs", type=int, default=500)
+    parser.add_argument("--timestamps", type=int, default=2000)
+    args = parser.parse_args()
+
+    # Months outside every season are part of the search
+    logging.getLogger(RateCalculator.__module__).setLevel(logging.CRITICAL)
+    mismatches, checked = fuzz(args.seed, args.configs, args.timestamps)
+    print(f"Seed {args.seed}: {checked} timestamps over {args.configs} configurations")
+    for mismatch in mismatches:
+        print(json.dumps(mismatch, indent=2, default=str))
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Tests for the sliding windows."""
+import os
+import unittest
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from custom_components.consumers_energy_cost.rolling import RollingWindow
+
+START = 1_743_480_000.0  # hour aligned
+
+
+class TestRollingWindow(unittest.TestCase):
+    """Test the RollingWindow class."""
+
+    def setUp(self):
+        """Set up a 60 minute window of minute buckets."""
+        self.window = RollingWindow(60, 60)
+
+    def test_slides(self):
+        """Test deltas leave the window an hour after they were added."""
+        for minute in range(60):
+            self.window.add(START + minute * 60 + 30, 1.0, 0.25)
+
+        self.assertEqual(self.window.totals(START + 3600), (60.0, 15.0))
+
+        # Half of the first minute has left the window
+        energy, cost = self.window.totals(START + 3630)
+        self.assertAlmostEqual(energy, 59.5)
+        self.assertAlmostEqual(cost, 14.875)
+
+        self.assertEqual(self.window.totals(START + 3660), (59.0, 14.75))
+        self.assertEqual(self.window.totals(START + 7200), (0.0, 0.0))
+
+    def test_no_sawtooth_at_the_hour(self):
+        """Test the total stays level across the top of the hour."""
+        for second in range(0, 7200, 10):
+            self.window.add(START + second + 5, 0.01, 0.001)
+            if second >= 3600:
+                energy, _ = self.window.totals(START + second + 10)
+                self.assertAlmostEqual(energy, 3.6)
+
+    def test_late_and_old_deltas(self):
+        """Test deltas out of order are placed, and expired ones dropped."""
+        self.window.totals(START + 3600)
+        self.window.add(START + 1800, 1.0, 0.5)
+        self.window.add(START - 60, 5.0, 5.0)
+
+        self.assertEqual(self.window.totals(START + 3600), (1.0, 0.5))
+
+    def test_since_and_clear(self):
+        """Test rebuilding from a time replaces the buckets after it."""
+        self.window.add(START + 30, 1.0, 0.5)
+        self.window.add(START + 90, 1.0, 0.5)
+
+        self.window.clear(START + 60)
+        self.window.add(START + 30, 9.0, 9.0, since=START + 60)
+        self.window.add(START + 90, 2.0, 1.0, since=START + 60)
+
+        self.assertEqual(self.window.totals(START + 120), (3.0, 1.5))
+
+    def test_serialize(self):
+        """Test buckets and sums survive a round trip through bytes."""
+        self.window.add(START + 30, 1.0, 0.5)
+        self.window.add(START + 90, 2.0, 1.0)
+        data = self.window.to_bytes()
+        self.assertEqual(len(data), self.window.byte_size)
+
+        restored = RollingWindow(60, 60)
+        restored.from_bytes(data)
+        self.assertEqual(restored.totals(START + 120), (3.0, 1.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
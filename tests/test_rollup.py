@@ -0,0 +1,156 @@
+"""Tests for the rollup store."""
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from custom_components.consumers_energy_cost.minute_history import MinuteHistory
+from custom_components.consumers_energy_cost.rollup import RollupStore
+
+TZ = ZoneInfo("America/Detroit")
+
+
+def _ts(*args):
+    """Epoch seconds of a Detroit local time."""
+    return datetime(*args, tzinfo=TZ).timestamp()
+
+
+class TestRollupStore(unittest.TestCase):
+    """Test the RollupStore class."""
+
+    def setUp(self):
+        """Set up an empty store with 2 days of minutes."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.minutes = MinuteHistory(os.path.join(self.temp_dir.name, "minutes"), capacity=2 * 24 * 60)
+        self.minutes.open()
+        self.store = RollupStore(TZ, self.minutes)
+
+    def tearDown(self):
+        """Close the minute history and remove the temporary directory."""
+        self.minutes.close()
+        self.temp_dir.cleanup()
+
+    def test_add_and_query(self):
+        """Test a delta is added at every resolution."""
+        # Minutes are stored as float32, so use exactly representable values
+        self.store.add(_ts(2025, 3, 31, 23, 59, 30), 1.0, 0.25)
+        self.store.add(_ts(2025, 4, 1, 0, 0, 30), 2.0, 0.5)
+        self.store.add(_ts(2025, 4, 1, 0, 0, 45), 0.5, 0.125)
+
+        self.assertEqual(
+            self.store.query(_ts(2025, 3, 31, 23, 59), _ts(2025, 4, 1, 0, 1), "minute"),
+            [(_ts(2025, 3, 31, 23, 59), 1.0, 0.25), (_ts(2025, 4, 1, 0, 0), 2.5, 0.625)],
+        )
+        self.assertEqual(
+            self.store.query(_ts(2025, 3, 1), _ts(2025, 5, 1), "day"),
+            [(_ts(2025, 3, 31), 1.0, 0.25), (_ts(2025, 4, 1), 2.5, 0.625)],
+        )
+        self.assertEqual(
+            self.store.query(_ts(2025, 1, 1), _ts(2026, 1, 1), "month"),
+            [(_ts(2025, 3, 1), 1.0, 0.25), (_ts(2025, 4, 1), 2.5, 0.625)],
+        )
+
+        # The range end is exclusive
+        self.assertEqual(self.store.query(_ts(2025, 3, 1), _ts(2025, 4, 1), "month"), [(_ts(2025, 3, 1), 1.0, 0.25)])
+
+    def test_dst_day(self):
+        """Test days follow the local calendar across a DST change."""
+        self.store.add(_ts(2025, 3, 9, 1, 30), 1.0, 0.1)
+        self.store.add(_ts(2025, 3, 9, 23, 30), 1.0, 0.1)
+        self.store.add(_ts(2025, 3, 10, 0, 30), 1.0, 0.1)
+
+        self.assertEqual(
+            self.store.query(_ts(2025, 3, 9), _ts(2025, 3, 11), "day"),
+            [(_ts(2025, 3, 9), 2.0, 0.2), (_ts(2025, 3, 10), 1.0, 0.1)],
+        )
+
+    def test_retention(self):
+        """Test the oldest buckets are dropped when the ring wraps."""
+        capacity = self.minutes.capacity
+        start = _ts(2025, 4, 1)
+        for minute in range(capacity + 10):
+            self.store.add(start + minute * 60 + 30, 1.0, 0.1)
+
+        buckets = self.store.query(start, start + (capacity + 10) * 60, "minute")
+        self.assertEqual(len(buckets), capacity)
+        self.assertEqual(buckets[0][0], start + 10 * 60)
+
+        # Coarser levels keep everything
+        self.assertAlmostEqual(
+            self.store.query(start, start + 86400 * 3, "month")[0][1], capacity + 10
+        )
+        self.assertEqual(len(self.store.query(start, start + 86400 * 3, "hour")), 49)
+
+    def test_out_of_order(self):
+        """Test a delta older than its slot's bucket doesn't reset it."""
+        start = _ts(2025, 4, 1)
+        hours = 90 * 24
+        self.store.add(start + hours * 3600 + 60, 2.0, 0.5)
+
+        # Same hour slot, one ring length back: already dropped, so ignored
+        self.store.add(start + 60, 1.0, 0.25)
+        # A late delta for an hour still kept is added as usual
+        self.store.add(start + (hours - 1) * 3600 + 60, 1.0, 0.25)
+
+        self.assertEqual(
+            self.store.query(start, start + (hours + 1) * 3600, "hour"),
+            [(start + (hours - 1) * 3600, 1.0, 0.25), (start + hours * 3600, 2.0, 0.5)],
+        )
+
+    def test_clear_and_rebuild(self):
+        """Test rebuilding from a time leaves straddling buckets unchanged."""
+        self.store.add(_ts(2025, 4, 1, 6, 10), 1.0, 0.1)
+        self.store.add(_ts(2025, 4, 1, 12, 10), 1.0, 0.1)
+
+        since = _ts(2025, 4, 1, 12)
+        self.store.clear(since)
+        self.store.add(_ts(2025, 4, 1, 12, 20), 3.0, 0.3, since=since)
+
+        self.assertEqual(
+            self.store.query(_ts(2025, 4, 1), _ts(2025, 4, 2), "hour"),
+            [(_ts(2025, 4, 1, 6), 1.0, 0.1), (_ts(2025, 4, 1, 12), 3.0, 0.3)],
+        )
+        # The day started before the rebuild, so it keeps its total
+        self.assertEqual(
+            self.store.query(_ts(2025, 4, 1), _ts(2025, 4, 2), "day"),
+            [(_ts(2025, 4, 1), 2.0, 0.2)],
+        )
+
+    def test_serialize(self):
+        """Test rollups survive a round trip through bytes."""
+        self.store.add(_ts(2025, 4, 1, 6, 10), 1.0, 0.1)
+
+        restored = RollupStore(TZ)
+        self.assertTrue(restored.from_bytes(self.store.to_bytes()))
+        self.assertEqual(
+            restored.query(_ts(2025, 4, 1), _ts(2025, 4, 2), "hour"),
+            [(_ts(2025, 4, 1, 6), 1.0, 0.1)],
+        )
+        self.assertEqual(
+            restored.window_totals(_ts(2025, 4, 1, 7))["24h"],
+            self.store.window_totals(_ts(2025, 4, 1, 7))["24h"],
+        )
+
+        self.assertFalse(restored.from_bytes(b"garbage"))
+        # Another format version is rejected rather than misread
+        data = bytearray(self.store.to_bytes())
+        data[4:6] = (2).to_bytes(2, "little")
+        self.assertFalse(restored.from_bytes(bytes(data)))
+
+    def test_windows(self):
+        """Test deltas are added to the sliding windows."""
+        self.store.add(_ts(2025, 4, 1, 6, 10), 1.0, 0.25)
+        self.store.add(_ts(2025, 4, 1, 6, 50), 2.0, 0.5)
+
+        totals = self.store.window_totals(_ts(2025, 4, 1, 7, 30))
+        self.assertEqual(totals["60m"], (2.0, 0.5))
+        self.assertEqual(totals["24h"], (3.0, 0.75))
+        self.assertEqual(totals["7d"], (3.0, 0.75))
+
+
+if __name__ == "__main__":
+    unittest.main()